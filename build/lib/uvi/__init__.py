@@ -0,0 +1,5 @@
+"""UVI - A Python project template using uv for dependency management."""
+
+from __future__ import annotations
+
+__version__ = "0.5.0"
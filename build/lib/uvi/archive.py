@@ -0,0 +1,69 @@
+"""Archive output for UVI.
+
+Writes rendered project files (see ``uvi.render.render_files``) into a
+``tar.gz`` or ``zip`` archive as they are produced, without a project
+directory on disk. Every entry sits below the project directory name, so
+unpacking an archive gives the same tree as generating the project.
+
+Both formats are written in streaming mode and work on pipes and sockets,
+which cannot seek.
+"""
+
+from __future__ import annotations
+
+import io
+import stat
+import tarfile
+import time
+import zipfile
+from collections.abc import Iterable
+from typing import IO
+
+from .render import RenderedFile
+
+ARCHIVE_FORMATS = ("tar.gz", "zip")
+
+# Media type of each archive format, for HTTP responses
+MEDIA_TYPES = {"tar.gz": "application/gzip", "zip": "application/zip"}
+
+
+def write_archive(files: Iterable[RenderedFile], out: IO[bytes], archive_format: str, root: str) -> int:
+    """Write rendered files into an archive, one entry at a time.
+
+    Args:
+        files: Rendered files, paths relative to the project directory
+        out: Binary stream the archive is written to; it is left open
+        archive_format: One of ``ARCHIVE_FORMATS``
+        root: Directory the entries are placed in, usually the project directory name
+
+    Returns:
+        Number of files written
+
+    Raises:
+        ValueError: If the archive format is unknown
+    """
+    if archive_format not in ARCHIVE_FORMATS:
+        msg = f"unknown archive format {archive_format!r} (choose from {', '.join(ARCHIVE_FORMATS)})"
+        raise ValueError(msg)
+    mtime = time.time()
+    count = 0
+    if archive_format == "tar.gz":
+        with tarfile.open(fileobj=out, mode="w|gz") as tar:
+            for rendered in files:
+                info = tarfile.TarInfo(f"{root}/{rendered.path}")
+                info.size = len(rendered.content)
+                info.mode = rendered.mode
+                info.mtime = int(mtime)
+                tar.addfile(info, io.BytesIO(rendered.content))
+                count += 1
+        return count
+
+    date_time = time.localtime(mtime)[:6]
+    with zipfile.ZipFile(out, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for rendered in files:
+            member = zipfile.ZipInfo(f"{root}/{rendered.path}", date_time=date_time)
+            member.external_attr = (stat.S_IFREG | rendered.mode) << 16
+            member.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(member, rendered.content)
+            count += 1
+    return count
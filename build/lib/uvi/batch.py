@@ -0,0 +1,292 @@
+"""Batch project generation for UVI.
+
+Generates many projects from a JSON Lines spec file, where each line is an
+``extra_context`` object such as::
+
+    {"project_name": "billing-api", "open_source_license": "Not open source", "mkdocs": "n"}
+
+The template is located, its ``cookiecutter.json`` parsed and every spec
+validated once, in the parent process, before anything is written. Only the
+fully resolved contexts are handed to a pool of worker processes, each of
+which imports cookiecutter once and then renders projects back to back with
+the manifest-aware renderer in ``uvi.render``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import json
+import os
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any
+
+from . import render
+from .hooks import validate_answers
+from .profile import span
+from .template import find_template
+
+
+def load_specs(path: str) -> list[dict[str, Any]]:
+    """Read project specs from a JSON Lines file.
+
+    Blank lines are ignored.
+
+    Args:
+        path: Path to the spec file, or "-" for standard input
+
+    Returns:
+        List of ``extra_context`` dicts in file order
+
+    Raises:
+        ValueError: If a line is not a JSON object
+    """
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, encoding="utf-8") as spec_file:
+            lines = spec_file.read().splitlines()
+
+    specs = []
+    for lineno, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            spec = json.loads(line)
+        except json.JSONDecodeError as e:
+            msg = f"{path}:{lineno}: invalid JSON ({e.msg})"
+            raise ValueError(msg) from e
+        if not isinstance(spec, dict):
+            msg = f"{path}:{lineno}: expected a JSON object, got {type(spec).__name__}"
+            raise ValueError(msg)  # noqa: TRY004 - malformed input, not a programming error
+        specs.append(spec)
+    return specs
+
+
+def load_template_context(repo_dir: str) -> dict[str, Any]:
+    """Parse a template's ``cookiecutter.json`` into a cookiecutter context.
+
+    Args:
+        repo_dir: Local template directory
+
+    Returns:
+        Context dict of the form ``{"cookiecutter": {...}}``
+    """
+    from cookiecutter.generate import generate_context  # noqa: PLC0415
+
+    context: dict[str, Any] = generate_context(context_file=os.path.join(repo_dir, "cookiecutter.json"))
+    return context
+
+
+def resolve_spec(
+    template_context: dict[str, Any],
+    spec: dict[str, Any],
+    defaults: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    """Resolve one spec into the full context cookiecutter renders with.
+
+    Applies the overrides exactly as ``cookiecutter --no-input`` would, so
+    choice values are validated and derived values such as ``project_slug``
+    are rendered.
+
+    Args:
+        template_context: Parsed template context from ``load_template_context``
+        spec: The ``extra_context`` overrides for this project
+        defaults: Overrides applied before the spec, such as detected author details
+
+    Returns:
+        Context dict with ``cookiecutter`` and ``_cookiecutter`` keys
+
+    Raises:
+        ValueError: If the spec names unknown variables or invalid choices, or
+            the project name or slug is invalid
+    """
+    from cookiecutter.generate import apply_overwrites_to_context  # noqa: PLC0415
+    from cookiecutter.prompt import prompt_for_config  # noqa: PLC0415
+
+    context = copy.deepcopy(template_context)
+    variables = context["cookiecutter"]
+    unknown = sorted(key for key in spec if key not in variables)
+    if unknown:
+        msg = f"unknown template variable(s): {', '.join(unknown)}"
+        raise ValueError(msg)
+
+    apply_overwrites_to_context(variables, {**(defaults or {}), **spec})
+    context["_cookiecutter"] = {key: value for key, value in variables.items() if not key.startswith("_")}
+    variables.update(prompt_for_config(context, no_input=True))
+    validate_answers(variables)
+    return context
+
+
+def resolve_specs(
+    template_context: dict[str, Any],
+    specs: list[dict[str, Any]],
+    defaults: dict[str, str] | None = None,
+) -> list[dict[str, Any]]:
+    """Resolve and validate every spec before anything is generated.
+
+    Args:
+        template_context: Parsed template context from ``load_template_context``
+        specs: The ``extra_context`` overrides, one per project
+        defaults: Overrides applied before each spec
+
+    Returns:
+        The resolved contexts, in spec order
+
+    Raises:
+        ValueError: Listing every invalid spec and duplicate project name
+    """
+    contexts = []
+    errors = []
+    seen: dict[str, int] = {}
+    for number, spec in enumerate(specs, start=1):
+        try:
+            context = resolve_spec(template_context, spec, defaults)
+        except ValueError as e:
+            errors.append(f"spec {number}: {e}")
+            continue
+        name = context["cookiecutter"]["project_name"]
+        if name in seen:
+            errors.append(f"spec {number}: project_name {name!r} already used by spec {seen[name]}")
+        seen.setdefault(name, number)
+        contexts.append(context)
+
+    if errors:
+        raise ValueError("\n".join(errors))
+    return contexts
+
+
+@contextlib.contextmanager
+def template_on_path(repo_dir: str) -> Iterator[None]:
+    """Put a template on ``sys.path`` for the duration of the block.
+
+    Same as cookiecutter's own import patch, for templates with local
+    extensions, and undone the same way so the caller's path is left as it was.
+
+    Args:
+        repo_dir: Local template directory
+    """
+    sys.path.append(repo_dir)
+    try:
+        yield
+    finally:
+        sys.path.remove(repo_dir)
+
+
+def _init_worker(repo_dir: str) -> None:
+    """Prepare a worker process: import cookiecutter once and expose the template.
+
+    Only for process pool initializers: the template stays on the worker's
+    ``sys.path`` until the process exits. Rendering in-process goes through
+    ``template_on_path`` instead.
+
+    Args:
+        repo_dir: Local template directory
+    """
+    import cookiecutter.generate  # noqa: PLC0415
+    import cookiecutter.hooks  # noqa: F401, PLC0415
+
+    sys.path.append(repo_dir)
+
+
+def generate_project(repo_dir: str, context: dict[str, Any], output_dir: str) -> str:
+    """Render one resolved context into ``output_dir``.
+
+    Args:
+        repo_dir: Local template directory
+        context: Resolved context from ``resolve_spec``
+        output_dir: Directory the project directory is created in
+
+    Returns:
+        Path of the generated project
+    """
+    variables = context["cookiecutter"]
+    variables["_template"] = repo_dir
+    variables["_output_dir"] = os.path.abspath(output_dir)
+    variables["_repo_dir"] = repo_dir
+    variables["_checkout"] = None
+    return render.generate_project(repo_dir, context, output_dir)
+
+
+def _generate_project_safely(repo_dir: str, context: dict[str, Any], output_dir: str) -> tuple[str | None, str | None]:
+    """Run ``generate_project`` and turn failures into an error message.
+
+    Exceptions are flattened to strings because cookiecutter's exceptions do
+    not all survive pickling back to the parent process.
+
+    Returns:
+        Tuple of the project path (or None) and the error message (or None)
+    """
+    try:
+        return generate_project(repo_dir, context, output_dir), None
+    except Exception as e:  # Reported per project; one bad spec must not stop the batch
+        return None, f"{type(e).__name__}: {e}"
+
+
+def run_batch(
+    specs_path: str,
+    output_dir: str = ".",
+    jobs: int | None = None,
+    defaults: dict[str, str] | None = None,
+    template: str | None = None,
+) -> int:
+    """Generate one project per spec across a process pool.
+
+    Args:
+        specs_path: JSON Lines spec file, or "-" for standard input
+        output_dir: Directory the projects are created in
+        jobs: Number of worker processes (defaults to the CPU count); 1 renders in-process
+        defaults: Overrides applied before each spec, such as detected author details
+        template: Local template directory (defaults to the bundled template)
+
+    Returns:
+        Number of projects that failed to generate
+
+    Raises:
+        ValueError: If the spec file or any spec is invalid; nothing is generated then
+    """
+    repo_dir = template or find_template()
+    if not os.path.isdir(repo_dir):
+        msg = f"batch mode needs a local template directory, got {repo_dir}"
+        raise ValueError(msg)
+
+    with span("resolve-specs"):
+        specs = load_specs(specs_path)
+        contexts = resolve_specs(load_template_context(repo_dir), specs, defaults)
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(contexts) or 1))
+    print(f"Generating {len(contexts)} project(s) into {output_dir} with {jobs} worker(s)")
+
+    failures = 0
+    total = len(contexts)
+    if jobs == 1:
+        with template_on_path(repo_dir):
+            for done, context in enumerate(contexts, start=1):
+                path, error = _generate_project_safely(repo_dir, context, output_dir)
+                failures += _report(done, total, context, path, error)
+        return failures
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(repo_dir,)) as pool:
+        futures = {
+            pool.submit(_generate_project_safely, repo_dir, context, output_dir): context for context in contexts
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            path, error = future.result()
+            failures += _report(done, total, futures[future], path, error)
+    return failures
+
+
+def _report(done: int, total: int, context: dict[str, Any], path: str | None, error: str | None) -> int:
+    """Print the outcome of one project.
+
+    Returns:
+        1 if the project failed, 0 otherwise
+    """
+    name = context["cookiecutter"]["project_name"]
+    if error is not None:
+        print(f"[{done}/{total}] {name}: failed ({error})", file=sys.stderr)
+        return 1
+    print(f"[{done}/{total}] {name}: created {path}")
+    return 0
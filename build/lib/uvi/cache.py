@@ -0,0 +1,182 @@
+"""On-disk caches for UVI.
+
+Caches live under ``$UVI_CACHE_DIR`` if set, otherwise ``$XDG_CACHE_HOME/uvi``
+(``~/.cache/uvi`` by default, ``%LOCALAPPDATA%\\uvi`` on Windows).
+
+The identity cache stores the resolved author details so that repeated runs
+skip identity discovery, including the GitHub API round-trip. Each entry
+records the size and modification time of every file the answer depends on:
+all git config files (and the files they include), the repository's ``HEAD``
+for ``includeIf "onbranch:..."`` and the GitHub CLI ``hosts.yml``. An entry is
+used only while all of those are unchanged and it is younger than its TTL.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from .identity import GitConfigError, find_git_dir, gh_config_dir, git_config_files, load_git_config
+
+# Bump when the layout of cache entries changes
+IDENTITY_CACHE_VERSION = 1
+
+# How long a cached identity stays valid, in seconds
+DEFAULT_IDENTITY_CACHE_TTL = 24 * 60 * 60
+
+
+def user_cache_dir() -> Path:
+    """Return the directory UVI keeps its caches in.
+
+    Returns:
+        The cache directory (not necessarily existing yet)
+    """
+    if os.environ.get("UVI_CACHE_DIR"):
+        return Path(os.environ["UVI_CACHE_DIR"])
+    if os.environ.get("XDG_CACHE_HOME"):
+        return Path(os.environ["XDG_CACHE_HOME"]) / "uvi"
+    if sys.platform == "win32" and os.environ.get("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "uvi"
+    return Path.home() / ".cache" / "uvi"
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """Write JSON to ``path`` so that readers never see a partial file.
+
+    Args:
+        path: Destination file; parent directories are created as needed
+        data: JSON-serialisable data
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+            json.dump(data, tmp_file, indent=2, sort_keys=True)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_name)
+        raise
+
+
+def identity_dependencies(cwd: Path | None = None) -> list[Path]:
+    """List the files a resolved identity depends on.
+
+    Args:
+        cwd: Directory identity is resolved from (defaults to the current directory)
+
+    Returns:
+        Paths of every git config file (including included files), the
+        repository ``HEAD`` and the gh ``hosts.yml``; missing files are listed too
+    """
+    files: list[Path] = []
+    try:
+        load_git_config(cwd, files_read=files)
+    except GitConfigError:
+        # Fall back to the top-level files; git itself will be asked on a miss
+        files = [path for paths in git_config_files(cwd).values() for path in paths]
+
+    git_dir = find_git_dir(cwd)
+    if git_dir is not None:
+        files.append(git_dir / "HEAD")
+    files.append(gh_config_dir() / "hosts.yml")
+    return list(dict.fromkeys(files))
+
+
+def _file_stamp(path: Path) -> list[int] | None:
+    """Return ``[mtime_ns, size]`` for a file, or None if it does not exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def identity_fingerprint(cwd: Path | None = None) -> dict[str, list[int] | None]:
+    """Snapshot the state of every file the identity depends on.
+
+    Take the snapshot before resolving so that a file edited mid-resolution
+    invalidates the entry instead of being masked by it.
+
+    Args:
+        cwd: Directory identity is resolved from (defaults to the current directory)
+
+    Returns:
+        Mapping of path to ``[mtime_ns, size]``, or None for missing files
+    """
+    return {str(path): _file_stamp(path) for path in identity_dependencies(cwd)}
+
+
+def _identity_cache_path(cwd: Path | None = None) -> Path:
+    """Return the cache entry path for the repository containing ``cwd``.
+
+    Identity can differ per repository (local config, ``includeIf``), so each
+    git directory gets its own entry; directories outside a repository share one.
+    """
+    git_dir = find_git_dir(cwd)
+    key = str(git_dir.resolve()) if git_dir is not None else ""
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    return user_cache_dir() / "identity" / f"{digest}.json"
+
+
+def load_cached_identity(
+    ttl: float = DEFAULT_IDENTITY_CACHE_TTL,
+    cwd: Path | None = None,
+) -> dict[str, str] | None:
+    """Return the cached identity if it is still valid.
+
+    Args:
+        ttl: Maximum age of the entry in seconds
+        cwd: Directory identity is resolved from (defaults to the current directory)
+
+    Returns:
+        The cached context dict, or None on a miss, expiry or invalidation
+    """
+    if ttl <= 0:
+        return None
+    try:
+        with _identity_cache_path(cwd).open(encoding="utf-8") as cache_file:
+            entry = json.load(cache_file)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(entry, dict) or entry.get("version") != IDENTITY_CACHE_VERSION:
+        return None
+    if not 0 <= time.time() - entry.get("created", 0) <= ttl:
+        return None
+    stamps: dict[str, Any] = entry.get("files", {})
+    if any(_file_stamp(Path(path)) != stamp for path, stamp in stamps.items()):
+        return None
+    context = entry.get("context")
+    return context if isinstance(context, dict) else None
+
+
+def store_cached_identity(
+    context: dict[str, str],
+    fingerprint: dict[str, list[int] | None],
+    cwd: Path | None = None,
+) -> None:
+    """Save a resolved identity to the cache.
+
+    Failures to write are ignored: the cache is an optimisation only.
+
+    Args:
+        context: The resolved context dict
+        fingerprint: File state taken with ``identity_fingerprint`` before resolving
+        cwd: Directory identity was resolved from (defaults to the current directory)
+    """
+    entry = {
+        "version": IDENTITY_CACHE_VERSION,
+        "created": time.time(),
+        "files": fingerprint,
+        "context": context,
+    }
+    with contextlib.suppress(OSError):
+        write_json_atomic(_identity_cache_path(cwd), entry)
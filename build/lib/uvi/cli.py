@@ -0,0 +1,684 @@
+"""UVI CLI - Python Project Generator.
+
+This module provides the command-line interface for UVI (uv init),
+a Python project template generator that creates pre-configured projects
+optimized for the uv package manager. It uses cookiecutter to streamline
+the creation of new Python projects with modern best practices and tooling pre-configured.
+
+Features:
+    - Generates a complete Python project structure
+    - Configures modern development tools (pytest, tox, pre-commit)
+    - Sets up documentation (MkDocs)
+    - Includes CI/CD pipelines
+    - Configures code coverage reporting
+    - Adds Docker support
+    - Implements UV package management
+
+Usage:
+    uvi [--version] [--identity-timeout DURATION] [--refresh-identity] [--template PATH]
+        [--profile PATH] [--profile-format {json,chrome}]
+        [--no-input] [--answers FILE] [--dry-run [--format {text,json}]] [--bootstrap]
+        [--archive {tar.gz,zip} [-o PATH]]
+    uvi batch SPECS [--jobs N] [--output-dir DIR]
+    uvi workspace NAME MEMBER [MEMBER ...] [--answers FILE] [--no-input] [--output-dir DIR]
+    uvi verify-matrix [--jobs N]
+    uvi update [PROJECT] [--answers FILE] [--dry-run]
+    uvi cache warm [--answers FILE] [--uv-cache-dir DIR] [--refresh] [--jobs N]
+    uvi serve [--host HOST] [--port PORT | --socket PATH] [--jobs N] [--max-pending N]
+
+The CLI will interactively prompt for project configuration options unless
+--no-input is specified. It uses the template snapshot bundled with the
+package (or the template in a source checkout) and never needs the network.
+
+Example:
+    $ uvi  # Launches interactive project creation
+    $ uvi --version  # Displays the current version
+    $ uvi --bootstrap  # Creates a project, then sets up git, uv and pre-commit in parallel
+    $ uvi --no-input --answers answers.json --dry-run --format json  # Previews the files without writing them
+    $ uvi --no-input --archive tar.gz -o - | curl --data-binary @- "$IMPORT_URL"  # Streams the project without writing it
+    $ uvi batch specs.jsonl --jobs 8 --output-dir services  # Generates one project per spec
+    $ uvi workspace acme acme-core acme-api  # Generates a uv workspace with two packages and one lock
+    $ uvi verify-matrix  # Renders and checks every option combination in memory
+    $ uvi update my-project  # Brings a generated project up to date with the template
+    $ uvi cache warm  # Caches every dependency set so new projects can 'uv sync --offline'
+    $ uvi serve --socket /run/uvi.sock  # Keeps the template loaded and generates projects on request
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+from typing import Any, TextIO
+
+from . import __version__, profile
+from .cache import DEFAULT_IDENTITY_CACHE_TTL, identity_fingerprint, load_cached_identity, store_cached_identity
+from .identity import discover_identity, github_handle_from_email
+from .profile import PROFILE_FORMATS, span
+from .template import resolve_template
+
+# Generic defaults used when no identity source has a value
+DEFAULT_USER_INFO = {
+    "author": "Your Name",
+    "email": "your.email@example.com",
+    "author_github_handle": "your-github-handle",
+}
+
+# How each identity field is described in progress messages
+FIELD_LABELS = {"author": "name", "email": "email", "author_github_handle": "GitHub handle"}
+
+# Total time budget for identity discovery, in seconds
+DEFAULT_IDENTITY_TIMEOUT = 2.0
+
+# Output formats of --dry-run
+DRY_RUN_FORMATS = ("text", "json")
+
+# Formats of --archive; the same as uvi.archive.ARCHIVE_FORMATS, which is only imported to write one
+ARCHIVE_FORMATS = ("tar.gz", "zip")
+
+# Duration suffixes accepted on the command line, longest first so "ms" wins over "s"
+DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0, "d": 86400.0}
+
+
+def get_user_info(
+    timeout: float = DEFAULT_IDENTITY_TIMEOUT,
+    refresh: bool = False,
+    cache_ttl: float = DEFAULT_IDENTITY_CACHE_TTL,
+) -> dict[str, str]:
+    """Get user information from various sources.
+
+    A previously resolved identity is reused from the on-disk cache while the
+    git and GitHub CLI config files it was derived from are unchanged and it is
+    younger than ``cache_ttl``. Otherwise the GitHub API, the local git config,
+    the user-wide git config and the GitHub CLI login are queried concurrently,
+    and waiting stops once every field has its best available value or the time
+    budget runs out. Preference order is:
+    1. The GitHub API profile of the logged-in GitHub CLI user for name and email
+    2. Repository-local git config, then global git config, for what it leaves out
+    3. The GitHub CLI login for the handle
+    4. Generic defaults as a last resort
+
+    Args:
+        timeout: Total time budget for identity discovery, in seconds
+        refresh: Ignore any cached identity and resolve it again
+        cache_ttl: Maximum age of a cached identity in seconds (0 disables the cache)
+
+    Returns:
+        Dict containing user information from the best available source
+    """
+    if not refresh:
+        with span("identity-cache"):
+            cached = load_cached_identity(cache_ttl)
+        if cached is not None:
+            print("Using cached user information (run with --refresh-identity to update it).")
+            return {**DEFAULT_USER_INFO, **cached}
+
+    with span("identity-discovery"):
+        fingerprint = identity_fingerprint()
+        result = discover_identity(timeout)
+    context = dict(DEFAULT_USER_INFO)
+
+    for field, (source, value) in result.values.items():
+        context[field] = value
+        print(f"Using {source} {FIELD_LABELS[field]}: {value}")
+
+    if "author_github_handle" not in result.values:
+        # Try to extract GitHub handle from email (simple heuristic)
+        handle = github_handle_from_email(context["email"])
+        if handle:
+            context["author_github_handle"] = handle
+            print(f"Extracted GitHub handle from email: {handle}")
+
+    if result.timed_out:
+        print(f"Identity sources timed out after {timeout * 1000:.0f}ms: {', '.join(result.timed_out)}")
+    if not result.values:
+        print("No user information found. Using generic defaults.")
+
+    # A partial answer caused by a timeout should not outlive this run
+    if cache_ttl > 0 and not result.timed_out:
+        store_cached_identity(context, fingerprint)
+
+    return context
+
+
+def parse_duration(value: str) -> float:
+    """Parse a duration such as "300ms", "2s", "12h" or "1.5" into seconds.
+
+    Args:
+        value: The duration; bare numbers are seconds
+
+    Returns:
+        The duration in seconds
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a non-negative duration
+    """
+    text = value.strip().lower()
+    scale = 1.0
+    for suffix, multiplier in DURATION_UNITS.items():
+        if text.endswith(suffix):
+            text, scale = text[: -len(suffix)], multiplier
+            break
+    try:
+        seconds = float(text) * scale
+    except ValueError:
+        seconds = -1.0
+    if seconds < 0:
+        msg = f"invalid duration {value!r}; use e.g. 300ms or 2s"
+        raise argparse.ArgumentTypeError(msg)
+    return seconds
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser.
+
+    Returns:
+        The configured argument parser
+    """
+    parser = argparse.ArgumentParser(description="Create a new Python project using uvi template")
+    parser.add_argument("--version", action="version", version=f"uvi {__version__}")
+    parser.add_argument(
+        "--identity-timeout",
+        type=parse_duration,
+        default=DEFAULT_IDENTITY_TIMEOUT,
+        metavar="DURATION",
+        help="time budget for detecting author details, e.g. 300ms or 2s (default: %(default)ss)",
+    )
+    parser.add_argument(
+        "--refresh-identity",
+        action="store_true",
+        help="ignore cached author details and detect them again",
+    )
+    parser.add_argument(
+        "--identity-cache-ttl",
+        type=parse_duration,
+        default=DEFAULT_IDENTITY_CACHE_TTL,
+        metavar="DURATION",
+        help="how long detected author details are reused, e.g. 12h; 0 disables the cache (default: %(default)ss)",
+    )
+
+    parser.add_argument(
+        "--template",
+        default=None,
+        metavar="PATH",
+        help="template directory or snapshot archive to use instead of the bundled one",
+    )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        metavar="PATH",
+        help="write a timing profile of the run to PATH (also enabled by UVI_PROFILE=PATH)",
+    )
+    parser.add_argument(
+        "--profile-format",
+        choices=PROFILE_FORMATS,
+        default=None,
+        help="profile format: json summary or chrome trace events (default: json, or UVI_PROFILE_FORMAT)",
+    )
+
+    parser.add_argument(
+        "--no-input",
+        action="store_true",
+        help="do not prompt; use the template defaults, detected author details and --answers",
+    )
+    parser.add_argument(
+        "--answers",
+        default=None,
+        metavar="FILE",
+        help='JSON object of template variables to use instead of prompting for them, or "-" for stdin',
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="render the project in memory and list its files instead of writing them",
+    )
+    parser.add_argument(
+        "--bootstrap",
+        action="store_true",
+        help="after generating, run git init, uv sync and pre-commit install concurrently",
+    )
+    parser.add_argument(
+        "--format",
+        choices=DRY_RUN_FORMATS,
+        default="text",
+        help="--dry-run output: a file listing or a JSON manifest (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--archive",
+        choices=ARCHIVE_FORMATS,
+        default=None,
+        help="write the project into an archive instead of a directory, without touching the disk otherwise",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        metavar="PATH",
+        help='--archive destination, or "-" for standard output (default: <project>.<format>)',
+    )
+
+    # The same options for the subcommands that use them, accepted after the subcommand's name too.
+    # They default to SUPPRESS so that a value given before the subcommand is not reset
+    answers_option = argparse.ArgumentParser(add_help=False)
+    answers_option.add_argument(
+        "--answers",
+        default=argparse.SUPPRESS,
+        metavar="FILE",
+        help='JSON object of template variables to use, or "-" for stdin',
+    )
+    no_input_option = argparse.ArgumentParser(add_help=False)
+    no_input_option.add_argument(
+        "--no-input",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="do not prompt; use the template defaults, detected author details and --answers",
+    )
+    dry_run_option = argparse.ArgumentParser(add_help=False)
+    dry_run_option.add_argument(
+        "--dry-run",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="only list what would change, without writing anything",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    batch = subparsers.add_parser(
+        "batch",
+        help="generate many projects without prompting, one per line of a JSON Lines spec file",
+        description="Generate one project per line of SPECS, each an extra_context object.",
+    )
+    batch.add_argument("specs", help='JSON Lines file of extra_context objects, or "-" for stdin')
+    batch.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of worker processes (default: number of CPUs)",
+    )
+    batch.add_argument(
+        "-o",
+        "--output-dir",
+        default=".",
+        help="directory to create the projects in (default: current directory)",
+    )
+    workspace = subparsers.add_parser(
+        "workspace",
+        parents=[answers_option, no_input_option],
+        help="generate a uv workspace of several packages sharing one dev group, lock and environment",
+        description=(
+            "Generate the workspace root NAME with one member package per MEMBER below packages/. "
+            "--answers applies to the root and every member."
+        ),
+    )
+    workspace.add_argument("name", help="project name of the workspace root")
+    workspace.add_argument("members", nargs="+", metavar="MEMBER", help="project name of a member package")
+    workspace.add_argument(
+        "-o",
+        "--output-dir",
+        default=".",
+        help="directory to create the workspace in (default: current directory)",
+    )
+    verify = subparsers.add_parser(
+        "verify-matrix",
+        help="render every combination of the template's options in memory and check the results",
+        description="Render every option combination without writing files and check each rendered project.",
+    )
+    verify.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of worker processes (default: number of CPUs)",
+    )
+    update = subparsers.add_parser(
+        "update",
+        parents=[answers_option, dry_run_option],
+        help="re-render a generated project with the current template and write only what changed",
+        description=(
+            "Render PROJECT again from its recorded answers (changed by --answers) and the current template, "
+            "and merge the changes into files you have edited. Use --dry-run to only list the changes."
+        ),
+    )
+    update.add_argument("project", nargs="?", default=".", help="project to update (default: current directory)")
+
+    cache = subparsers.add_parser("cache", help="manage uvi's caches", description="Manage uvi's caches.")
+    cache_commands = cache.add_subparsers(dest="cache_command", metavar="COMMAND", required=True)
+    warm = cache_commands.add_parser(
+        "warm",
+        parents=[answers_option],
+        help="download the dependencies of every answer combination into uv's cache",
+        description=(
+            "Sync each dependency set the template can produce (only the one --answers selects, if given) "
+            "into uv's cache, so generated projects can run 'uv sync --offline'."
+        ),
+    )
+    warm.add_argument("--uv-cache-dir", default=None, metavar="DIR", help="uv cache to seed (default: uv's own)")
+    warm.add_argument("--refresh", action="store_true", help="sync dependency sets that were warmed before, too")
+    warm.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of dependency sets synced at once (default: all)",
+    )
+    serve = subparsers.add_parser(
+        "serve",
+        help="keep the template loaded and generate projects on request over HTTP",
+        description=(
+            "Serve POST /generate (a JSON object with answers, and an archive format or an output_dir) "
+            "and GET /stats on a localhost port or a Unix socket."
+        ),
+    )
+    serve.add_argument("--host", default="127.0.0.1", help="interface to listen on (default: %(default)s)")
+    serve.add_argument("--port", type=int, default=8787, help="port to listen on (default: %(default)s)")
+    serve.add_argument("--socket", default=None, metavar="PATH", help="listen on a Unix socket instead of a port")
+    serve.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of worker processes (default: number of CPUs)",
+    )
+    serve.add_argument(
+        "--max-pending",
+        type=int,
+        default=None,
+        metavar="N",
+        help="requests allowed to wait for a worker before new ones get 503 (default: 4 per worker)",
+    )
+    return parser
+
+
+def load_answers(path: str) -> dict[str, str]:
+    """Read template variables from a JSON file.
+
+    Args:
+        path: Path to a file holding one JSON object, or "-" for standard input
+
+    Returns:
+        The template variables
+
+    Raises:
+        ValueError: If the file does not hold a JSON object
+    """
+    if path == "-":
+        text = sys.stdin.read()
+    else:
+        with open(path, encoding="utf-8") as answers_file:
+            text = answers_file.read()
+    try:
+        answers = json.loads(text)
+    except json.JSONDecodeError as e:
+        msg = f"{path}: invalid JSON ({e.msg})"
+        raise ValueError(msg) from e
+    if not isinstance(answers, dict):
+        msg = f"{path}: expected a JSON object, got {type(answers).__name__}"
+        raise ValueError(msg)  # noqa: TRY004 - malformed input, not a programming error
+    return answers
+
+
+def format_manifest(manifest: dict[str, Any], output_format: str) -> str:
+    """Render a ``--dry-run`` project manifest for printing.
+
+    Args:
+        manifest: Manifest from ``uvi.render.preview_project``
+        output_format: ``text`` for a file listing, ``json`` for the manifest itself
+
+    Returns:
+        The text to print
+    """
+    if output_format == "json":
+        return json.dumps(manifest, indent=2)
+    lines = [f"{manifest['project']}/ ({manifest['file_count']} files, {manifest['total_size']} bytes)"]
+    lines.extend(
+        f"  {entry['size']:>8}  {entry['mode']}  {entry['sha256'][:12]}  {entry['path']}" for entry in manifest["files"]
+    )
+    return "\n".join(lines)
+
+
+def create_or_preview(args: argparse.Namespace, template: str, defaults: dict[str, str], stdout: TextIO) -> None:
+    """Create one project, or with --dry-run print what it would contain.
+
+    Args:
+        args: Parsed command-line arguments
+        template: Template to render
+        defaults: Detected author details, used to prefill the prompts
+        stdout: Where the --dry-run listing and an --archive for "-o -" go
+    """
+    # The renderer pulls in cookiecutter, Jinja2, requests and friends, so it is
+    # imported only once we know a project is actually going to be rendered;
+    # this keeps --version and --help fast
+    from .hooks import validate_answers  # noqa: PLC0415
+    from .render import archive_project, create_project, preview_project  # noqa: PLC0415
+
+    answers = load_answers(args.answers) if args.answers else {}
+    extra_context = {**defaults, **answers}
+    if args.archive:
+        # Stream straight into the archive; nothing else is written
+        output = stdout.buffer if args.output == "-" else args.output
+        name = archive_project(
+            template,
+            args.archive,
+            output,
+            extra_context=extra_context,
+            no_input=args.no_input,
+            validate=validate_answers,
+        )
+        destination = "standard output" if args.output == "-" else args.output or f"{name}.{args.archive}"
+        print(f"Archived {name} to {destination}")
+        return
+    if args.dry_run:
+        manifest = preview_project(
+            template, extra_context=extra_context, no_input=args.no_input, validate=validate_answers
+        )
+        print(format_manifest(manifest, args.format), file=stdout)
+        return
+
+    # Prompt for the answers and render only the files they select
+    project_dir = create_project(
+        template,
+        no_input=args.no_input,  # Prompt unless --no-input
+        extra_context=extra_context,  # Prefill with user info and --answers
+        validate=validate_answers,  # Reject bad answers before anything is written
+    )
+    if args.bootstrap:
+        from .bootstrap import bootstrap  # noqa: PLC0415
+        from .warm import is_warm  # noqa: PLC0415
+
+        if bootstrap(project_dir, offline=is_warm(project_dir, template, os.environ.get("UV_CACHE_DIR"))):
+            sys.exit(1)
+
+
+def run_batch_command(args: argparse.Namespace, template: str, defaults: dict[str, str]) -> None:
+    """Generate one project per spec (``uvi batch``).
+
+    Args:
+        args: Parsed command-line arguments
+        template: Template to render
+        defaults: Detected author details, applied before each spec
+    """
+    from .batch import run_batch  # noqa: PLC0415
+
+    with span("batch"):
+        failures = run_batch(
+            args.specs, output_dir=args.output_dir, jobs=args.jobs, defaults=defaults, template=template
+        )
+    if failures:
+        print(f"{failures} project(s) failed to generate", file=sys.stderr)
+        sys.exit(1)
+
+
+def run_workspace_command(args: argparse.Namespace, template: str, defaults: dict[str, str]) -> None:
+    """Generate a uv workspace and its member packages (``uvi workspace``).
+
+    Args:
+        args: Parsed command-line arguments
+        template: Template to render
+        defaults: Detected author details, applied before the answers
+    """
+    from .workspace import generate_workspace  # noqa: PLC0415
+
+    answers = load_answers(args.answers) if args.answers else None
+    with span("workspace"):
+        workspace_dir = generate_workspace(
+            args.name, args.members, output_dir=args.output_dir, answers=answers, defaults=defaults, template=template
+        )
+    print(f"Created workspace {args.name} with {len(args.members)} package(s) at {workspace_dir}")
+
+
+def run_verify_matrix_command(args: argparse.Namespace, template: str, defaults: dict[str, str]) -> None:
+    """Render and check every option combination (``uvi verify-matrix``).
+
+    Args:
+        args: Parsed command-line arguments
+        template: Template to render
+        defaults: Detected author details (unused; the matrix uses the template defaults)
+    """
+    from .matrix import run_verify_matrix  # noqa: PLC0415
+
+    with span("verify-matrix"):
+        problems = run_verify_matrix(template, jobs=args.jobs)
+    if problems:
+        sys.exit(1)
+
+
+def run_update_command(args: argparse.Namespace, template: str, defaults: dict[str, str]) -> None:
+    """Bring a generated project up to date (``uvi update``).
+
+    Args:
+        args: Parsed command-line arguments
+        template: Template to update to
+        defaults: Detected author details (unused; the project's recorded answers are used)
+    """
+    from .update import run_update  # noqa: PLC0415
+
+    answers = load_answers(args.answers) if args.answers else None
+    with span("update"):
+        conflicts = run_update(args.project, template=template, answers=answers, dry_run=args.dry_run)
+    if conflicts:
+        sys.exit(1)
+
+
+def run_cache_command(args: argparse.Namespace, template: str, defaults: dict[str, str]) -> None:
+    """Manage uvi's caches (``uvi cache warm``).
+
+    Args:
+        args: Parsed command-line arguments
+        template: Template whose dependencies are cached
+        defaults: Detected author details (unused)
+    """
+    from .warm import run_warm_cache  # noqa: PLC0415
+
+    answers = load_answers(args.answers) if args.answers else None
+    with span("cache-warm"):
+        failures = run_warm_cache(
+            template, answers=answers, uv_cache_dir=args.uv_cache_dir, refresh=args.refresh, jobs=args.jobs
+        )
+    if failures:
+        sys.exit(1)
+
+
+def run_serve_command(args: argparse.Namespace, template: str, defaults: dict[str, str]) -> None:
+    """Generate projects on request until interrupted (``uvi serve``).
+
+    Args:
+        args: Parsed command-line arguments
+        template: Template to render
+        defaults: Detected author details, applied before each request's answers
+    """
+    from .serve import open_service, serve  # noqa: PLC0415
+
+    service = open_service(template, defaults, jobs=args.jobs, max_pending=args.max_pending)
+    serve(service, host=args.host, port=args.port, socket_path=args.socket)
+
+
+# Handlers for the subcommands, called with the arguments, template and author details
+COMMANDS = {
+    "batch": run_batch_command,
+    "workspace": run_workspace_command,
+    "verify-matrix": run_verify_matrix_command,
+    "update": run_update_command,
+    "cache": run_cache_command,
+    "serve": run_serve_command,
+}
+
+
+def run(args: argparse.Namespace) -> None:
+    """Create the project(s) requested on the command line.
+
+    Args:
+        args: Parsed command-line arguments
+    """
+    stdout = sys.stdout
+    # With --dry-run or -o -, stdout carries only the listing or the archive; progress messages go to stderr
+    previewing = (args.dry_run or args.output == "-") and args.command is None
+    quiet = contextlib.redirect_stdout(sys.stderr) if previewing else contextlib.nullcontext()
+    try:
+        with quiet:
+            # Get user information from the best available source
+            with span("identity"):
+                context = get_user_info(
+                    timeout=args.identity_timeout,
+                    refresh=args.refresh_identity,
+                    cache_ttl=args.identity_cache_ttl,
+                )
+
+            with span("template"):
+                template = resolve_template(args.template)
+
+            if args.command in COMMANDS:
+                COMMANDS[args.command](args, template, context)
+                return
+
+            create_or_preview(args, template, context, stdout)
+    except OSError as e:
+        print(f"File system error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Invalid configuration: {e}", file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\nOperation cancelled by user", file=sys.stderr)
+        sys.exit(1)
+    except (subprocess.SubprocessError, json.JSONDecodeError) as e:
+        print(f"External process or data error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except (ImportError, ModuleNotFoundError) as e:
+        print(f"Missing module error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        # Keep a broad exception handler as a last resort for truly unexpected errors
+        print(f"Unexpected error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def main() -> None:
+    """Create a new Python project using the uvi template."""
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.archive and (args.dry_run or args.bootstrap):
+        parser.error("--archive cannot be combined with --dry-run or --bootstrap")
+    if args.output and not args.archive:
+        parser.error("-o/--output is only used with --archive")
+    profile_path = args.profile or os.environ.get("UVI_PROFILE")
+    if not profile_path:
+        run(args)
+        return
+
+    profile_format = args.profile_format or os.environ.get("UVI_PROFILE_FORMAT") or "json"
+    if profile_format not in PROFILE_FORMATS:
+        parser.error(f"unknown profile format {profile_format!r} (choose from {', '.join(PROFILE_FORMATS)})")
+    profiler = profile.start()
+    try:
+        run(args)
+    finally:
+        profile.stop()
+        profiler.write(profile_path, profile_format)
+        print(f"Profile written to {profile_path}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""In-process generation hooks for UVI.
+
+Cookiecutter runs ``hooks/pre_gen_project.py`` and ``hooks/post_gen_project.py``
+by rendering each to a temporary file and starting a new Python interpreter.
+For a regex check and a few file moves, the interpreter start-up costs more
+than the work itself, so UVI calls Python functions in its own process
+instead.
+
+A template opts in through the ``hooks`` key of ``template-manifest.json``,
+mapping a hook name to a ``module:function`` reference::
+
+    "hooks": {"pre_gen_project": "uvi.hooks:pre_gen_project"}
+
+The function is called as ``function(context, project_dir)``; raising an
+exception fails the hook. Hooks without an entry still run as scripts through
+cookiecutter, and plain ``cookiecutter`` runs keep using the scripts in
+``hooks/``, which must stay equivalent to the functions below.
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import re
+import shutil
+from collections.abc import Callable
+from typing import Any
+
+from .profile import span
+from .render import LOCK_FILE, excluded_paths, load_manifest, project_lock
+
+# Keep in sync with hooks/pre_gen_project.py
+PROJECT_NAME_REGEX = r"^[-a-zA-Z][-a-zA-Z0-9]+$"
+PROJECT_SLUG_REGEX = r"^[_a-zA-Z][_a-zA-Z0-9]+$"
+
+HookFunction = Callable[[dict[str, Any], str], None]
+
+
+def validate_project_names(variables: dict[str, Any]) -> None:
+    """Check that the project name and slug are usable.
+
+    Args:
+        variables: The ``cookiecutter`` part of the context
+
+    Raises:
+        ValueError: If either does not match the template's naming rules
+    """
+    project_name = variables["project_name"]
+    if not re.match(PROJECT_NAME_REGEX, project_name):
+        msg = f"The project name {project_name} is not a valid Python module name. Please do not use a _ and use - instead"
+        raise ValueError(msg)
+    project_slug = variables["project_slug"]
+    if not re.match(PROJECT_SLUG_REGEX, project_slug):
+        msg = f"The project slug {project_slug} is not a valid Python module name. Please do not use a - and use _ instead"
+        raise ValueError(msg)
+
+
+def validate_answers(variables: dict[str, Any]) -> None:
+    """Check that the answers can be rendered into a working project.
+
+    Args:
+        variables: The ``cookiecutter`` part of the context
+
+    Raises:
+        ValueError: If the project names are unusable or ``ci_test_shards``
+            is not a positive whole number
+    """
+    validate_project_names(variables)
+    shards = str(variables.get("ci_test_shards", "1"))
+    if not shards.isdigit() or int(shards) < 1:
+        msg = f"ci_test_shards must be a positive whole number, not {shards!r}"
+        raise ValueError(msg)
+
+
+def pre_gen_project(context: dict[str, Any], project_dir: str) -> None:
+    """Validate the answers before the project is generated.
+
+    Args:
+        context: Fully resolved context
+        project_dir: The project directory (unused)
+    """
+    validate_answers(context["cookiecutter"])
+
+
+def post_gen_project(context: dict[str, Any], project_dir: str) -> None:
+    """Apply the template manifest to a generated project and add its ``uv.lock``.
+
+    Projects rendered by ``uvi.render`` already match the manifest, so this
+    only finds work to do for files generated some other way.
+
+    Args:
+        context: Fully resolved context
+        project_dir: The generated project directory
+    """
+    variables = context["cookiecutter"]
+    manifest = load_manifest(variables["_repo_dir"])
+    for path in excluded_paths(manifest, variables):
+        target = os.path.join(project_dir, *path.split("/"))
+        if os.path.isdir(target):
+            shutil.rmtree(target)
+        elif os.path.exists(target):
+            os.remove(target)
+    for source, target in manifest.get("rename", {}).items():
+        source_path = os.path.join(project_dir, *source.split("/"))
+        if os.path.exists(source_path):
+            os.replace(source_path, os.path.join(project_dir, *target.split("/")))
+    lock_path = os.path.join(project_dir, LOCK_FILE)
+    if not os.path.exists(lock_path):
+        lock = project_lock(variables["_repo_dir"], manifest, variables)
+        if lock is not None:
+            with open(lock_path, "wb") as lock_file:
+                lock_file.write(lock)
+
+
+def load_hook(repo_dir: str, hook_name: str) -> HookFunction | None:
+    """Return the in-process function a template declares for a hook.
+
+    Args:
+        repo_dir: Local template directory
+        hook_name: Hook name, e.g. ``pre_gen_project``
+
+    Returns:
+        The hook function, or None if the hook must run as a script
+    """
+    reference = load_manifest(repo_dir).get("hooks", {}).get(hook_name)
+    if not reference:
+        return None
+    module_name, _, function_name = reference.partition(":")
+    function: HookFunction = getattr(importlib.import_module(module_name), function_name)
+    return function
+
+
+def run_hook(
+    repo_dir: str,
+    hook_name: str,
+    project_dir: str,
+    context: dict[str, Any],
+    delete_project_on_failure: bool,
+) -> None:
+    """Run a generation hook, in-process when the template declares a function for it.
+
+    Mirrors ``cookiecutter.hooks.run_hook_from_repo_dir``, which is used for
+    hooks that have no in-process function.
+
+    Args:
+        repo_dir: Local template directory
+        hook_name: Hook name, e.g. ``pre_gen_project``
+        project_dir: The project directory
+        context: Fully resolved context
+        delete_project_on_failure: Remove ``project_dir`` if the hook fails
+
+    Raises:
+        FailedHookException: If the hook fails
+    """
+    from cookiecutter.exceptions import FailedHookException  # noqa: PLC0415
+
+    function = load_hook(repo_dir, hook_name)
+    if function is None:
+        from cookiecutter.hooks import run_hook_from_repo_dir  # noqa: PLC0415
+
+        with span(hook_name, "hook", in_process=False):
+            run_hook_from_repo_dir(repo_dir, hook_name, project_dir, context, delete_project_on_failure)
+        return
+
+    try:
+        with span(hook_name, "hook", in_process=True):
+            function(context, project_dir)
+    except Exception as e:
+        if delete_project_on_failure:
+            shutil.rmtree(project_dir, ignore_errors=True)
+        msg = f"{hook_name} hook failed: {e}"
+        raise FailedHookException(msg) from e
@@ -0,0 +1,875 @@
+"""Native author identity resolution for UVI.
+
+Reads git configuration files and the GitHub CLI ``hosts.yml`` directly in
+Python so that the author name, email and GitHub handle can be prefilled
+without spawning ``git`` or ``gh`` processes. When a file cannot be parsed
+natively, a single ``git config --list`` (or ``gh config get``) call is used
+as a fallback so that the result always matches what the tools themselves
+would report.
+
+Supported git configuration features:
+    - System, XDG, global and repository-local files, in git's precedence order
+    - ``GIT_CONFIG_SYSTEM``, ``GIT_CONFIG_NOSYSTEM``, ``GIT_CONFIG_GLOBAL`` and ``GIT_DIR``
+    - Quoted values, escape sequences, comments and line continuations
+    - ``[include]`` and ``[includeIf "gitdir:..."]``, ``gitdir/i:`` and ``onbranch:``
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import queue
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from .profile import span
+
+# Scopes in increasing order of precedence, matching git's own lookup order
+GIT_CONFIG_SCOPES = ("system", "global", "local")
+
+# Git refuses to follow more than this many nested includes
+MAX_INCLUDE_DEPTH = 10
+
+DEFAULT_GH_HOST = "github.com"
+
+_KEY_RE = re.compile(r"[A-Za-z][A-Za-z0-9-]*")
+_SECTION_RE = re.compile(r"[A-Za-z0-9.-]+")
+_ESCAPES = {"n": "\n", "t": "\t", "b": "\b", "\\": "\\", '"': '"'}
+
+GitConfig = dict[str, dict[str, str]]
+
+
+class GitConfigError(ValueError):
+    """Raised when git configuration cannot be resolved natively."""
+
+    def __init__(self, source: Path, problem: str) -> None:
+        """Initialize the error.
+
+        Args:
+            source: The config file that could not be handled
+            problem: Short description of what went wrong
+        """
+        super().__init__(f"{problem} in {source}")
+        self.source = source
+
+
+def _parse_section_header(header: str, source: Path) -> tuple[str, str | None]:
+    """Split a ``[section "subsection"]`` header into its parts.
+
+    Args:
+        header: The text between the square brackets
+        source: The file being parsed, for error messages
+
+    Returns:
+        Tuple of the lowercased section name and the subsection (or None)
+    """
+    header = header.strip()
+    if '"' not in header:
+        if not _SECTION_RE.fullmatch(header):
+            raise GitConfigError(source, f"Invalid section header [{header}]")
+        # Deprecated [section.subsection] syntax: everything is case-insensitive
+        section, _, subsection = header.lower().partition(".")
+        return section, subsection or None
+
+    section, _, rest = header.partition(" ")
+    rest = rest.strip()
+    if not _SECTION_RE.fullmatch(section) or len(rest) < len('""') or rest[0] != '"' or rest[-1] != '"':
+        raise GitConfigError(source, f"Invalid section header [{header}]")
+    subsection = re.sub(r"\\(.)", r"\1", rest[1:-1])
+    return section.lower(), subsection
+
+
+def _parse_escape(text: str, pos: int, source: Path) -> tuple[str, int]:
+    """Decode the backslash sequence starting at ``pos``.
+
+    Args:
+        text: Full file contents
+        pos: Index of the backslash
+        source: The file being parsed, for error messages
+
+    Returns:
+        Tuple of the decoded text (empty for a line continuation) and the index after the sequence
+    """
+    following = text[pos + 1 : pos + 2]
+    if following == "\n":
+        return "", pos + 2
+    if text[pos + 1 : pos + 3] == "\r\n":
+        return "", pos + 3
+    if following not in _ESCAPES:
+        raise GitConfigError(source, f"Invalid escape sequence \\{following}")
+    return _ESCAPES[following], pos + 2
+
+
+def _parse_value(text: str, pos: int, source: Path) -> tuple[str, int]:
+    """Parse a config value starting at ``pos``.
+
+    Handles double quotes, backslash escapes, line continuations and trailing
+    comments the same way git does.
+
+    Args:
+        text: Full file contents
+        pos: Index of the first character after the ``=``
+        source: The file being parsed, for error messages
+
+    Returns:
+        Tuple of the parsed value and the index where parsing stopped
+    """
+    chars: list[str] = []
+    pending = ""  # Unquoted whitespace, kept only if more value follows
+    quoted = False
+    length = len(text)
+
+    while pos < length and text[pos] in " \t":
+        pos += 1
+
+    while pos < length:
+        char = text[pos]
+        if char == "\n" or (not quoted and char in "#;"):
+            # A trailing comment is skipped by the caller like any other comment
+            break
+        if char == "\\":
+            escaped, pos = _parse_escape(text, pos, source)
+            if escaped:
+                chars.append(pending + escaped)
+                pending = ""
+            continue
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char in " \t\r":
+            pending += char
+        else:
+            chars.append(pending + char)
+            pending = ""
+        pos += 1
+
+    if quoted:
+        raise GitConfigError(source, "Unterminated quoted value")
+    return "".join(chars), pos
+
+
+def parse_git_config_text(text: str, source: Path) -> list[tuple[str, str | None, str, str]]:
+    """Parse the contents of a single git config file.
+
+    Includes are not followed here; see ``read_git_config_file``.
+
+    Args:
+        text: The file contents
+        source: The path the contents were read from, for error messages
+
+    Returns:
+        Ordered list of ``(section, subsection, key, value)`` entries. Section and
+        key names are lowercased; keys without a value are reported as ``"true"``.
+    """
+    entries: list[tuple[str, str | None, str, str]] = []
+    section: tuple[str, str | None] | None = None
+    text = text.removeprefix("\ufeff")
+    pos = 0
+    length = len(text)
+
+    while pos < length:
+        char = text[pos]
+        if char in " \t\r\n":
+            pos += 1
+        elif char in "#;":
+            end = text.find("\n", pos)
+            pos = length if end == -1 else end
+        elif char == "[":
+            end = text.find("]", pos)
+            if end == -1:
+                raise GitConfigError(source, "Unterminated section header")
+            section = _parse_section_header(text[pos + 1 : end], source)
+            pos = end + 1
+        else:
+            match = _KEY_RE.match(text, pos)
+            if match is None or section is None:
+                raise GitConfigError(source, "Invalid config line")
+            key = match.group(0).lower()
+            pos = match.end()
+            while pos < length and text[pos] in " \t":
+                pos += 1
+            if pos < length and text[pos] == "=":
+                value, pos = _parse_value(text, pos + 1, source)
+            elif pos >= length or text[pos] in "\r\n#;":
+                value = "true"
+            else:
+                raise GitConfigError(source, f"Invalid config entry {key!r}")
+            entries.append((section[0], section[1], key, value))
+
+    return entries
+
+
+def _wildmatch(pattern: str, path: str, ignore_case: bool = False) -> bool:
+    """Match a path against a git wildmatch pattern.
+
+    Supports ``*``, ``?`` and ``**`` with pathname semantics, which is what
+    ``includeIf`` conditions use.
+
+    Args:
+        pattern: The glob pattern
+        path: The path to test
+        ignore_case: Whether to compare case-insensitively
+
+    Returns:
+        True if the pattern matches the whole path
+    """
+    regex = []
+    index = 0
+    while index < len(pattern):
+        if pattern.startswith("**/", index):
+            regex.append("(?:.*/)?")
+            index += 3
+        elif pattern.startswith("**", index):
+            regex.append(".*")
+            index += 2
+        elif pattern[index] == "*":
+            regex.append("[^/]*")
+            index += 1
+        elif pattern[index] == "?":
+            regex.append("[^/]")
+            index += 1
+        else:
+            regex.append(re.escape(pattern[index]))
+            index += 1
+    flags = re.IGNORECASE if ignore_case else 0
+    return re.fullmatch("".join(regex), path, flags) is not None
+
+
+def _gitdir_condition_matches(pattern: str, source: Path, git_dir: Path | None, ignore_case: bool) -> bool:
+    """Evaluate an ``includeIf "gitdir:..."`` condition.
+
+    Args:
+        pattern: The pattern after ``gitdir:``
+        source: The config file containing the condition
+        git_dir: The current repository's git directory, if any
+        ignore_case: True for ``gitdir/i:``
+
+    Returns:
+        True if the current repository matches the pattern
+    """
+    if git_dir is None:
+        return False
+    if pattern.startswith("~/"):
+        pattern = str(Path.home()) + pattern[1:]
+    elif pattern.startswith("./"):
+        pattern = source.parent.as_posix() + pattern[1:]
+    elif not (pattern.startswith("/") or re.match(r"[A-Za-z]:/", pattern)):
+        pattern = "**/" + pattern
+    if pattern.endswith("/"):
+        pattern += "**"
+
+    candidates = {git_dir.absolute().as_posix(), git_dir.resolve().as_posix()}
+    return any(_wildmatch(pattern, candidate, ignore_case) for candidate in candidates)
+
+
+def _current_branch(git_dir: Path | None) -> str | None:
+    """Read the checked-out branch name from ``HEAD``.
+
+    Args:
+        git_dir: The current repository's git directory, if any
+
+    Returns:
+        The short branch name, or None if detached or not in a repository
+    """
+    if git_dir is None:
+        return None
+    try:
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    prefix = "ref: refs/heads/"
+    return head[len(prefix) :] if head.startswith(prefix) else None
+
+
+def _include_condition_matches(condition: str, source: Path, git_dir: Path | None) -> bool:
+    """Evaluate the condition of an ``[includeIf]`` section.
+
+    Args:
+        condition: The subsection text, e.g. ``gitdir:~/work/``
+        source: The config file containing the condition
+        git_dir: The current repository's git directory, if any
+
+    Returns:
+        True if the include should be followed
+    """
+    kind, _, pattern = condition.partition(":")
+    if kind == "gitdir":
+        return _gitdir_condition_matches(pattern, source, git_dir, ignore_case=False)
+    if kind == "gitdir/i":
+        return _gitdir_condition_matches(pattern, source, git_dir, ignore_case=True)
+    if kind == "onbranch":
+        branch = _current_branch(git_dir)
+        if branch is None:
+            return False
+        if pattern.endswith("/"):
+            pattern += "**"
+        return _wildmatch(pattern, branch)
+    if kind == "hasconfig":
+        # Depends on the fully merged configuration; let git evaluate it
+        raise GitConfigError(source, f"Unsupported includeIf condition {condition!r}")
+    # Git silently ignores conditions it does not know about
+    return False
+
+
+def read_git_config_file(
+    path: Path,
+    git_dir: Path | None = None,
+    depth: int = 0,
+    files_read: list[Path] | None = None,
+) -> list[tuple[str, str]]:
+    """Read a git config file, following ``include`` and ``includeIf`` directives.
+
+    Missing files are treated as empty, as git does.
+
+    Args:
+        path: The config file to read
+        git_dir: The current repository's git directory, used by ``includeIf``
+        depth: Current include nesting depth
+        files_read: If given, every file consulted (including missing ones) is appended
+
+    Returns:
+        Ordered list of ``(key, value)`` pairs with includes expanded in place
+    """
+    if depth > MAX_INCLUDE_DEPTH:
+        raise GitConfigError(path, "Exceeded maximum include depth")
+    if files_read is not None:
+        files_read.append(path)
+    try:
+        text = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return []
+    except (OSError, UnicodeDecodeError) as e:
+        raise GitConfigError(path, f"Cannot read file ({e})") from e
+
+    result: list[tuple[str, str]] = []
+    for section, subsection, key, value in parse_git_config_text(text, path):
+        is_include = section == "include" and subsection is None
+        is_include_if = section == "includeif" and subsection is not None
+        if key == "path" and (is_include or is_include_if):
+            if is_include_if and not _include_condition_matches(subsection or "", path, git_dir):
+                continue
+            include = Path(os.path.expanduser(value))
+            if not include.is_absolute():
+                include = path.parent / include
+            result.extend(read_git_config_file(include, git_dir, depth + 1, files_read))
+            continue
+        name = f"{section}.{subsection}.{key}" if subsection is not None else f"{section}.{key}"
+        result.append((name, value))
+    return result
+
+
+def find_git_dir(start: Path | None = None) -> Path | None:
+    """Locate the git directory for the repository containing ``start``.
+
+    Honours ``GIT_DIR`` and ``.git`` files used by worktrees and submodules.
+
+    Args:
+        start: Directory to search from (defaults to the current directory)
+
+    Returns:
+        Path to the git directory, or None if not inside a repository
+    """
+    env_git_dir = os.environ.get("GIT_DIR")
+    if env_git_dir:
+        return Path(env_git_dir).absolute()
+
+    current = (start or Path.cwd()).absolute()
+    for directory in (current, *current.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            try:
+                content = dot_git.read_text(encoding="utf-8").strip()
+            except OSError:
+                return None
+            if content.startswith("gitdir:"):
+                target = Path(content[len("gitdir:") :].strip())
+                return target if target.is_absolute() else (directory / target)
+            return None
+    return None
+
+
+def _system_config_path() -> Path | None:
+    """Return the system-wide git config file location.
+
+    Returns:
+        The system config path, or None if system config is disabled
+    """
+    if os.environ.get("GIT_CONFIG_NOSYSTEM", "").lower() in ("1", "true", "yes", "on"):
+        return None
+    if os.environ.get("GIT_CONFIG_SYSTEM"):
+        return Path(os.environ["GIT_CONFIG_SYSTEM"])
+    if sys.platform == "win32":
+        program_files = os.environ.get("PROGRAMFILES", r"C:\Program Files")
+        return Path(program_files) / "Git" / "etc" / "gitconfig"
+    return Path("/etc/gitconfig")
+
+
+def _global_config_paths() -> list[Path]:
+    """Return the global git config files in the order git reads them.
+
+    Returns:
+        List of paths; later files override earlier ones
+    """
+    if os.environ.get("GIT_CONFIG_GLOBAL"):
+        return [Path(os.environ["GIT_CONFIG_GLOBAL"])]
+    xdg_home = os.environ.get("XDG_CONFIG_HOME") or os.path.join(Path.home(), ".config")
+    return [Path(xdg_home) / "git" / "config", Path.home() / ".gitconfig"]
+
+
+def git_config_files(cwd: Path | None = None) -> dict[str, list[Path]]:
+    """List the git config files that apply in ``cwd``, grouped by scope.
+
+    Args:
+        cwd: Directory to resolve the repository from (defaults to the current directory)
+
+    Returns:
+        Mapping of scope name to the files read for that scope
+    """
+    system = _system_config_path()
+    git_dir = find_git_dir(cwd)
+    return {
+        "system": [system] if system else [],
+        "global": _global_config_paths(),
+        "local": [git_dir / "config"] if git_dir else [],
+    }
+
+
+def load_git_config(
+    cwd: Path | None = None,
+    scopes: tuple[str, ...] = GIT_CONFIG_SCOPES,
+    files_read: list[Path] | None = None,
+) -> GitConfig:
+    """Read git configuration natively, without spawning git.
+
+    Args:
+        cwd: Directory to resolve the repository from (defaults to the current directory)
+        scopes: Which scopes to read
+        files_read: If given, every file consulted (including missing ones) is appended
+
+    Returns:
+        Mapping of scope name to a ``{key: value}`` dict where the last value wins
+
+    Raises:
+        GitConfigError: If any file cannot be parsed or uses unsupported features
+    """
+    git_dir = find_git_dir(cwd)
+    config: GitConfig = {}
+    for scope, paths in git_config_files(cwd).items():
+        if scope not in scopes:
+            continue
+        values: dict[str, str] = {}
+        for path in paths:
+            values.update(read_git_config_file(path, git_dir, files_read=files_read))
+        config[scope] = values
+    return config
+
+
+def load_git_config_via_subprocess(
+    scopes: tuple[str, ...] = GIT_CONFIG_SCOPES,
+    timeout: float | None = None,
+) -> GitConfig:
+    """Read git configuration with a single ``git config --list`` call.
+
+    Used only as a fallback when ``load_git_config`` cannot parse a file.
+
+    Args:
+        scopes: Which scopes to keep from git's output
+        timeout: Seconds to wait for git before giving up
+
+    Returns:
+        Mapping of scope name to a ``{key: value}`` dict, empty if git is unavailable
+    """
+    try:
+        # Fixed argument list, no user input involved
+        with span("git config --list", "subprocess"):
+            output = subprocess.check_output(
+                ["git", "config", "--list", "--includes", "--show-scope", "-z"],  # noqa: S607
+                stderr=subprocess.DEVNULL,
+                text=True,
+                timeout=timeout,
+            )
+    except (subprocess.SubprocessError, FileNotFoundError):
+        return {}
+
+    config: GitConfig = {scope: {} for scope in scopes}
+    fields = output.split("\0")
+    # Output is a sequence of "scope\0key\nvalue\0" records
+    for scope, entry in zip(fields[0::2], fields[1::2], strict=False):
+        key, _, value = entry.partition("\n")
+        if scope in config:
+            config[scope][key.lower()] = value if "\n" in entry else "true"
+    return config
+
+
+def git_config_value(config: GitConfig, key: str) -> tuple[str, str] | None:
+    """Look up the effective value of a key across scopes.
+
+    Args:
+        config: Configuration as returned by ``load_git_config``
+        key: The config key (e.g. "user.name")
+
+    Returns:
+        Tuple of the winning scope and value, or None if unset or empty
+    """
+    for scope in reversed(GIT_CONFIG_SCOPES):
+        value = config.get(scope, {}).get(key.lower())
+        if value:
+            return scope, value
+    return None
+
+
+def gh_config_dir() -> Path:
+    """Return the GitHub CLI configuration directory.
+
+    Returns:
+        The directory that holds ``hosts.yml``, following gh's own lookup rules
+    """
+    if os.environ.get("GH_CONFIG_DIR"):
+        return Path(os.environ["GH_CONFIG_DIR"])
+    if os.environ.get("XDG_CONFIG_HOME"):
+        return Path(os.environ["XDG_CONFIG_HOME"]) / "gh"
+    if sys.platform == "win32" and os.environ.get("APPDATA"):
+        return Path(os.environ["APPDATA"]) / "GitHub CLI"
+    return Path.home() / ".config" / "gh"
+
+
+def parse_gh_hosts(text: str) -> dict[str, str]:
+    """Extract the active user for each host from a gh ``hosts.yml``.
+
+    Only the block-style mapping gh itself writes is understood, which avoids
+    importing a YAML parser on the startup path.
+
+    Args:
+        text: Contents of ``hosts.yml``
+
+    Returns:
+        Mapping of host name to the logged-in user
+
+    Raises:
+        ValueError: If the file uses YAML syntax this parser does not handle
+    """
+    users: dict[str, str] = {}
+    host: str | None = None
+    host_indent: int | None = None
+
+    for raw_line in text.splitlines():
+        line = raw_line.rstrip()
+        stripped = line.lstrip(" ")
+        if not stripped or stripped.startswith("#"):
+            continue
+        if "\t" in line[: len(line) - len(stripped)] or stripped[0] in "{[&*!|>" or ":" not in stripped:
+            msg = f"Unsupported hosts.yml line: {raw_line!r}"
+            raise ValueError(msg)
+        indent = len(line) - len(stripped)
+        key, _, value = stripped.partition(":")
+        value = value.strip().strip("\"'")
+        if indent == 0:
+            host = key.strip().strip("\"'")
+            host_indent = None
+        elif host is not None:
+            if host_indent is None:
+                host_indent = indent
+            if indent == host_indent and key.strip() == "user" and value:
+                users[host] = value
+    return users
+
+
+def get_gh_user(host: str | None = None, timeout: float | None = None) -> str | None:
+    """Get the GitHub CLI's logged-in user without contacting the network.
+
+    Reads ``hosts.yml`` directly and falls back to a single ``gh config get``
+    call only when the file cannot be parsed.
+
+    Args:
+        host: GitHub host to look up (defaults to ``GH_HOST`` or github.com)
+        timeout: Seconds to wait for the ``gh`` fallback before giving up
+
+    Returns:
+        The GitHub login, or None if gh is not configured for the host
+    """
+    host = host or os.environ.get("GH_HOST") or DEFAULT_GH_HOST
+    try:
+        text = (gh_config_dir() / "hosts.yml").read_text(encoding="utf-8")
+        return parse_gh_hosts(text).get(host)
+    except FileNotFoundError:
+        return None
+    except (OSError, UnicodeDecodeError, ValueError):
+        pass
+
+    try:
+        # Fixed argument list; the host comes from gh's own configuration
+        with span("gh config get user", "subprocess", host=host):
+            user = subprocess.check_output(  # noqa: S603
+                ["gh", "config", "get", "user", "-h", host],  # noqa: S607
+                stderr=subprocess.DEVNULL,
+                text=True,
+                timeout=timeout,
+            ).strip()
+    except (subprocess.SubprocessError, FileNotFoundError):
+        return None
+    return user or None
+
+
+def github_handle_from_email(email: str) -> str | None:
+    """Extract a GitHub handle from a GitHub-provided email address.
+
+    Args:
+        email: The email address to inspect
+
+    Returns:
+        The handle for ``@github.com`` and noreply addresses, None otherwise
+    """
+    if not (email.endswith("@github.com") or email.endswith("@users.noreply.github.com")):
+        return None
+    local_part = email.split("@", maxsplit=1)[0]
+    # Newer noreply addresses are prefixed with the numeric user id: "12345+handle"
+    return local_part.split("+", maxsplit=1)[-1]
+
+
+def fetch_github_user(timeout: float | None = None) -> dict[str, str]:
+    """Get the authenticated user's profile from the GitHub API via ``gh api user``.
+
+    This is the only identity lookup that needs the network.
+
+    Args:
+        timeout: Seconds to wait for gh before giving up
+
+    Returns:
+        Dict with whichever of ``author``, ``email`` and ``author_github_handle`` are set
+
+    Raises:
+        subprocess.SubprocessError: If gh fails, is not authenticated or times out
+        json.JSONDecodeError: If gh returns malformed output
+    """
+    # The gh command is a fixed string, not user input
+    with span("gh api user", "subprocess"):
+        user_json = subprocess.check_output(
+            ["gh", "api", "user"],  # noqa: S607
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=timeout,
+        )
+    user_data: dict[str, Any] = json.loads(user_json)
+
+    context = {}
+    if user_data.get("name"):
+        context["author"] = user_data["name"]
+    if user_data.get("email"):
+        context["email"] = user_data["email"]
+    if user_data.get("login"):
+        context["author_github_handle"] = user_data["login"]
+    return context
+
+
+# An identity source receives the absolute deadline (time.monotonic()) and
+# returns whichever identity fields it could find
+IdentitySource = Callable[[float], dict[str, str]]
+
+
+def _remaining(deadline: float) -> float:
+    """Return the seconds left before ``deadline``, never negative."""
+    return max(0.0, deadline - time.monotonic())
+
+
+def _git_identity(scopes: tuple[str, ...], deadline: float) -> dict[str, str]:
+    """Read ``user.name`` and ``user.email`` from the given git config scopes.
+
+    Args:
+        scopes: The scopes this source is responsible for
+        deadline: Absolute ``time.monotonic()`` deadline for the subprocess fallback
+
+    Returns:
+        Dict with ``author`` and/or ``email``
+    """
+    try:
+        config = load_git_config(scopes=scopes)
+    except GitConfigError:
+        config = load_git_config_via_subprocess(scopes, timeout=_remaining(deadline))
+
+    context = {}
+    for field, key in (("author", "user.name"), ("email", "user.email")):
+        found = git_config_value(config, key)
+        if found:
+            context[field] = found[1]
+    return context
+
+
+def git_local_identity(deadline: float) -> dict[str, str]:
+    """Identity source for the current repository's git config."""
+    return _git_identity(("local",), deadline)
+
+
+def git_global_identity(deadline: float) -> dict[str, str]:
+    """Identity source for the user-wide and system-wide git config."""
+    return _git_identity(("system", "global"), deadline)
+
+
+def gh_login_identity(deadline: float) -> dict[str, str]:
+    """Identity source for the GitHub CLI login recorded in ``hosts.yml``."""
+    user = get_gh_user(timeout=_remaining(deadline))
+    return {"author_github_handle": user} if user else {}
+
+
+def gh_api_identity(deadline: float) -> dict[str, str]:
+    """Identity source for the GitHub API profile of the logged-in gh user."""
+    if get_gh_user(timeout=_remaining(deadline)) is None:
+        # Not logged in, so the API call could only fail
+        return {}
+    return fetch_github_user(timeout=_remaining(deadline))
+
+
+# Sources started together as soon as discovery begins; the GitHub API is
+# only queried when gh is logged in
+IDENTITY_SOURCES: dict[str, IdentitySource] = {
+    "gh-api": gh_api_identity,
+    "git-local": git_local_identity,
+    "git-global": git_global_identity,
+    "gh": gh_login_identity,
+}
+
+# For each field, the sources that may provide it, best first: the GitHub
+# profile, then git config for whatever it leaves out
+IDENTITY_FIELD_PRIORITY: dict[str, tuple[str, ...]] = {
+    "author": ("gh-api", "git-local", "git-global"),
+    "email": ("gh-api", "git-local", "git-global"),
+    "author_github_handle": ("gh", "gh-api"),
+}
+
+
+class IdentityResult(NamedTuple):
+    """Outcome of ``discover_identity``.
+
+    Attributes:
+        values: Mapping of field name to ``(source, value)`` for every field found
+        timed_out: Sources that had not finished when the deadline fired
+        failed: Sources that raised an error
+    """
+
+    values: dict[str, tuple[str, str]]
+    timed_out: list[str]
+    failed: list[str]
+
+
+def _run_identity_source(
+    name: str,
+    source: IdentitySource,
+    deadline: float,
+    results: queue.Queue[tuple[str, dict[str, str] | None]],
+) -> None:
+    """Run one identity source on a worker thread and report its result.
+
+    Args:
+        name: The source name
+        source: The source callable
+        deadline: Absolute ``time.monotonic()`` deadline
+        results: Queue receiving ``(name, values)``, with None for a failed source
+    """
+    try:
+        with span(name, "identity"):
+            values = source(deadline)
+        results.put((name, values))
+    except (OSError, ValueError, subprocess.SubprocessError):
+        results.put((name, None))
+
+
+def _pick_identity_values(
+    found: dict[str, dict[str, str]],
+    pending: set[str],
+) -> tuple[dict[str, tuple[str, str]], bool]:
+    """Choose the best value for each field from the sources finished so far.
+
+    Args:
+        found: Values reported by each finished source
+        pending: Sources that are still running
+
+    Returns:
+        Tuple of the chosen ``{field: (source, value)}`` and whether every field
+        is settled, i.e. no pending source could still provide a better value
+    """
+    values: dict[str, tuple[str, str]] = {}
+    settled = True
+    for field, priority in IDENTITY_FIELD_PRIORITY.items():
+        for name in priority:
+            if name in pending:
+                # A better-ranked source may still answer; keep a provisional value
+                settled = False
+                continue
+            value = found.get(name, {}).get(field)
+            if value:
+                values[field] = (name, value)
+                break
+    return values, settled
+
+
+def _start_identity_source(
+    name: str,
+    source: IdentitySource,
+    deadline: float,
+    results: queue.Queue[tuple[str, dict[str, str] | None]],
+) -> None:
+    """Start an identity source on a daemon thread.
+
+    Daemon threads mean a hung ``gh`` call can never delay process exit.
+
+    Args:
+        name: The source name
+        source: The source callable
+        deadline: Absolute ``time.monotonic()`` deadline
+        results: Queue receiving the source's result
+    """
+    threading.Thread(
+        target=_run_identity_source,
+        args=(name, source, deadline, results),
+        name=f"uvi-identity-{name}",
+        daemon=True,
+    ).start()
+
+
+def discover_identity(
+    timeout: float,
+    sources: dict[str, IdentitySource] | None = None,
+) -> IdentityResult:
+    """Query identity sources concurrently under a total deadline.
+
+    All ``sources`` start immediately. Returns as soon as every field is
+    settled, i.e. its best-ranked source that answers has finished, or when
+    the deadline fires with the best values found so far.
+
+    Args:
+        timeout: Total time budget in seconds
+        sources: Sources to query (defaults to ``IDENTITY_SOURCES``)
+
+    Returns:
+        The chosen values along with the sources that timed out or failed
+    """
+    sources = IDENTITY_SOURCES if sources is None else sources
+    deadline = time.monotonic() + timeout
+    results: queue.Queue[tuple[str, dict[str, str] | None]] = queue.Queue()
+    for name, source in sources.items():
+        _start_identity_source(name, source, deadline, results)
+
+    found: dict[str, dict[str, str]] = {}
+    failed: list[str] = []
+    pending = set(sources)
+    values, settled = _pick_identity_values(found, pending)
+    while not settled:
+        try:
+            name, source_values = results.get(timeout=_remaining(deadline))
+        except queue.Empty:
+            break
+        pending.discard(name)
+        if source_values is None:
+            failed.append(name)
+        else:
+            found[name] = source_values
+        values, settled = _pick_identity_values(found, pending)
+
+    timed_out = sorted(pending) if not settled else []
+    return IdentityResult(values, timed_out, sorted(failed))
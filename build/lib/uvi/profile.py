@@ -0,0 +1,176 @@
+"""Timing instrumentation for UVI runs.
+
+Code marks the work it does with ``span``::
+
+    with profile.span("prompt"):
+        ...
+
+Spans are recorded only while a profile is active, which ``uvi --profile PATH``
+(or ``UVI_PROFILE=PATH``) turns on for the whole run; otherwise ``span`` returns
+a shared no-op context manager. Each span has a category: ``stage`` for the
+steps of a run, ``identity`` for identity sources (which run in threads),
+``subprocess`` for git and gh calls, ``hook`` for generation hooks and
+``render``/``write`` for individual files.
+
+The profile is written as JSON with per-category and per-stage totals plus
+every event, or in Chrome trace-event format (``--profile-format chrome``)
+for ``chrome://tracing`` and Perfetto.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from . import __version__
+
+PROFILE_FORMATS = ("json", "chrome")
+
+_NO_SPAN = contextlib.nullcontext()
+
+
+class Profiler:
+    """Collects timed spans for one run."""
+
+    def __init__(self) -> None:
+        """Start the clock."""
+        self.started = time.time()
+        self._origin = time.perf_counter()
+        self.events: list[dict[str, Any]] = []
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str, args: dict[str, Any]) -> Iterator[None]:
+        """Record the time spent in the ``with`` block as one event."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            thread = threading.current_thread()
+            # list.append is atomic, so identity threads can record concurrently
+            self.events.append(
+                {
+                    "name": name,
+                    "category": category,
+                    "start_ms": (start - self._origin) * 1000,
+                    "duration_ms": (end - start) * 1000,
+                    "thread": thread.name,
+                    "thread_id": thread.ident,
+                    "args": args,
+                }
+            )
+
+    def summary(self) -> dict[str, Any]:
+        """Return the profile as a JSON-serialisable dict.
+
+        Returns:
+            Totals per category and per stage, and every event in start order
+        """
+        categories: dict[str, dict[str, float]] = {}
+        stages: dict[str, dict[str, float]] = {}
+        events = sorted(self.events, key=lambda event: event["start_ms"])
+        for event in events:
+            for totals, key in ((categories, event["category"]), (stages, event["name"])):
+                if totals is stages and event["category"] in ("render", "write"):
+                    continue
+                entry = totals.setdefault(key, {"count": 0, "total_ms": 0.0})
+                entry["count"] += 1
+                entry["total_ms"] += event["duration_ms"]
+        return {
+            "uvi_version": __version__,
+            "argv": sys.argv[1:],
+            "started": self.started,
+            "total_ms": (time.perf_counter() - self._origin) * 1000,
+            "categories": categories,
+            "stages": stages,
+            "events": [{key: value for key, value in event.items() if key != "thread_id"} for event in events],
+        }
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Return the profile in Chrome trace-event format.
+
+        Returns:
+            A ``{"traceEvents": [...]}`` dict of complete (``X``) events
+            plus thread-name metadata
+        """
+        pid = os.getpid()
+        threads: dict[Any, str] = {}
+        trace_events: list[dict[str, Any]] = []
+        for event in self.events:
+            threads[event["thread_id"]] = event["thread"]
+            trace_events.append(
+                {
+                    "name": event["name"],
+                    "cat": event["category"],
+                    "ph": "X",
+                    "ts": event["start_ms"] * 1000,
+                    "dur": event["duration_ms"] * 1000,
+                    "pid": pid,
+                    "tid": event["thread_id"],
+                    "args": event["args"],
+                }
+            )
+        for tid, name in threads.items():
+            trace_events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str, profile_format: str = "json") -> None:
+        """Write the profile to ``path``.
+
+        Args:
+            path: Destination file
+            profile_format: ``json`` or ``chrome``
+        """
+        # Imported here because uvi.cache imports uvi.identity, which imports this module
+        from .cache import write_json_atomic  # noqa: PLC0415
+
+        data = self.chrome_trace() if profile_format == "chrome" else self.summary()
+        write_json_atomic(Path(path), data)
+
+
+_active: Profiler | None = None
+
+
+def span(name: str, category: str = "stage", **args: Any) -> contextlib.AbstractContextManager[None]:
+    """Time a block of work if a profile is active.
+
+    Args:
+        name: What is being done, e.g. ``prompt`` or a file path
+        category: Kind of work; see the module docstring
+        **args: Extra details stored with the event
+
+    Returns:
+        A context manager timing the block, or a no-op one when not profiling
+    """
+    profiler = _active
+    if profiler is None:
+        return _NO_SPAN
+    return profiler.span(name, category, args)
+
+
+def start() -> Profiler:
+    """Start recording spans for this process.
+
+    Returns:
+        The active profiler
+    """
+    global _active  # noqa: PLW0603 - one profile per process, like the logging root
+    _active = Profiler()
+    return _active
+
+
+def stop() -> Profiler | None:
+    """Stop recording spans.
+
+    Returns:
+        The profiler that was active, if any
+    """
+    global _active
+    profiler, _active = _active, None
+    return profiler
@@ -0,0 +1,440 @@
+"""Generation daemon for UVI (``uvi serve``).
+
+Tools that create projects on request, such as a developer portal, would
+otherwise start ``uvi`` once per project and pay for the interpreter, the
+cookiecutter and Jinja imports, template discovery and author detection every
+time. ``uvi serve`` pays for them once: the template and the author details
+are resolved at start-up, and a bounded pool of workers keeps the parsed
+``cookiecutter.json`` and the Jinja environment, with its compiled templates,
+resident between requests.
+
+The server speaks HTTP on a localhost port or on a Unix socket::
+
+    POST /generate  {"answers": {...}, "archive": "zip"}         -> the project as an archive
+    POST /generate  {"answers": {...}, "output_dir": "/srv/new"}  -> {"project": "/srv/new/<name>"}
+    GET  /stats     request counts, latency percentiles and throughput
+
+``answers`` are ``extra_context`` values, validated like a ``uvi batch``
+spec; invalid answers get a 400 response saying why. Archives default to
+``tar.gz`` and hold the rendered files (see ``uvi.archive``); generation
+hooks act on a written project, so they only run with ``output_dir``. Once
+every worker is busy and ``max_pending`` requests are waiting, further
+requests get a 503 response instead of queueing without bound.
+"""
+
+from __future__ import annotations
+
+import collections
+import functools
+import io
+import json
+import os
+import signal
+import socketserver
+import stat
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, NamedTuple
+
+from . import __version__, render
+from .archive import ARCHIVE_FORMATS, MEDIA_TYPES, write_archive
+from .batch import _init_worker, generate_project, load_template_context, resolve_spec, template_on_path
+from .template import find_template
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8787
+
+# Keys a /generate request may have
+REQUEST_KEYS = ("answers", "archive", "output_dir")
+
+# Largest request body accepted, in bytes
+MAX_REQUEST_SIZE = 1_000_000
+
+# Number of recent requests the latency percentiles are computed over
+LATENCY_WINDOW = 1000
+
+# Parsed template context of a worker
+_worker_context: dict[str, Any] | None = None
+
+
+class Response(NamedTuple):
+    """An HTTP response: status code, media type, body and extra headers."""
+
+    status: int
+    content_type: str
+    body: bytes
+    headers: tuple[tuple[str, str], ...] = ()
+
+
+def json_response(status: int, payload: dict[str, Any]) -> Response:
+    """Build a JSON response."""
+    return Response(status, "application/json", (json.dumps(payload, indent=2) + "\n").encode())
+
+
+def parse_request(body: bytes) -> dict[str, Any]:
+    """Read and check the body of a ``/generate`` request.
+
+    Args:
+        body: The request body, a JSON object (empty means all defaults)
+
+    Returns:
+        The request, with ``answers`` and ``archive`` filled in
+
+    Raises:
+        ValueError: If the body is not a valid request
+    """
+    try:
+        request = json.loads(body or b"{}")
+    except json.JSONDecodeError as e:
+        msg = f"invalid JSON ({e.msg})"
+        raise ValueError(msg) from e
+    if not isinstance(request, dict):
+        msg = f"expected a JSON object, got {type(request).__name__}"
+        raise ValueError(msg)  # noqa: TRY004 - malformed input, not a programming error
+    unknown = sorted(key for key in request if key not in REQUEST_KEYS)
+    if unknown:
+        msg = f"unknown request key(s): {', '.join(unknown)}"
+        raise ValueError(msg)
+    if not isinstance(request.setdefault("answers", {}), dict):
+        msg = "answers must be a JSON object"
+        raise ValueError(msg)  # noqa: TRY004 - malformed input, not a programming error
+    if request.setdefault("archive", ARCHIVE_FORMATS[0]) not in ARCHIVE_FORMATS:
+        msg = f"unknown archive format {request['archive']!r} (choose from {', '.join(ARCHIVE_FORMATS)})"
+        raise ValueError(msg)
+    output_dir = request.get("output_dir")
+    if output_dir is not None and not (isinstance(output_dir, str) and os.path.isabs(output_dir)):
+        msg = "output_dir must be an absolute path"
+        raise ValueError(msg)
+    return request
+
+
+def _init_serve_worker(repo_dir: str) -> None:
+    """Prepare a worker: parse the template and compile its files once.
+
+    Workers may be threads of the server process, so the template is only put
+    on ``sys.path`` while it renders.
+    """
+    global _worker_context  # noqa: PLW0603 - per-process state set by the pool initializer
+    _worker_context = load_template_context(repo_dir)
+    # Rendering the defaults once leaves every template file compiled in the Jinja environment
+    context = resolve_spec(_worker_context, {})
+    context["cookiecutter"]["_repo_dir"] = repo_dir
+    with template_on_path(repo_dir):
+        list(render.render_files(repo_dir, context))
+
+
+def _init_serve_process(repo_dir: str) -> None:
+    """Prepare a worker process; Ctrl+C stops the server, which then stops its workers."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _init_worker(repo_dir)
+    _init_serve_worker(repo_dir)
+
+
+def _ready() -> None:
+    """Do nothing; submitted once per worker to start the pool."""
+
+
+def _generate(repo_dir: str, request: dict[str, Any], defaults: dict[str, str]) -> Response:
+    """Generate the project a request asks for, in a worker.
+
+    Failures are turned into responses here, because cookiecutter's
+    exceptions do not all survive pickling back to the server process.
+    """
+    from cookiecutter.exceptions import OutputDirExistsException  # noqa: PLC0415
+
+    if _worker_context is None:
+        _init_serve_worker(repo_dir)
+    assert _worker_context is not None  # noqa: S101 - set by _init_serve_worker
+    try:
+        context = resolve_spec(_worker_context, request["answers"], defaults)
+    except ValueError as e:
+        return json_response(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+
+    try:
+        if request.get("output_dir") is not None:
+            with template_on_path(repo_dir):
+                project = generate_project(repo_dir, context, request["output_dir"])
+            return json_response(HTTPStatus.OK, {"project": project})
+        variables = context["cookiecutter"]
+        variables["_template"] = repo_dir
+        variables["_repo_dir"] = repo_dir
+        name = render.project_dir_name(repo_dir, context)
+        with template_on_path(repo_dir):
+            files = list(render.render_files(repo_dir, context))
+        archive = io.BytesIO()
+        write_archive([*files, render.answers_file(repo_dir, context, files)], archive, request["archive"], name)
+    except OutputDirExistsException as e:
+        return json_response(HTTPStatus.CONFLICT, {"error": str(e)})
+    except Exception as e:  # Reported per request; one bad request must not stop the server
+        return json_response(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"})
+    disposition = f'attachment; filename="{name}.{request["archive"]}"'
+    return Response(
+        HTTPStatus.OK, MEDIA_TYPES[request["archive"]], archive.getvalue(), (("Content-Disposition", disposition),)
+    )
+
+
+class ServeStats:
+    """Counters of a running server, safe to update from the request threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._latencies: collections.deque[float] = collections.deque(maxlen=LATENCY_WINDOW)
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+        self.in_flight = 0
+
+    def begin(self) -> None:
+        """Count a request that a worker has accepted."""
+        with self._lock:
+            self.in_flight += 1
+
+    def finish(self, seconds: float, ok: bool) -> None:
+        """Record the outcome and latency of an accepted request."""
+        with self._lock:
+            self.in_flight -= 1
+            self._latencies.append(seconds)
+            if ok:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+
+    def reject(self) -> None:
+        """Count a request turned away because the server was busy."""
+        with self._lock:
+            self.rejected += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the counters, latency percentiles (ms) and throughput as a JSON-serialisable dict."""
+        with self._lock:
+            uptime = time.monotonic() - self._started
+            latencies = sorted(self._latencies)
+            completed = self.succeeded + self.failed
+            counters = {
+                "succeeded": self.succeeded,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "in_flight": self.in_flight,
+            }
+
+        def percentile(fraction: float) -> float | None:
+            if not latencies:
+                return None
+            return round(latencies[round(fraction * (len(latencies) - 1))] * 1000, 2)
+
+        return {
+            "uptime_seconds": round(uptime, 3),
+            "requests": completed,
+            **counters,
+            "requests_per_second": round(completed / uptime, 3) if uptime > 0 else 0.0,
+            "latency_ms": {
+                "window": len(latencies),
+                "mean": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else None,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": percentile(1.0),
+            },
+        }
+
+
+class GenerationService:
+    """The template, author details, worker pool and counters behind a server.
+
+    Args:
+        repo_dir: Local template directory
+        defaults: Overrides applied before each request's answers, such as detected author details
+        jobs: Number of workers; 1 renders in a thread of the server process
+        max_pending: Requests allowed to wait for a worker before new ones are rejected
+    """
+
+    def __init__(self, repo_dir: str, defaults: dict[str, str], jobs: int = 1, max_pending: int = 0) -> None:
+        self.repo_dir = repo_dir
+        self.defaults = defaults
+        self.jobs = jobs
+        self.stats = ServeStats()
+        self._slots = threading.BoundedSemaphore(jobs + max_pending)
+        self._executor: Executor
+        if jobs == 1:
+            self._executor = ThreadPoolExecutor(1, initializer=_init_serve_worker, initargs=(repo_dir,))
+        else:
+            self._executor = ProcessPoolExecutor(jobs, initializer=_init_serve_process, initargs=(repo_dir,))
+
+    def start(self) -> None:
+        """Start every worker now, so the first requests do not wait for them."""
+        for future in [self._executor.submit(_ready) for _ in range(self.jobs)]:
+            future.result()
+
+    def generate(self, request: dict[str, Any]) -> Response:
+        """Generate a project for a request from ``parse_request``.
+
+        Returns:
+            The response to send; 503 if every worker is busy and the queue is full
+        """
+        if not self._slots.acquire(blocking=False):
+            self.stats.reject()
+            return json_response(HTTPStatus.SERVICE_UNAVAILABLE, {"error": "all workers are busy; try again later"})
+        self.stats.begin()
+        start = time.perf_counter()
+        response = None
+        try:
+            response = self._executor.submit(_generate, self.repo_dir, request, self.defaults).result()
+        finally:
+            self._slots.release()
+            self.stats.finish(time.perf_counter() - start, response is not None and response.status == HTTPStatus.OK)
+        return response
+
+    def close(self) -> None:
+        """Stop the workers."""
+        self._executor.shutdown()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Route HTTP requests to a ``GenerationService``."""
+
+    server_version = f"uvi/{__version__}"
+
+    def __init__(self, *args: Any, service: GenerationService, **kwargs: Any) -> None:
+        self.service = service
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self) -> None:
+        """Serve ``/stats``."""
+        if self.path == "/stats":
+            self._send(json_response(HTTPStatus.OK, self.service.stats.snapshot()))
+        else:
+            self._send(json_response(HTTPStatus.NOT_FOUND, {"error": f"no such resource: {self.path}"}))
+
+    def do_POST(self) -> None:
+        """Serve ``/generate``."""
+        if self.path != "/generate":
+            self._send(json_response(HTTPStatus.NOT_FOUND, {"error": f"no such resource: {self.path}"}))
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_REQUEST_SIZE:
+            self._send(
+                json_response(
+                    HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": f"request larger than {MAX_REQUEST_SIZE} bytes"}
+                )
+            )
+            return
+        try:
+            request = parse_request(self.rfile.read(length))
+        except ValueError as e:
+            self._send(json_response(HTTPStatus.BAD_REQUEST, {"error": str(e)}))
+            return
+        self._send(self.service.generate(request))
+
+    def _send(self, response: Response) -> None:
+        """Write a response."""
+        self.send_response(response.status)
+        self.send_header("Content-Type", response.content_type)
+        self.send_header("Content-Length", str(len(response.body)))
+        for name, value in response.headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(response.body)
+
+    def address_string(self) -> str:
+        """Name the client in log lines; Unix socket clients have no address."""
+        return str(self.client_address[0]) if isinstance(self.client_address, tuple) else "unix-socket"
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP over a Unix socket, one thread per connection."""
+
+    daemon_threads = True
+
+
+def make_server(
+    service: GenerationService,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: str | None = None,
+) -> socketserver.TCPServer:
+    """Create the HTTP server for a service, bound but not yet serving.
+
+    Args:
+        service: The service answering requests
+        host: Interface to listen on (ignored with ``socket_path``)
+        port: Port to listen on; 0 picks a free one (ignored with ``socket_path``)
+        socket_path: Listen on this Unix socket instead, readable by the current user only
+
+    Returns:
+        The server; call ``serve_forever`` on it
+
+    Raises:
+        ValueError: If ``socket_path`` exists and is not a socket
+    """
+    handler = functools.partial(_RequestHandler, service=service)
+    if socket_path is None:
+        return ThreadingHTTPServer((host, port), handler)
+    if os.path.exists(socket_path):
+        if not stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            msg = f"{socket_path} exists and is not a socket"
+            raise ValueError(msg)
+        # Left behind by a server that did not shut down cleanly
+        os.remove(socket_path)
+    server = _UnixHTTPServer(socket_path, handler)
+    os.chmod(socket_path, 0o600)
+    return server
+
+
+def open_service(
+    template: str | None = None,
+    defaults: dict[str, str] | None = None,
+    jobs: int | None = None,
+    max_pending: int | None = None,
+) -> GenerationService:
+    """Create a service for a template and start its workers.
+
+    Args:
+        template: Local template directory (defaults to the bundled template)
+        defaults: Overrides applied before each request's answers, such as detected author details
+        jobs: Number of worker processes (defaults to the CPU count); 1 renders in-process
+        max_pending: Requests allowed to wait for a worker (defaults to four per worker)
+
+    Returns:
+        The started service
+
+    Raises:
+        ValueError: If the template is not a local directory
+    """
+    repo_dir = template or find_template()
+    if not os.path.isdir(repo_dir):
+        msg = f"serve mode needs a local template directory, got {repo_dir}"
+        raise ValueError(msg)
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    service = GenerationService(repo_dir, defaults or {}, jobs, 4 * jobs if max_pending is None else max_pending)
+    service.start()
+    return service
+
+
+def serve(
+    service: GenerationService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, socket_path: str | None = None
+) -> None:
+    """Serve generation requests until interrupted, then stop the service's workers.
+
+    Args:
+        service: Service from ``open_service``
+        host: Interface to listen on
+        port: Port to listen on
+        socket_path: Listen on this Unix socket instead of a port
+    """
+    try:
+        server = make_server(service, host, port, socket_path)
+        address = socket_path or f"http://{host}:{server.socket.getsockname()[1]}"
+        print(f"Serving {service.repo_dir} on {address} with {service.jobs} worker(s); press Ctrl+C to stop")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nStopping")
+        finally:
+            server.server_close()
+            if socket_path:
+                os.remove(socket_path)
+    finally:
+        service.close()
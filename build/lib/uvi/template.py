@@ -0,0 +1,314 @@
+"""Template location for UVI.
+
+Finds the cookiecutter template that ``uvi`` renders without touching the
+network. In a source checkout the template next to the package is used as is.
+Installed wheels carry a snapshot of the template, ``template-snapshot.tar.gz``,
+together with ``template-snapshot.json`` recording its SHA-256 content hash;
+both are written by ``setup.py`` at build time.
+
+Snapshots are unpacked once into ``<cache dir>/templates/<uvi version>-<hash>``
+and reused from there by every later run. Templates passed with ``--template``
+go through the same content-addressed cache, so a run always renders from an
+immutable copy, and an unchanged template is never copied twice.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+import stat
+import tarfile
+import tempfile
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from . import __version__
+from .cache import user_cache_dir, write_json_atomic
+
+SNAPSHOT_ARCHIVE = "template-snapshot.tar.gz"
+SNAPSHOT_INFO = "template-snapshot.json"
+
+# Top-level files that belong to a template
+TEMPLATE_ROOT_FILES = ("cookiecutter.json", "template-manifest.json")
+# Top-level directories that belong to a template, besides the project template itself
+TEMPLATE_ROOT_DIRS = ("hooks", "locks", "templates")
+
+# A template file: path relative to the template root, executable bit, content
+TemplateEntry = tuple[str, bool, bytes]
+
+
+def _local_extensions(repo_dir: str) -> set[str]:
+    """Return the top-level modules named by ``_extensions`` in ``cookiecutter.json``."""
+    try:
+        with open(os.path.join(repo_dir, "cookiecutter.json"), encoding="utf-8") as context_file:
+            extensions = json.load(context_file).get("_extensions", [])
+    except (OSError, ValueError):
+        return set()
+    return {extension.split(".")[0] for extension in extensions}
+
+
+def template_files(repo_dir: str) -> list[str]:
+    """List the files that make up a template.
+
+    Only the parts cookiecutter reads are included: ``cookiecutter.json``,
+    ``template-manifest.json``, local Jinja extensions, ``hooks/``,
+    ``templates/`` and the project template directory. Caches and VCS
+    metadata are skipped.
+
+    Args:
+        repo_dir: Local template directory
+
+    Returns:
+        Sorted paths relative to ``repo_dir``, with forward slashes
+    """
+    extensions = _local_extensions(repo_dir)
+    files = []
+    for entry in os.scandir(repo_dir):
+        if entry.is_dir():
+            # The project template is found the same way cookiecutter finds it
+            is_project_template = "cookiecutter" in entry.name and "{{" in entry.name and "}}" in entry.name
+            if not (is_project_template or entry.name in TEMPLATE_ROOT_DIRS or entry.name in extensions):
+                continue
+        else:
+            if entry.name not in TEMPLATE_ROOT_FILES and entry.name.removesuffix(".py") not in extensions:
+                continue
+            files.append(entry.name)
+            continue
+        for root, dirs, names in os.walk(entry.path):
+            dirs[:] = [name for name in dirs if name not in ("__pycache__", ".git")]
+            rel_root = os.path.relpath(root, repo_dir).replace(os.sep, "/")
+            files.extend(f"{rel_root}/{name}" for name in names if not name.endswith(".pyc"))
+    return sorted(files)
+
+
+def _directory_entries(repo_dir: str) -> Iterator[TemplateEntry]:
+    """Yield the template files of a directory."""
+    for rel_path in template_files(repo_dir):
+        path = os.path.join(repo_dir, *rel_path.split("/"))
+        with open(path, "rb") as template_file:
+            yield rel_path, bool(os.stat(path).st_mode & stat.S_IXUSR), template_file.read()
+
+
+def _archive_entries(archive: str) -> Iterator[TemplateEntry]:
+    """Yield the files of a snapshot archive, rejecting anything but plain relative files."""
+    with tarfile.open(archive, "r:gz") as tar:
+        for member in tar:
+            parts = member.name.split("/")
+            if not member.isfile() or member.name.startswith("/") or ".." in parts:
+                msg = f"{archive}: unexpected entry {member.name!r} in template snapshot"
+                raise ValueError(msg)
+            extracted = tar.extractfile(member)
+            if extracted is None:
+                msg = f"{archive}: cannot read {member.name!r}"
+                raise ValueError(msg)
+            yield member.name, bool(member.mode & stat.S_IXUSR), extracted.read()
+
+
+def template_digest(entries: Iterable[TemplateEntry]) -> str:
+    """Compute the content hash of a template.
+
+    Args:
+        entries: Template files, sorted by path
+
+    Returns:
+        Hex SHA-256 over every path, executable bit and content
+    """
+    digest = hashlib.sha256()
+    for rel_path, executable, content in entries:
+        digest.update(f"{rel_path}\0{int(executable)}\0{len(content)}\0".encode())
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def directory_digest(repo_dir: str) -> str:
+    """Compute the content hash of a local template directory.
+
+    Args:
+        repo_dir: Local template directory
+
+    Returns:
+        The same hash ``build_snapshot`` records for this template
+    """
+    return template_digest(_directory_entries(repo_dir))
+
+
+def build_snapshot(repo_dir: str, dest_dir: str) -> str:
+    """Write the template snapshot and its hash into ``dest_dir``.
+
+    The archive is reproducible: entries are sorted and carry no timestamps
+    or ownership, so the same template always yields the same bytes.
+
+    Args:
+        repo_dir: Local template directory
+        dest_dir: Directory to write ``template-snapshot.tar.gz`` and ``template-snapshot.json`` to
+
+    Returns:
+        The template's content hash
+    """
+    entries = list(_directory_entries(repo_dir))
+    buffer = io.BytesIO()
+    with (
+        gzip.GzipFile(fileobj=buffer, mode="wb", mtime=0) as compressed,
+        tarfile.open(fileobj=compressed, mode="w", format=tarfile.PAX_FORMAT) as tar,
+    ):
+        for rel_path, executable, content in entries:
+            info = tarfile.TarInfo(rel_path)
+            info.size = len(content)
+            info.mode = 0o755 if executable else 0o644
+            tar.addfile(info, io.BytesIO(content))
+
+    digest = template_digest(entries)
+    os.makedirs(dest_dir, exist_ok=True)
+    with open(os.path.join(dest_dir, SNAPSHOT_ARCHIVE), "wb") as archive_file:
+        archive_file.write(buffer.getvalue())
+    write_json_atomic(Path(dest_dir) / SNAPSHOT_INFO, {"uvi_version": __version__, "sha256": digest})
+    return digest
+
+
+def cached_template_dir(digest: str) -> Path:
+    """Return where the template with the given content hash is cached.
+
+    Args:
+        digest: Content hash from ``template_digest``
+
+    Returns:
+        The cache directory for this uvi version and template
+    """
+    return user_cache_dir() / "templates" / f"{__version__}-{digest[:32]}"
+
+
+def find_cached_template(digest: str) -> str | None:
+    """Find a cached template by content hash, whichever uvi version cached it.
+
+    Args:
+        digest: Content hash from ``template_digest``
+
+    Returns:
+        The cached template directory, or None if it is not in the cache
+    """
+    current = cached_template_dir(digest)
+    if current.is_dir():
+        return str(current)
+    for candidate in sorted(current.parent.glob(f"*-{digest[:32]}")):
+        if candidate.is_dir():
+            return str(candidate)
+    return None
+
+
+def _install(entries: Iterable[TemplateEntry], digest: str) -> str:
+    """Write a template into the cache unless it is already there.
+
+    The files are written to a temporary directory and checked against
+    ``digest`` before being renamed into place, so concurrent runs and
+    interrupted writes never leave a partial template behind.
+
+    Returns:
+        The cached template directory
+
+    Raises:
+        ValueError: If the written files do not match ``digest``
+    """
+    target = cached_template_dir(digest)
+    if target.is_dir():
+        return str(target)
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=target.parent, prefix=".tmp-")
+    try:
+        for rel_path, executable, content in entries:
+            path = os.path.join(staging, *rel_path.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as template_file:
+                template_file.write(content)
+            os.chmod(path, 0o755 if executable else 0o644)
+        actual = template_digest(_directory_entries(staging))
+        if actual != digest:
+            msg = f"template snapshot is corrupt: expected hash {digest}, got {actual}"
+            raise ValueError(msg)
+        try:
+            os.rename(staging, target)
+        except OSError:
+            # Another run installed the same template first
+            if not target.is_dir():
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return str(target)
+
+
+def cached_snapshot(package_dir: str | None = None) -> str | None:
+    """Return the cached copy of the snapshot bundled with the package.
+
+    Args:
+        package_dir: Directory holding the snapshot (defaults to the ``uvi`` package)
+
+    Returns:
+        The cached template directory, or None if the package has no snapshot
+    """
+    package_dir = package_dir or os.path.dirname(__file__)
+    try:
+        with open(os.path.join(package_dir, SNAPSHOT_INFO), encoding="utf-8") as info_file:
+            digest = json.load(info_file)["sha256"]
+    except FileNotFoundError:
+        return None
+    target = cached_template_dir(digest)
+    if target.is_dir():
+        return str(target)
+    return _install(_archive_entries(os.path.join(package_dir, SNAPSHOT_ARCHIVE)), digest)
+
+
+def cached_template(path: str) -> str:
+    """Return the cached copy of a local template directory or snapshot archive.
+
+    Args:
+        path: Template directory, or a ``template-snapshot.tar.gz`` file
+
+    Returns:
+        The cached template directory
+    """
+    entries = list(_directory_entries(path)) if os.path.isdir(path) else sorted(_archive_entries(path))
+    return _install(entries, template_digest(entries))
+
+
+def find_template() -> str:
+    """Locate the uvi cookiecutter template.
+
+    Returns:
+        Path to the template next to the package in a source checkout,
+        otherwise to the cached copy of the bundled snapshot
+
+    Raises:
+        FileNotFoundError: If the package carries no template at all
+    """
+    # In a source checkout, use the template in the repository
+    package_root = os.path.join(os.path.dirname(__file__), "..")
+    if os.path.exists(os.path.join(package_root, "cookiecutter.json")):
+        return os.path.abspath(package_root)
+    # When installed from a wheel, use the bundled snapshot
+    snapshot = cached_snapshot()
+    if snapshot is None:
+        msg = "uvi was installed without its template snapshot; pass --template with a local template"
+        raise FileNotFoundError(msg)
+    return snapshot
+
+
+def resolve_template(template: str | None = None) -> str:
+    """Turn the ``--template`` option into the template to render.
+
+    Args:
+        template: A local template directory or snapshot archive, a repository
+            URL, or None for the bundled template
+
+    Returns:
+        A cached template directory, or ``template`` unchanged if it is not local
+        (repository URLs are cloned by cookiecutter)
+    """
+    if template is None:
+        return find_template()
+    if os.path.exists(template):
+        return cached_template(template)
+    return template
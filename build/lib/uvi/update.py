@@ -0,0 +1,340 @@
+"""Incremental updates of generated projects.
+
+``uvi update`` brings an existing project up to date with a newer template
+(or changed answers) without regenerating it. It reads ``.uvi-answers.json``
+from the project and renders three versions of every file in memory:
+
+- the base: what was generated, from the recorded template and answers
+- the new render: the current template with the (optionally updated) answers
+- the current file on disk
+
+Files the template did not change are left alone, whatever the user did to
+them. Files the user did not edit are replaced by the new render, and files
+both sides changed are merged line by line; overlapping changes are written
+with ``<<<<<<<``/``=======``/``>>>>>>>`` conflict markers, like git does.
+Only files whose content changes are written.
+
+The base is rendered from the template cache. If the recorded template is no
+longer cached, the recorded file hashes still tell which files the user
+edited; those are merged against an empty base, so every difference shows up
+as a conflict.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import difflib
+import hashlib
+import json
+import os
+import sys
+from collections.abc import Iterator, Sequence
+from typing import Any, NamedTuple
+
+from . import render
+from .batch import load_template_context, resolve_spec
+from .template import directory_digest, find_cached_template, find_template
+
+CONFLICT_START = "<<<<<<< current\n"
+CONFLICT_SEPARATOR = "=======\n"
+CONFLICT_END = ">>>>>>> template\n"
+
+# A region of lines in a three-way merge: the lines, and whether they conflict
+# (conflicting regions hold the current lines, then the template's)
+MergeRegion = tuple[list[str], list[str] | None]
+
+
+class FileUpdate(NamedTuple):
+    """What ``uvi update`` does to one file.
+
+    ``action`` is one of ``create``, ``update``, ``merge`` (both sides changed,
+    merged cleanly), ``conflict`` (merged with conflict markers, or left alone
+    for binary files), ``remove``, or ``keep`` (removed from the template but
+    edited by the user, so kept).
+    """
+
+    path: str
+    action: str
+    content: bytes | None
+    mode: int
+
+
+def _sync_regions(base: Sequence[str], ours: Sequence[str], theirs: Sequence[str]) -> Iterator[tuple[int, ...]]:
+    """Yield the base ranges both sides left untouched, with their positions in each side.
+
+    Yields:
+        ``(base_start, base_end, ours_start, ours_end, theirs_start, theirs_end)``,
+        ending with an empty region at the end of all three
+    """
+    ours_blocks = difflib.SequenceMatcher(None, base, ours, autojunk=False).get_matching_blocks()
+    theirs_blocks = difflib.SequenceMatcher(None, base, theirs, autojunk=False).get_matching_blocks()
+    i = j = 0
+    while i < len(ours_blocks) and j < len(theirs_blocks):
+        ours_base, ours_start, ours_size = ours_blocks[i]
+        theirs_base, theirs_start, theirs_size = theirs_blocks[j]
+        start = max(ours_base, theirs_base)
+        end = min(ours_base + ours_size, theirs_base + theirs_size)
+        if start < end:
+            ours_at = ours_start + start - ours_base
+            theirs_at = theirs_start + start - theirs_base
+            yield start, end, ours_at, ours_at + end - start, theirs_at, theirs_at + end - start
+        if ours_base + ours_size < theirs_base + theirs_size:
+            i += 1
+        else:
+            j += 1
+    yield len(base), len(base), len(ours), len(ours), len(theirs), len(theirs)
+
+
+def merge3(base: Sequence[str], ours: Sequence[str], theirs: Sequence[str]) -> list[MergeRegion]:
+    """Merge two edited versions of a list of lines, like ``diff3 -m``.
+
+    Args:
+        base: The common ancestor
+        ours: The current version (the user's)
+        theirs: The new version (the template's)
+
+    Returns:
+        The merged regions in order; a region's second item is None unless
+        the two sides changed it differently
+    """
+    regions: list[MergeRegion] = []
+    base_at = ours_at = theirs_at = 0
+    for base_start, base_end, ours_start, ours_end, theirs_start, theirs_end in _sync_regions(base, ours, theirs):
+        base_lines = list(base[base_at:base_start])
+        ours_lines = list(ours[ours_at:ours_start])
+        theirs_lines = list(theirs[theirs_at:theirs_start])
+        if theirs_lines in (ours_lines, base_lines):
+            regions.append((ours_lines, None))
+        elif ours_lines == base_lines:
+            regions.append((theirs_lines, None))
+        else:
+            regions.append((ours_lines, theirs_lines))
+        regions.append((list(base[base_start:base_end]), None))
+        base_at, ours_at, theirs_at = base_end, ours_end, theirs_end
+    return [region for region in regions if region[0] or region[1]]
+
+
+def merge_text(base: bytes, ours: bytes, theirs: bytes) -> tuple[bytes, bool]:
+    """Three-way merge file contents.
+
+    Returns:
+        Tuple of the merged content and whether it contains conflict markers
+
+    Raises:
+        UnicodeDecodeError: If any side is not UTF-8 text
+    """
+    sides = [content.decode("utf-8").splitlines(keepends=True) for content in (base, ours, theirs)]
+    merged: list[str] = []
+    conflicted = False
+    for lines, theirs_lines in merge3(*sides):
+        if theirs_lines is None:
+            merged.extend(lines)
+            continue
+        conflicted = True
+        merged.extend(
+            [CONFLICT_START, *_terminated(lines), CONFLICT_SEPARATOR, *_terminated(theirs_lines), CONFLICT_END]
+        )
+    return "".join(merged).encode("utf-8"), conflicted
+
+
+def _terminated(lines: list[str]) -> list[str]:
+    """Make sure the last line ends with a newline, so a conflict marker can follow it."""
+    if lines and not lines[-1].endswith("\n"):
+        return [*lines[:-1], lines[-1] + "\n"]
+    return lines
+
+
+def load_record(project_dir: str) -> dict[str, Any]:
+    """Read the ``.uvi-answers.json`` of a generated project.
+
+    Raises:
+        ValueError: If the project was not generated by uvi or the record is unreadable
+    """
+    path = os.path.join(project_dir, render.ANSWERS_FILE)
+    try:
+        with open(path, encoding="utf-8") as record_file:
+            record = json.load(record_file)
+    except FileNotFoundError as e:
+        msg = f"{project_dir} has no {render.ANSWERS_FILE}; only projects generated by uvi can be updated"
+        raise ValueError(msg) from e
+    except json.JSONDecodeError as e:
+        msg = f"{path}: invalid JSON ({e.msg})"
+        raise ValueError(msg) from e
+    if not isinstance(record, dict) or not isinstance(record.get("answers"), dict):
+        msg = f"{path}: not a uvi answers file"
+        raise ValueError(msg)  # noqa: TRY004 - malformed input, not a programming error
+    return record
+
+
+def render_tree(repo_dir: str, answers: dict[str, Any], template: str | None = None) -> dict[str, render.RenderedFile]:
+    """Render a project in memory, including its answers file.
+
+    Answers the template does not know (variables it has since dropped) are ignored.
+
+    Args:
+        repo_dir: Local template directory
+        answers: Template variables
+        template: What to record as the template (defaults to ``repo_dir``)
+
+    Returns:
+        The rendered files by path
+    """
+    template_context = load_template_context(repo_dir)
+    known = {key: value for key, value in answers.items() if key in template_context["cookiecutter"]}
+    context = resolve_spec(template_context, known)
+    variables = context["cookiecutter"]
+    variables["_template"] = template or repo_dir
+    variables["_repo_dir"] = repo_dir
+    files = list(render.render_files(repo_dir, context))
+    files.append(render.answers_file(repo_dir, context, files))
+    return {rendered.path: rendered for rendered in files}
+
+
+def _read(path: str) -> bytes | None:
+    """Return a file's content, or None if it does not exist."""
+    try:
+        with open(path, "rb") as current_file:
+            return current_file.read()
+    except FileNotFoundError:
+        return None
+
+
+def _digest(content: bytes | None) -> str | None:
+    """Return the SHA-256 of some content, or None for a missing file."""
+    return None if content is None else hashlib.sha256(content).hexdigest()
+
+
+def plan_file(  # noqa: PLR0911 - one return per outcome reads best here
+    path: str,
+    base: bytes | None,
+    new: render.RenderedFile | None,
+    current: bytes | None,
+    recorded: str | None,
+) -> FileUpdate | None:
+    """Decide what to do with one file.
+
+    Args:
+        path: Path relative to the project
+        base: What was generated, if known (None if it was not generated or the base is unavailable)
+        new: The new render, or None if the template no longer generates the file
+        current: The file on disk, or None if it is missing
+        recorded: The recorded hash of what was generated, or None
+
+    Returns:
+        The change to make, or None to leave the file alone
+    """
+    new_content = None if new is None else new.content
+    mode = 0o644 if new is None else new.mode
+    # Hash of what was generated, None if the file was not generated
+    generated = _digest(base) if base is not None else recorded
+    if new_content == current or generated == _digest(new_content):
+        return None  # Already up to date, or the template did not change the file
+    if current is None:
+        # A new file is created; a generated file the user deleted stays deleted
+        return FileUpdate(path, "create", new_content, mode) if generated is None else None
+    if _digest(current) == generated:
+        if new_content is None:
+            return FileUpdate(path, "remove", None, mode)
+        return FileUpdate(path, "update", new_content, mode)
+    if new_content is None:
+        return FileUpdate(path, "keep", None, mode)
+    try:
+        merged, conflicted = merge_text(base or b"", current, new_content)
+    except UnicodeDecodeError:
+        return FileUpdate(path, "conflict", None, mode)
+    if merged == current:
+        return None
+    return FileUpdate(path, "conflict" if conflicted else "merge", merged, mode)
+
+
+def plan_update(
+    project_dir: str, template: str | None = None, answers: dict[str, Any] | None = None
+) -> tuple[list[FileUpdate], dict[str, render.RenderedFile]]:
+    """Work out how to bring a project up to date.
+
+    Args:
+        project_dir: The generated project
+        template: Local template directory to update to (defaults to the bundled template)
+        answers: Template variables to change, on top of the recorded answers
+
+    Returns:
+        Tuple of the changes to make, in path order, and the new render
+    """
+    record = load_record(project_dir)
+    repo_dir = template or find_template()
+    if not os.path.isdir(repo_dir):
+        msg = f"update needs a local template directory, got {repo_dir}"
+        raise ValueError(msg)
+    new_files = render_tree(repo_dir, {**record["answers"], **(answers or {})}, template=record.get("template"))
+
+    base_dir = find_cached_template(record.get("template_sha256", ""))
+    if base_dir is None and directory_digest(repo_dir) == record.get("template_sha256"):
+        base_dir = repo_dir
+    base_files = {} if base_dir is None else render_tree(base_dir, record["answers"], template=record.get("template"))
+    recorded: dict[str, str] = record.get("files", {})
+
+    changes = []
+    for path in sorted(set(base_files) | set(new_files) | set(recorded)):
+        if path == render.ANSWERS_FILE:
+            continue
+        base = base_files.get(path)
+        change = plan_file(
+            path,
+            None if base is None else base.content,
+            new_files.get(path),
+            _read(os.path.join(project_dir, *path.split("/"))),
+            recorded.get(path),
+        )
+        if change is not None:
+            changes.append(change)
+    return changes, new_files
+
+
+def apply_updates(project_dir: str, changes: list[FileUpdate], new_files: dict[str, render.RenderedFile]) -> None:
+    """Write the planned changes and the new answers file.
+
+    Args:
+        project_dir: The generated project
+        changes: Changes from ``plan_update``
+        new_files: The new render from ``plan_update``
+    """
+    writes = []
+    for change in changes:
+        path = os.path.join(project_dir, *change.path.split("/"))
+        if change.action == "remove":
+            os.remove(path)
+            # Drop directories the removal left empty, like a fresh render would
+            with contextlib.suppress(OSError):
+                os.removedirs(os.path.dirname(path))
+        elif change.content is not None:
+            writes.append(render.RenderedFile(change.path, change.content, change.mode))
+    writes.append(new_files[render.ANSWERS_FILE])
+    render.write_files(writes, project_dir)
+
+
+def run_update(
+    project_dir: str, template: str | None = None, answers: dict[str, Any] | None = None, dry_run: bool = False
+) -> int:
+    """Update a project and print what changed.
+
+    Args:
+        project_dir: The generated project
+        template: Local template directory to update to (defaults to the bundled template)
+        answers: Template variables to change, on top of the recorded answers
+        dry_run: Only print what would change
+
+    Returns:
+        Number of files left with conflicts
+    """
+    changes, new_files = plan_update(project_dir, template, answers)
+    for change in changes:
+        print(f"{change.action:>8}  {change.path}")
+    conflicts = sum(change.action == "conflict" for change in changes)
+    if dry_run:
+        print(f"{len(changes)} file(s) would change; nothing was written")
+        return conflicts
+    apply_updates(project_dir, changes, new_files)
+    print(f"Updated {project_dir}: {len(changes)} file(s) changed")
+    if conflicts:
+        print(f"{conflicts} file(s) have conflicts to resolve", file=sys.stderr)
+    return conflicts
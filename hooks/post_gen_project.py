@@ -1,123 +1,95 @@
 #!/usr/bin/env python
 """Post-generation script for cookiecutter template.
 
-Handles cleanup and organization of project files based on user configuration choices,
-including removal of unused files/directories and proper license file placement.
+Applies ``template-manifest.json`` for plain ``cookiecutter`` runs: removes the
+files and directories the answers excluded, moves the chosen license to
+``LICENSE`` and writes the pre-resolved ``uv.lock`` for the answers. ``uvi``
+evaluates the same manifest before rendering and runs the equivalent
+``uvi.hooks.post_gen_project`` in-process instead of this script.
 """
 
-# pylint: disable=comparison-of-constants
-# Disabled because these are cookiecutter template variables, not actual constants
-# ruff: noqa: PLR0133
-
 from __future__ import annotations
 
+import json
 import os
+import re
 import shutil
 
 PROJECT_DIRECTORY = os.path.realpath(os.path.curdir)
+REPO_DIRECTORY = r"{{cookiecutter._repo_dir}}"
+VARIABLES = json.loads(r"""{{cookiecutter | jsonify}}""")
 
 
-def remove_file(filepath: str) -> None:
-    """Remove a file from the generated project directory.
+def remove_path(path: str) -> None:
+    """Remove a file or directory from the generated project, if present.
 
     Args:
-        filepath: Relative path to the file to be removed
+        path: Path relative to the project directory
     """
-    os.remove(os.path.join(PROJECT_DIRECTORY, filepath))
+    target = os.path.join(PROJECT_DIRECTORY, path)
+    if os.path.isdir(target):
+        shutil.rmtree(target)
+    elif os.path.exists(target):
+        os.remove(target)
 
 
-def remove_dir(filepath: str) -> None:
-    """Remove a directory and its contents from the generated project directory.
+def move_file(filepath: str, target: str) -> None:
+    """Move/rename a file within the generated project directory, if present.
 
     Args:
-        filepath: Relative path to the directory to be removed
+        filepath: Current relative path of the file
+        target: New relative path for the file
     """
-    shutil.rmtree(os.path.join(PROJECT_DIRECTORY, filepath))
+    source = os.path.join(PROJECT_DIRECTORY, filepath)
+    if os.path.exists(source):
+        os.replace(source, os.path.join(PROJECT_DIRECTORY, target))
 
 
-def move_file(filepath: str, target: str) -> None:
-    """Move/rename a file within the generated project directory.
+def conditions_hold(conditions: dict[str, str]) -> bool:
+    """Check whether every variable in ``conditions`` has the given value.
 
     Args:
-        filepath: Current relative path of the file
-        target: New relative path for the file
+        conditions: Mapping of cookiecutter variable to required value
+
+    Returns:
+        bool: True if all conditions hold (also for an empty mapping)
     """
-    os.rename(
-        os.path.join(PROJECT_DIRECTORY, filepath),
-        os.path.join(PROJECT_DIRECTORY, target),
-    )
+    return all(VARIABLES.get(name) == value for name, value in conditions.items())
 
 
-def should_remove_release_workflow() -> bool:
-    """Check if the release workflow file should be removed.
+def write_lock(locks_dir: str) -> None:
+    """Write the template's pre-resolved ``uv.lock`` matching the answers, if any.
 
-    Returns:
-        bool: True if the file should be removed, False otherwise
+    Args:
+        locks_dir: Directory holding the lock files and their ``index.json``
     """
-    no_mkdocs = "{{cookiecutter.mkdocs}}" != "y"
-    no_pypi = "{{cookiecutter.publish_to_pypi}}" == "n"
-    return no_mkdocs and no_pypi
-
-
-if __name__ == "__main__":  # pylint: disable=comparison-of-constants
-    if "{{cookiecutter.include_github_actions}}" != "y":
-        remove_dir(".github")
-    elif should_remove_release_workflow():
-        remove_file(".github/workflows/on-release-main.yml")
-
-    if "{{cookiecutter.mkdocs}}" != "y":
-        remove_dir("docs")
-        remove_file("mkdocs.yml")
-
-    if "{{cookiecutter.dockerfile}}" != "y":
-        remove_file("Dockerfile")
-
-    if "{{cookiecutter.codecov}}" != "y":
-        remove_file("codecov.yaml")
-        if "{{cookiecutter.include_github_actions}}" == "y":
-            remove_file(".github/workflows/validate-codecov-config.yml")
-
-    if "{{cookiecutter.devcontainer}}" != "y":
-        remove_dir(".devcontainer")
-
-    if "{{cookiecutter.open_source_license}}" == "MIT license":
-        move_file("LICENSE_MIT", "LICENSE")
-        remove_file("LICENSE_BSD")
-        remove_file("LICENSE_ISC")
-        remove_file("LICENSE_APACHE")
-        remove_file("LICENSE_GPL")
-
-    if "{{cookiecutter.open_source_license}}" == "BSD license":
-        move_file("LICENSE_BSD", "LICENSE")
-        remove_file("LICENSE_MIT")
-        remove_file("LICENSE_ISC")
-        remove_file("LICENSE_APACHE")
-        remove_file("LICENSE_GPL")
-
-    if "{{cookiecutter.open_source_license}}" == "ISC license":
-        move_file("LICENSE_ISC", "LICENSE")
-        remove_file("LICENSE_MIT")
-        remove_file("LICENSE_BSD")
-        remove_file("LICENSE_APACHE")
-        remove_file("LICENSE_GPL")
-
-    if "{{cookiecutter.open_source_license}}" == "Apache Software License 2.0":
-        move_file("LICENSE_APACHE", "LICENSE")
-        remove_file("LICENSE_MIT")
-        remove_file("LICENSE_BSD")
-        remove_file("LICENSE_ISC")
-        remove_file("LICENSE_GPL")
-
-    if "{{cookiecutter.open_source_license}}" == "GNU General Public License v3":
-        move_file("LICENSE_GPL", "LICENSE")
-        remove_file("LICENSE_MIT")
-        remove_file("LICENSE_BSD")
-        remove_file("LICENSE_ISC")
-        remove_file("LICENSE_APACHE")
-
-    if "{{cookiecutter.open_source_license}}" == "Not open source":
-        remove_file("LICENSE_GPL")
-        remove_file("LICENSE_MIT")
-        remove_file("LICENSE_BSD")
-        remove_file("LICENSE_ISC")
-        remove_file("LICENSE_APACHE")
+    index_path = os.path.join(locks_dir, "index.json")
+    if not os.path.exists(index_path):
+        return
+    with open(index_path, encoding="utf-8") as index_file:
+        index = json.load(index_file)
+    for entry in index["locks"]:
+        if conditions_hold(entry["answers"]):
+            with open(os.path.join(locks_dir, entry["file"]), "rb") as lock_file:
+                content = lock_file.read()
+            name = re.sub(r"[-_.]+", "-", VARIABLES["project_name"]).lower()
+            placeholder = f'name = "{index["placeholder"]}"\n'.encode()
+            with open(os.path.join(PROJECT_DIRECTORY, "uv.lock"), "wb") as out_file:
+                out_file.write(content.replace(placeholder, f'name = "{name}"\n'.encode(), 1))
+            return
+
+
+if __name__ == "__main__":
+    with open(os.path.join(REPO_DIRECTORY, "template-manifest.json"), encoding="utf-8") as manifest_file:
+        manifest = json.load(manifest_file)
+
+    for rule in manifest.get("exclude", []):
+        if conditions_hold(rule.get("when", {})) and not ("unless" in rule and conditions_hold(rule["unless"])):
+            for excluded in rule["paths"]:
+                remove_path(excluded)
+
+    for source, target in manifest.get("rename", {}).items():
+        move_file(source, target)
+
+    if "locks" in manifest:
+        write_lock(os.path.join(REPO_DIRECTORY, manifest["locks"]))
@@ -1,7 +1,9 @@
 """Pre-generation script for cookiecutter template.
 
-Validates project name and slug to ensure they conform to Python module naming conventions
-before project generation proceeds.
+Validates project name and slug to ensure they conform to Python module naming conventions,
+and the number of CI test shards, before project generation proceeds. ``uvi`` runs the
+equivalent ``uvi.hooks.pre_gen_project`` in-process instead of this script; keep the two
+in sync.
 """
 
 from __future__ import annotations
@@ -32,3 +34,10 @@ if not re.match(PROJECT_SLUG_REGEX, PROJECT_SLUG):
     )
     # Exit to cancel project
     sys.exit(1)
+
+TEST_SHARDS = "{{cookiecutter.ci_test_shards}}"
+
+if not TEST_SHARDS.isdigit() or int(TEST_SHARDS) < 1:
+    print(f"ERROR: ci_test_shards must be a positive whole number, not {TEST_SHARDS!r}")
+    # Exit to cancel project
+    sys.exit(1)
@@ -0,0 +1,33 @@
+"""Build hook that bundles the cookiecutter template into the wheel.
+
+The project metadata lives in ``pyproject.toml``. This only extends
+``build_py`` to write ``template-snapshot.tar.gz`` and its content hash into the
+built ``uvi`` package, so installed copies of uvi never need to fetch the
+template from GitHub.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+from setuptools import setup
+from setuptools.command.build_py import build_py
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class BuildPyWithTemplate(build_py):
+    """Build the package and add the template snapshot to it."""
+
+    def run(self) -> None:
+        """Copy the package sources, then write the snapshot next to them."""
+        super().run()
+        sys.path.insert(0, ROOT)
+        from uvi.template import build_snapshot  # noqa: PLC0415
+
+        digest = build_snapshot(ROOT, os.path.join(self.build_lib, "uvi"))
+        print(f"bundled template snapshot {digest[:16]}")
+
+
+setup(cmdclass={"build_py": BuildPyWithTemplate})
@@ -0,0 +1,124 @@
+"""Shared fixtures for the template test suite.
+
+Baking a project takes far longer than the assertions made about it, and many
+tests ask for the same answers, so projects are baked once per session and
+shared. ``bake`` returns the cached result for answers that resolve to the
+same context; the files are made read-only so a test cannot change what
+another test sees. Tests that run tools inside a project (which write
+``.venv``, caches and reports) use ``synced_project``, a private copy whose
+uv environment is synced once per session.
+
+Every session fixture lives under pytest's per-session temporary directory,
+which pytest-xdist gives each worker separately, so workers never share
+mutable state; the uv cache they share is safe for concurrent use.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shlex
+import stat
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import pytest
+from cookiecutter.main import cookiecutter
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent
+
+
+@dataclass(frozen=True)
+class BakeResult:
+    """Outcome of baking the template, shaped like pytest-cookies' ``Result``."""
+
+    exit_code: int
+    exception: BaseException | None
+    project_path: Path
+    context: dict[str, Any]
+
+
+def default_context() -> dict[str, str]:
+    """Return the answers ``cookiecutter --no-input`` uses, with choices at their first value."""
+    with (TEMPLATE_DIR / "cookiecutter.json").open(encoding="utf-8") as context_file:
+        variables = json.load(context_file)
+    return {
+        name: value[0] if isinstance(value, list) else value
+        for name, value in variables.items()
+        if not name.startswith("_")
+    }
+
+
+def _make_read_only(path: Path) -> None:
+    """Drop write permission from every file below ``path``."""
+    for root, _, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(root, name)
+            os.chmod(file_path, stat.S_IMODE(os.stat(file_path).st_mode) & ~0o222)
+
+
+def bake_project(output_dir: Path, extra_context: dict[str, str]) -> BakeResult:
+    """Bake the template with plain cookiecutter, as ``cookies.bake`` does.
+
+    Args:
+        output_dir: Empty directory to bake into; also holds cookiecutter's config and replay files
+        extra_context: Answers overriding the template defaults
+
+    Returns:
+        The bake result; failures are captured rather than raised
+    """
+    config_file = output_dir / "cookiecutter-config.yaml"
+    config_file.write_text(
+        f"cookiecutters_dir: '{output_dir / 'cookiecutters'}'\nreplay_dir: '{output_dir / 'replay'}'\n",
+        encoding="utf-8",
+    )
+    try:
+        project_path = cookiecutter(
+            str(TEMPLATE_DIR),
+            no_input=True,
+            extra_context=extra_context,
+            output_dir=str(output_dir),
+            config_file=str(config_file),
+        )
+    except Exception as e:  # Reported through the result, like pytest-cookies
+        return BakeResult(-1, e, output_dir, extra_context)
+    except SystemExit as e:
+        return BakeResult(e.code if isinstance(e.code, int) else 1, e, output_dir, extra_context)
+    return BakeResult(0, None, Path(project_path), extra_context)
+
+
+@pytest.fixture(scope="session")
+def bake(tmp_path_factory):
+    """Return a function baking the template once per distinct set of answers.
+
+    Call it with the answers as keyword arguments, e.g. ``bake(mkdocs="n")``.
+    Answers equal to the defaults do not create a separate bake.
+    """
+    defaults = default_context()
+    results: dict[tuple[tuple[str, str], ...], BakeResult] = {}
+
+    def _bake(**extra_context: str) -> BakeResult:
+        key = tuple(sorted({**defaults, **extra_context}.items()))
+        if key not in results:
+            result = bake_project(tmp_path_factory.mktemp("bake"), extra_context)
+            if result.exit_code == 0:
+                _make_read_only(result.project_path)
+            results[key] = result
+        return results[key]
+
+    return _bake
+
+
+@pytest.fixture(scope="session")
+def synced_project(tmp_path_factory):
+    """Bake a default project and sync its uv environment, once per session.
+
+    Returns:
+        Path of the project, which tests may run tools in
+    """
+    result = bake_project(tmp_path_factory.mktemp("synced"), {})
+    assert result.exit_code == 0, result.exception
+    subprocess.check_call(shlex.split("uv sync"), cwd=result.project_path)
+    return result.project_path
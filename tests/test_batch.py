@@ -0,0 +1,114 @@
+"""Test suite for batch project generation.
+
+Tests spec loading and validation, and generation of several projects
+across a process pool from a single JSON Lines spec file.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+import pytest
+
+from uvi.batch import load_specs, load_template_context, run_batch
+from uvi.template import find_template
+
+
+def write_specs(path, specs):
+    """Write specs as JSON Lines, with a blank line to check it is skipped."""
+    lines = [json.dumps(spec) for spec in specs]
+    path.write_text("\n".join([*lines[:1], "", *lines[1:]]) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_batch_generates_every_spec(tmp_path):
+    """Test that each spec becomes a project honouring its options."""
+    specs = write_specs(
+        tmp_path / "specs.jsonl",
+        [
+            {"project_name": "svc-one"},
+            {"project_name": "svc-two", "open_source_license": "Not open source", "mkdocs": "n"},
+            {"project_name": "svc-three", "dockerfile": "n"},
+        ],
+    )
+    output = tmp_path / "out"
+
+    failures = run_batch(specs, output_dir=str(output), jobs=2, defaults={"author": "Batch Author"})
+
+    assert failures == 0
+    assert sorted(os.listdir(output)) == ["svc-one", "svc-three", "svc-two"]
+    assert os.path.isfile(output / "svc-one" / "LICENSE")
+    assert not os.path.isfile(output / "svc-two" / "LICENSE")
+    assert not os.path.isdir(output / "svc-two" / "docs")
+    assert not os.path.isfile(output / "svc-three" / "Dockerfile")
+    assert os.path.isdir(output / "svc-three" / "svc_three")
+    assert "Batch Author" in (output / "svc-one" / "pyproject.toml").read_text(encoding="utf-8")
+
+
+def test_batch_honours_user_default_context(tmp_path, monkeypatch):
+    """Test that the default_context of the user's cookiecutter config applies, as it does for single projects."""
+    config = tmp_path / "cookiecutterrc.yaml"
+    config.write_text("default_context:\n  mkdocs: n\n", encoding="utf-8")
+    monkeypatch.setenv("COOKIECUTTER_CONFIG", str(config))
+    specs = write_specs(tmp_path / "specs.jsonl", [{"project_name": "configured"}])
+
+    assert run_batch(specs, output_dir=str(tmp_path / "out"), jobs=1) == 0
+
+    assert not os.path.isdir(tmp_path / "out" / "configured" / "docs")
+    assert load_template_context(find_template())["cookiecutter"]["mkdocs"][0] == "n"
+    assert load_template_context(find_template(), user_config=False)["cookiecutter"]["mkdocs"][0] == "y"
+
+
+def test_batch_validates_all_specs_before_generating(tmp_path):
+    """Test that invalid specs are all reported and nothing is written."""
+    specs = write_specs(
+        tmp_path / "specs.jsonl",
+        [
+            {"project_name": "ok-project"},
+            {"project_name": "bad-license", "open_source_license": "WTFPL"},
+            {"project_name": "typo", "mkdoc": "n"},
+            {"project_name": "ok-project"},
+            {"project_name": "bad_name"},
+        ],
+    )
+    output = tmp_path / "out"
+
+    with pytest.raises(ValueError) as excinfo:
+        run_batch(specs, output_dir=str(output), jobs=2)
+
+    message = str(excinfo.value)
+    assert "spec 2" in message
+    assert "spec 3: unknown template variable(s): mkdoc" in message
+    assert "spec 4: project_name 'ok-project' already used by spec 1" in message
+    assert "spec 5: The project name bad_name is not a valid Python module name" in message
+    assert not output.exists()
+
+
+def test_batch_reports_failed_projects(tmp_path):
+    """Test that a project that cannot be generated counts as a failure."""
+    specs = write_specs(tmp_path / "specs.jsonl", [{"project_name": "good-one"}, {"project_name": "taken"}])
+    output = tmp_path / "out"
+    (output / "taken").mkdir(parents=True)
+
+    assert run_batch(specs, output_dir=str(output), jobs=1, template=find_template()) == 1
+    assert sorted(os.listdir(output)) == ["good-one", "taken"]
+    assert os.listdir(output / "taken") == []
+
+
+def test_in_process_batch_restores_sys_path(tmp_path):
+    """Test that rendering in-process does not leave the template on the caller's import path."""
+    specs = write_specs(tmp_path / "specs.jsonl", [{"project_name": "path-check"}])
+    path = list(sys.path)
+
+    assert run_batch(specs, output_dir=str(tmp_path / "out"), jobs=1, template=find_template()) == 0
+    assert sys.path == path
+
+
+def test_load_specs_rejects_non_objects(tmp_path):
+    """Test that every line must be a JSON object."""
+    path = tmp_path / "specs.jsonl"
+    path.write_text('{"project_name": "a"}\n["not", "an", "object"]\n', encoding="utf-8")
+    with pytest.raises(ValueError, match=":2: expected a JSON object"):
+        load_specs(str(path))
@@ -0,0 +1,104 @@
+"""Test suite for the post-generation bootstrap.
+
+Tests the task graph runner with small Python commands standing in for
+git, uv and pre-commit: independent tasks overlap, dependencies are
+respected, and a failure skips only the tasks that need it.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+import pytest
+
+from uvi.bootstrap import BOOTSTRAP_TASKS, Task, format_summary, locked_version, pin_tasks, run_tasks
+
+# How long each stand-in task sleeps, in seconds
+TASK_SECONDS = 0.3
+
+
+def python_task(name, code, needs=()):
+    """Return a task running a snippet of Python."""
+    return Task(name, (sys.executable, "-c", code), needs)
+
+
+def test_independent_tasks_overlap(tmp_path):
+    """Test that tasks without dependencies between them run concurrently."""
+    sleep = f"import time; time.sleep({TASK_SECONDS})"
+    tasks = [python_task("a", sleep), python_task("b", sleep), python_task("c", sleep)]
+
+    start = time.perf_counter()
+    results = run_tasks(tasks, str(tmp_path), report=lambda line: None)
+
+    assert [result.status for result in results] == ["ok", "ok", "ok"]
+    assert time.perf_counter() - start < 2 * TASK_SECONDS
+
+
+def test_dependencies_and_failures(tmp_path):
+    """Test ordering by ``needs`` and that failures skip only their dependents."""
+    tasks = [
+        python_task("write", "open('marker', 'w').write('x')"),
+        python_task("fail", "raise SystemExit(3)"),
+        python_task("read", "open('marker').read()", needs=("write",)),
+        python_task("after-fail", "pass", needs=("write", "fail")),
+    ]
+    lines = []
+
+    results = run_tasks(tasks, str(tmp_path), report=lines.append)
+
+    assert [(result.name, result.status) for result in results] == [
+        ("write", "ok"),
+        ("fail", "failed"),
+        ("read", "ok"),
+        ("after-fail", "skipped"),
+    ]
+    assert "  skipped  after-fail (needs fail)" in lines
+    finished_write = next(number for number, line in enumerate(lines) if line.split()[:2] == ["ok", "write"])
+    assert lines.index("  started  read") > finished_write
+    summary = format_summary(results, 1.0)
+    assert summary.startswith("Bootstrap finished in 1.00s")
+    assert "after-fail" in summary
+
+
+def test_missing_command_is_skipped(tmp_path):
+    """Test that a tool that is not installed is skipped, not an error."""
+    (result,) = run_tasks([Task("nothing", ("uvi-no-such-tool",))], str(tmp_path), report=lambda line: None)
+    assert result.status == "skipped"
+    assert "not found" in result.output
+
+
+def test_bootstrap_graph():
+    """Test that git init and uv sync start together and hooks wait only for what they need."""
+    needs = {task.name: set(task.needs) for task in BOOTSTRAP_TASKS}
+    assert needs["git init"] == needs["uv sync"] == set()
+    assert needs["pre-commit install-hooks"] == {"git init"}
+    assert needs["pre-commit install"] == {"git init", "uv sync"}
+    with pytest.raises(ValueError, match="unknown or later"):
+        run_tasks([Task("x", ("true",), needs=("y",))], ".")
+
+
+def test_pin_tasks(tmp_path):
+    """Test that uvx tools are pinned to the project's lock and that offline reaches uv sync and uvx."""
+    (tmp_path / "uv.lock").write_text(
+        'version = 1\n\n[[package]]\nname = "pre-commit"\nversion = "4.1.0"\nsource = { registry = "x" }\n'
+    )
+    assert locked_version(str(tmp_path), "pre-commit") == "4.1.0"
+    assert locked_version(str(tmp_path), "pre") is None
+
+    commands = {task.name: task.command for task in pin_tasks(BOOTSTRAP_TASKS, str(tmp_path), offline=True)}
+    assert commands["uv sync"] == ("uv", "sync", "--offline")
+    assert commands["pre-commit install-hooks"] == (
+        "uvx",
+        "--offline",
+        "--from",
+        "pre-commit==4.1.0",
+        "pre-commit",
+        "install-hooks",
+    )
+    assert commands["git init"] == ("git", "init", "-b", "main")
+
+    (tmp_path / "uv.lock").unlink()
+    online = {task.name: task.command for task in pin_tasks(BOOTSTRAP_TASKS, str(tmp_path))}
+    assert online["uv sync"] == ("uv", "sync")
+    assert online["pre-commit install-hooks"] == ("uvx", "pre-commit", "install-hooks")
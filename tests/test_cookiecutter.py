@@ -6,11 +6,18 @@ different user choices and template options.
 
 from __future__ import annotations
 
+import json
 import os
 import shlex
+import shutil
+import stat
 import subprocess
+import sys
 
-from tests.utils import file_contains_text, is_valid_yaml, run_within_dir
+import yaml
+
+from tests.conftest import TEMPLATE_DIR
+from tests.utils import file_contains_text, is_valid_yaml
 
 # License file line counts
 MIT_LICENSE_LINE_COUNT = 21
@@ -20,9 +27,15 @@ APACHE_LICENSE_LINE_COUNT = 202
 GPL_LICENSE_LINE_COUNT = 674
 
 
-def test_bake_project(cookies):
+def shipped_uv_version():
+    """Return the uv version the template's ``uv.lock`` files were resolved with."""
+    with (TEMPLATE_DIR / "locks" / "index.json").open(encoding="utf-8") as index_file:
+        return json.load(index_file)["uv"].split()[1]
+
+
+def test_bake_project(bake):
     """Test basic project generation with minimal configuration."""
-    result = cookies.bake(extra_context={"project_name": "my-project"})
+    result = bake(project_name="my-project")
 
     assert result.exit_code == 0
     assert result.exception is None
@@ -30,234 +43,496 @@ def test_bake_project(cookies):
     assert result.project_path.is_dir()
 
 
-def test_using_pytest(cookies, tmp_path):
+def test_using_pytest(bake, synced_project):
     """Test project generation with pytest setup and test execution."""
-    with run_within_dir(tmp_path):
-        result = cookies.bake()
+    result = bake()
+
+    # Assert that project was created.
+    assert result.exit_code == 0
+    assert result.exception is None
+    assert result.project_path.name == "example-project"
+    assert result.project_path.is_dir()
+    assert is_valid_yaml(result.project_path / ".github" / "workflows" / "main.yml")
 
-        # Assert that project was created.
-        assert result.exit_code == 0
-        assert result.exception is None
-        assert result.project_path.name == "example-project"
-        assert result.project_path.is_dir()
-        assert is_valid_yaml(result.project_path / ".github" / "workflows" / "main.yml")
+    # Run the tests in the session's pre-synced copy of the same project.
+    assert subprocess.check_call(shlex.split("uv run make test"), cwd=synced_project) == 0
 
-        # Install the uv environment and run the tests.
-        with run_within_dir(str(result.project_path)):
-            assert subprocess.check_call(shlex.split("uv sync")) == 0
-            assert subprocess.check_call(shlex.split("uv run make test")) == 0
 
+def test_shipped_lock_matches_project(synced_project):
+    """Test that the pre-resolved ``uv.lock`` needs no changes for the generated ``pyproject.toml``."""
+    assert subprocess.check_call(shlex.split("uv lock --locked"), cwd=synced_project) == 0
 
-def test_devcontainer(cookies, tmp_path):
+
+def test_check_runs_tools_side_by_side(synced_project):
+    """Test that the check script times each tool and, with --changed, lints only changed files."""
+    git = ["git", "-c", "user.name=uvi", "-c", "user.email=uvi@example.com"]
+    if not (synced_project / ".git").exists():
+        subprocess.check_call([*git, "init", "-q"], cwd=synced_project)
+        subprocess.check_call([*git, "add", "-A"], cwd=synced_project)
+        subprocess.check_call([*git, "commit", "-q", "--no-verify", "-m", "Generated"], cwd=synced_project)
+
+    completed = subprocess.run(
+        shlex.split("uv run --no-project python scripts/check.py --changed HEAD --no-daemon"),
+        cwd=synced_project,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+    assert "pre-commit skipped: no files changed since HEAD" in completed.stdout
+    timings = completed.stdout.split("Timings:\n")[1].split()
+    assert [timings[0], timings[1], timings[-2]] == ["uv", "lock", "total"]
+    assert {"mypy", "deptry"} <= set(timings)
+
+
+def test_devcontainer(bake):
     """Test that the devcontainer files are created when devcontainer=y"""
-    with run_within_dir(tmp_path):
-        result = cookies.bake(extra_context={"devcontainer": "y"})
-        assert result.exit_code == 0
-        assert os.path.isfile(f"{result.project_path}/.devcontainer/devcontainer.json")
-        assert os.path.isfile(f"{result.project_path}/.devcontainer/postCreateCommand.sh")
+    result = bake(devcontainer="y")
+    assert result.exit_code == 0
+    assert os.path.isfile(f"{result.project_path}/.devcontainer/devcontainer.json")
+    assert os.path.isfile(f"{result.project_path}/.devcontainer/postCreateCommand.sh")
 
 
-def test_not_devcontainer(cookies, tmp_path):
+def test_not_devcontainer(bake):
     """Test that the devcontainer files are not created when devcontainer=n"""
-    with run_within_dir(tmp_path):
-        result = cookies.bake(extra_context={"devcontainer": "n"})
-        assert result.exit_code == 0
-        assert not os.path.isfile(f"{result.project_path}/.devcontainer/devcontainer.json")
-        assert not os.path.isfile(f"{result.project_path}/.devcontainer/postCreateCommand.sh")
+    result = bake(devcontainer="n")
+    assert result.exit_code == 0
+    assert not os.path.isfile(f"{result.project_path}/.devcontainer/devcontainer.json")
+    assert not os.path.isfile(f"{result.project_path}/.devcontainer/postCreateCommand.sh")
 
 
-def test_cicd_contains_pypi_secrets(cookies, tmp_path):
+def test_cicd_contains_pypi_secrets(bake):
     """Test project generation with PyPI publishing enabled and secrets configured."""
-    with run_within_dir(tmp_path):
-        result = cookies.bake(extra_context={"publish_to_pypi": "y"})
-        assert result.exit_code == 0
-        assert is_valid_yaml(result.project_path / ".github" / "workflows" / "on-release-main.yml")
-        assert file_contains_text(f"{result.project_path}/.github/workflows/on-release-main.yml", "PYPI_TOKEN")
-        assert file_contains_text(f"{result.project_path}/Makefile", "build-and-publish")
+    result = bake(publish_to_pypi="y")
+    assert result.exit_code == 0
+    assert is_valid_yaml(result.project_path / ".github" / "workflows" / "on-release-main.yml")
+    assert file_contains_text(f"{result.project_path}/.github/workflows/on-release-main.yml", "PYPI_TOKEN")
+    assert file_contains_text(f"{result.project_path}/Makefile", "build-and-publish")
 
 
-def test_dont_publish(cookies, tmp_path):
+def test_dont_publish(bake):
     """Test project generation with PyPI publishing disabled."""
-    with run_within_dir(tmp_path):
-        result = cookies.bake(extra_context={"publish_to_pypi": "n"})
-        assert result.exit_code == 0
-        assert is_valid_yaml(result.project_path / ".github" / "workflows" / "on-release-main.yml")
-        assert not file_contains_text(
-            f"{result.project_path}/.github/workflows/on-release-main.yml",
-            "make build-and-publish",
-        )
+    result = bake(publish_to_pypi="n")
+    assert result.exit_code == 0
+    assert is_valid_yaml(result.project_path / ".github" / "workflows" / "on-release-main.yml")
+    assert not file_contains_text(
+        f"{result.project_path}/.github/workflows/on-release-main.yml",
+        "make build-and-publish",
+    )
 
 
-def test_mkdocs(cookies, tmp_path):
+def test_mkdocs(bake):
     """Test project generation with MkDocs documentation enabled."""
-    with run_within_dir(tmp_path):
-        result = cookies.bake(extra_context={"mkdocs": "y"})
-        assert result.exit_code == 0
-        assert is_valid_yaml(result.project_path / ".github" / "workflows" / "main.yml")
-        assert is_valid_yaml(result.project_path / ".github" / "workflows" / "on-release-main.yml")
-        assert file_contains_text(
-            f"{result.project_path}/.github/workflows/on-release-main.yml",
-            "mkdocs gh-deploy",
-        )
-        assert file_contains_text(f"{result.project_path}/Makefile", "docs:")
-        assert os.path.isdir(f"{result.project_path}/docs")
+    result = bake(mkdocs="y")
+    assert result.exit_code == 0
+    assert is_valid_yaml(result.project_path / ".github" / "workflows" / "main.yml")
+    assert is_valid_yaml(result.project_path / ".github" / "workflows" / "on-release-main.yml")
+    assert file_contains_text(
+        f"{result.project_path}/.github/workflows/on-release-main.yml",
+        "mkdocs gh-deploy",
+    )
+    assert file_contains_text(f"{result.project_path}/Makefile", "docs:")
+    assert os.path.isdir(f"{result.project_path}/docs")
 
 
-def test_not_mkdocs(cookies, tmp_path):
+def test_not_mkdocs(bake):
     """Test project generation with MkDocs documentation disabled."""
-    with run_within_dir(tmp_path):
-        result = cookies.bake(extra_context={"mkdocs": "n"})
-        assert result.exit_code == 0
-        assert is_valid_yaml(result.project_path / ".github" / "workflows" / "main.yml")
-        assert is_valid_yaml(result.project_path / ".github" / "workflows" / "on-release-main.yml")
-        assert not file_contains_text(
-            f"{result.project_path}/.github/workflows/on-release-main.yml",
-            "mkdocs gh-deploy",
-        )
-        assert not file_contains_text(f"{result.project_path}/Makefile", "docs:")
-        assert not os.path.isdir(f"{result.project_path}/docs")
+    result = bake(mkdocs="n")
+    assert result.exit_code == 0
+    assert is_valid_yaml(result.project_path / ".github" / "workflows" / "main.yml")
+    assert is_valid_yaml(result.project_path / ".github" / "workflows" / "on-release-main.yml")
+    assert not file_contains_text(
+        f"{result.project_path}/.github/workflows/on-release-main.yml",
+        "mkdocs gh-deploy",
+    )
+    assert not file_contains_text(f"{result.project_path}/Makefile", "docs:")
+    assert not os.path.isdir(f"{result.project_path}/docs")
 
 
-def test_tox(cookies, tmp_path):
+def test_tox(bake):
     """Test project generation includes tox configuration."""
-    with run_within_dir(tmp_path):
-        result = cookies.bake()
-        assert result.exit_code == 0
-        assert os.path.isfile(f"{result.project_path}/tox.ini")
-        assert file_contains_text(f"{result.project_path}/tox.ini", "[tox]")
+    result = bake()
+    assert result.exit_code == 0
+    assert os.path.isfile(f"{result.project_path}/tox.ini")
+    assert file_contains_text(f"{result.project_path}/tox.ini", "[tox]")
 
 
-def test_dockerfile(cookies, tmp_path):
+def test_dockerfile(bake):
     """Test project generation with Dockerfile enabled."""
-    with run_within_dir(tmp_path):
-        result = cookies.bake(extra_context={"dockerfile": "y"})
-        assert result.exit_code == 0
-        assert os.path.isfile(f"{result.project_path}/Dockerfile")
+    result = bake(dockerfile="y")
+    assert result.exit_code == 0
+    assert os.path.isfile(f"{result.project_path}/Dockerfile")
+    assert not os.path.isfile(f"{result.project_path}/.dockerignore")
 
 
-def test_not_dockerfile(cookies, tmp_path):
+def test_optimized_dockerfile(bake):
+    """Test the multi-stage Dockerfile: cached, production-only build and a non-root runtime."""
+    result = bake(dockerfile="optimized")
+    assert result.exit_code == 0
+    dockerfile = (result.project_path / "Dockerfile").read_text(encoding="utf-8")
+    instructions = [line for line in dockerfile.splitlines() if line and not line.startswith("#")]
+    stages = [line for line in instructions if line.startswith("FROM ")]
+    builder, runtime = dockerfile.split(f"\n{stages[1]}\n")
+
+    assert stages == ["FROM python:3.12-slim AS builder", "FROM python:3.12-slim"]
+    assert dockerfile.startswith("# syntax=docker/dockerfile:1\n")
+    # uv is pinned to the version the shipped uv.lock files were resolved with
+    assert f"COPY --from=ghcr.io/astral-sh/uv:{shipped_uv_version()} /uv /bin/uv" in builder
+    assert ":latest" not in dockerfile
+    assert "UV_COMPILE_BYTECODE=1" in builder
+    syncs = [line.split("uv sync ")[1] for line in builder.splitlines() if "uv sync" in line]
+    assert syncs == ["--frozen --no-dev --no-install-project", "--frozen --no-dev --no-editable"]
+    assert builder.count("--mount=type=cache,target=/root/.cache/uv") == len(syncs)
+    # The runtime stage takes only the virtual environment, and does not run as root
+    assert "uv" not in runtime.replace(".venv", "")
+    assert "COPY --from=builder --chown=app:app /app/.venv /app/.venv" in runtime
+    assert [line for line in runtime.splitlines() if line.startswith("USER ")] == ["USER app"]
+    assert instructions[-1] == 'CMD [ "python", "-m", "example_project.foo"]'
+    assert file_contains_text(f"{result.project_path}/.dockerignore", ".venv")
+
+
+def test_not_dockerfile(bake):
     """Test project generation with Dockerfile disabled."""
-    with run_within_dir(tmp_path):
-        result = cookies.bake(extra_context={"dockerfile": "n"})
-        assert result.exit_code == 0
-        assert not os.path.isfile(f"{result.project_path}/Dockerfile")
+    result = bake(dockerfile="n")
+    assert result.exit_code == 0
+    assert not os.path.isfile(f"{result.project_path}/Dockerfile")
+    assert not os.path.isfile(f"{result.project_path}/.dockerignore")
 
 
-def test_codecov(cookies, tmp_path):
+def test_codecov(bake):
     """Test project generation with Codecov integration enabled."""
-    with run_within_dir(tmp_path):
-        result = cookies.bake()
-        assert result.exit_code == 0
-        assert is_valid_yaml(result.project_path / ".github" / "workflows" / "main.yml")
-        assert os.path.isfile(f"{result.project_path}/codecov.yaml")
-        assert os.path.isfile(f"{result.project_path}/.github/workflows/validate-codecov-config.yml")
+    result = bake()
+    assert result.exit_code == 0
+    assert is_valid_yaml(result.project_path / ".github" / "workflows" / "main.yml")
+    assert os.path.isfile(f"{result.project_path}/codecov.yaml")
+    assert os.path.isfile(f"{result.project_path}/.github/workflows/validate-codecov-config.yml")
 
 
-def test_not_codecov(cookies, tmp_path):
+def test_not_codecov(bake):
     """Test project generation with Codecov integration disabled."""
-    with run_within_dir(tmp_path):
-        result = cookies.bake(extra_context={"codecov": "n"})
-        assert result.exit_code == 0
-        assert is_valid_yaml(result.project_path / ".github" / "workflows" / "main.yml")
-        assert not os.path.isfile(f"{result.project_path}/codecov.yaml")
-        assert not os.path.isfile(f"{result.project_path}/.github/workflows/validate-codecov-config.yml")
+    result = bake(codecov="n")
+    assert result.exit_code == 0
+    assert is_valid_yaml(result.project_path / ".github" / "workflows" / "main.yml")
+    assert not os.path.isfile(f"{result.project_path}/codecov.yaml")
+    assert not os.path.isfile(f"{result.project_path}/.github/workflows/validate-codecov-config.yml")
 
 
-def test_remove_release_workflow(cookies, tmp_path):
+def test_remove_release_workflow(bake):
     """Test release workflow file handling based on PyPI and MkDocs settings."""
-    with run_within_dir(tmp_path):
-        result = cookies.bake(extra_context={"publish_to_pypi": "n", "mkdocs": "y"})
-        assert result.exit_code == 0
-        assert os.path.isfile(f"{result.project_path}/.github/workflows/on-release-main.yml")
+    result = bake(publish_to_pypi="n", mkdocs="y")
+    assert result.exit_code == 0
+    assert os.path.isfile(f"{result.project_path}/.github/workflows/on-release-main.yml")
+
+    result = bake(publish_to_pypi="n", mkdocs="n")
+    assert result.exit_code == 0
+    assert not os.path.isfile(f"{result.project_path}/.github/workflows/on-release-main.yml")
+
+
+def test_main_workflow(bake):
+    """Test the CI workflow: lock-keyed caches, parallel tests, docs in the quality job and timing."""
+    result = bake()
+    github = result.project_path / ".github"
+    assert is_valid_yaml(github / "workflows" / "main.yml")
+    assert is_valid_yaml(github / "actions" / "setup-python-env" / "action.yml")
+    workflow = yaml.safe_load((github / "workflows" / "main.yml").read_text(encoding="utf-8"))
+    action = yaml.safe_load((github / "actions" / "setup-python-env" / "action.yml").read_text(encoding="utf-8"))
+
+    assert workflow["concurrency"]["cancel-in-progress"] == "${{ github.event_name == 'pull_request' }}"
+    assert set(workflow["jobs"]) == {"quality", "tests-and-type-check"}
+    quality = workflow["jobs"]["quality"]["steps"]
+    assert "hashFiles('.pre-commit-config.yaml')" in quality[1]["with"]["key"]
+    assert {"run": "uv run mkdocs build -s", "name": "Check if documentation can be built"} in quality
+    tests = workflow["jobs"]["tests-and-type-check"]
+    assert tests["strategy"]["matrix"] == {"python-version": ["3.10", "3.11", "3.12", "3.13"]}
+    (run_tests,) = [step for step in tests["steps"] if step.get("name") == "Run tests"]
+    assert run_tests["run"].startswith("uv run python -m pytest tests -n auto --durations=10 --cov")
+    assert "--shard-id" not in run_tests["run"]
+    for job in workflow["jobs"].values():
+        assert job["steps"][-1]["name"] == "Report timing"
+        assert job["steps"][-1]["if"] == "always()"
+
+    setup_uv = next(step for step in action["runs"]["steps"] if step.get("name") == "Install uv")
+    assert setup_uv["with"]["cache-dependency-glob"] == "uv.lock"
+    assert action["inputs"]["uv-version"]["default"] == shipped_uv_version()
+    assert not (result.project_path / "tests" / "conftest.py").exists()
+
+
+def test_sharded_tests_workflow(bake):
+    """Test that ``ci_test_shards`` splits the tests across runners and types are checked once."""
+    result = bake(ci_test_shards="3", mkdocs="n")
+    assert result.exit_code == 0
+    assert is_valid_yaml(result.project_path / ".github" / "workflows" / "main.yml")
+    workflow = yaml.safe_load((result.project_path / ".github" / "workflows" / "main.yml").read_text(encoding="utf-8"))
+
+    tests = workflow["jobs"]["tests-and-type-check"]
+    assert tests["strategy"]["matrix"]["shard"] == [1, 2, 3]
+    steps = {step.get("name"): step for step in tests["steps"]}
+    assert "--shard-id=${{ matrix.shard }} --num-shards=3" in steps["Run tests"]["run"]
+    assert steps["Check typing"]["if"] == "${{ matrix.shard == 1 }}"
+    assert "mkdocs" not in str(workflow["jobs"]["quality"])
+    assert (result.project_path / "tests" / "conftest.py").is_file()
+
+    assert bake(ci_test_shards="0").exit_code != 0
+
+
+def test_shards_cover_every_test_once(bake, tmp_path):
+    """Test that the generated sharding plugin splits tests without gaps or overlap."""
+    result = bake(ci_test_shards="3", mkdocs="n")
+    (tmp_path / "conftest.py").write_bytes((result.project_path / "tests" / "conftest.py").read_bytes())
+    (tmp_path / "test_many.py").write_text(
+        "import pytest\n\n\n@pytest.mark.parametrize('n', range(7))\ndef test_n(n):\n    pass\n", encoding="utf-8"
+    )
+
+    def run_shard(shard_id):
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "pytest",
+                "-q",
+                "-p",
+                "no:cacheprovider",
+                "-rA",
+                f"--shard-id={shard_id}",
+                "--num-shards=3",
+            ],
+            cwd=tmp_path,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        return [line.split()[1] for line in output.splitlines() if line.startswith("PASSED ")]
+
+    shards = [run_shard(shard_id) for shard_id in (1, 2, 3)]
+    assert [len(tests) for tests in shards] == [3, 2, 2]
+    assert sorted(test for tests in shards for test in tests) == sorted(f"test_many.py::test_n[{n}]" for n in range(7))
+
+
+def test_benchmarks(bake):
+    """Test the benchmark suite, its make targets and its CI job."""
+    result = bake(benchmarks="y")
+    assert result.exit_code == 0
+    assert os.path.isfile(f"{result.project_path}/benchmarks/test_foo_benchmark.py")
+    assert os.path.isfile(f"{result.project_path}/benchmarks/compare.py")
+    assert file_contains_text(f"{result.project_path}/pyproject.toml", '"pytest-benchmark')
+    assert file_contains_text(f"{result.project_path}/Makefile", "bench-baseline:")
+    workflow = yaml.safe_load((result.project_path / ".github" / "workflows" / "main.yml").read_text(encoding="utf-8"))
+    steps = workflow["jobs"]["benchmarks"]["steps"]
+    assert {"name": "Run benchmarks and compare with the baseline", "run": "make bench"} in steps
+    assert [step["uses"] for step in steps if "baseline" in step.get("name", "") and "uses" in step] == [
+        "actions/cache/restore@v4",
+        "actions/cache/save@v4",
+    ]
+
+
+def test_no_benchmarks(bake):
+    """Test that benchmarks=n leaves out the suite, its targets and its CI job."""
+    result = bake(benchmarks="n")
+    assert result.exit_code == 0
+    assert not os.path.exists(f"{result.project_path}/benchmarks")
+    assert not file_contains_text(f"{result.project_path}/pyproject.toml", "pytest-benchmark")
+    assert not file_contains_text(f"{result.project_path}/Makefile", "bench")
+    assert is_valid_yaml(result.project_path / ".github" / "workflows" / "main.yml")
+    assert not file_contains_text(f"{result.project_path}/.github/workflows/main.yml", "benchmarks")
+
+
+def test_benchmark_comparison(bake, tmp_path):
+    """Test that the comparison script fails only on slowdowns above the threshold."""
+    compare = str(bake(benchmarks="y").project_path / "benchmarks" / "compare.py")
+
+    def report(name, median):
+        path = tmp_path / name
+        path.write_text(json.dumps({"benchmarks": [{"fullname": "test_foo", "stats": {"median": median}}]}))
+        return str(path)
+
+    def run_compare(*args):
+        return subprocess.run([sys.executable, compare, *args], capture_output=True, text=True, check=False)
+
+    baseline = report("baseline.json", 1.0)
+    assert run_compare(baseline, report("faster.json", 0.5)).returncode == 0
+    assert run_compare(baseline, report("close.json", 1.05)).returncode == 0
+    slower = run_compare(baseline, report("slower.json", 1.2))
+    assert slower.returncode == 1
+    assert "REGRESSION" in slower.stdout
+    assert run_compare(baseline, str(tmp_path / "slower.json"), "--threshold", "25").returncode == 0
+    assert run_compare(str(tmp_path / "missing.json"), baseline).returncode == 0
+
+
+def test_importtime(bake, tmp_path):
+    """Test that the import-time tests pass within budget and catch slow or heavy imports."""
+    result = bake(importtime="y")
+    assert result.exit_code == 0
+    assert file_contains_text(f"{result.project_path}/pyproject.toml", "[tool.importtime]")
+    assert file_contains_text(f"{result.project_path}/Makefile", "importtime:")
+    project = tmp_path / "project"
+    shutil.copytree(result.project_path, project, copy_function=shutil.copyfile)
+
+    def run_importtime_tests():
+        return subprocess.run(
+            [sys.executable, "-m", "pytest", "-p", "no:cacheprovider", "tests/test_importtime.py"],
+            cwd=project,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+    passed = run_importtime_tests()
+    assert passed.returncode == 0, passed.stdout
+
+    pyproject = (project / "pyproject.toml").read_text(encoding="utf-8")
+    (project / "pyproject.toml").write_text(
+        pyproject.replace("max-cumulative-us = 100_000", "max-cumulative-us = 1").replace(
+            "heavy-module-us = 20_000", "heavy-module-us = 0"
+        ),
+        encoding="utf-8",
+    )
+    (project / "example_project" / "__init__.py").write_text("import json\n", encoding="utf-8")
+    failed = run_importtime_tests()
+    assert failed.returncode == 1
+    assert "over the 1us budget" in failed.stdout
+    (heavy,) = [line for line in failed.stdout.splitlines() if "import example_project eagerly imports" in line]
+    assert "json" in heavy.split("eagerly imports ")[1].split(";")[0].split(", ")
+
+
+def test_no_importtime(bake):
+    """Test that importtime=n leaves out the budget, its test and its make target."""
+    result = bake(importtime="n")
+    assert result.exit_code == 0
+    assert not os.path.exists(f"{result.project_path}/tests/test_importtime.py")
+    assert not file_contains_text(f"{result.project_path}/pyproject.toml", "importtime")
+    assert not file_contains_text(f"{result.project_path}/Makefile", "importtime")
 
-        result = cookies.bake(extra_context={"publish_to_pypi": "n", "mkdocs": "n"})
-        assert result.exit_code == 0
-        assert not os.path.isfile(f"{result.project_path}/.github/workflows/on-release-main.yml")
 
+def test_compiled(bake, tmp_path):
+    """Test that compiled=y builds the package with mypyc and tests both builds."""
+    result = bake(compiled="y")
+    assert result.exit_code == 0
+    assert file_contains_text(f"{result.project_path}/pyproject.toml", '"mypy >= 1.15.0"]')
+    assert file_contains_text(f"{result.project_path}/Makefile", "build-compiled:")
+    workflow = yaml.safe_load((result.project_path / ".github" / "workflows" / "main.yml").read_text(encoding="utf-8"))
+    assert {"name": "Test the mypyc-compiled build", "run": "make test-compiled"} in workflow["jobs"]["compiled"][
+        "steps"
+    ]
+    project = tmp_path / "project"
+    shutil.copytree(result.project_path, project, copy_function=shutil.copyfile)
+
+    pure = subprocess.run(
+        [sys.executable, "-m", "pytest", "-p", "no:cacheprovider", "tests/test_compiled.py"],
+        cwd=project,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert pure.returncode == 0, pure.stdout
+    compiled = subprocess.run(
+        ["make", "test-compiled"],  # noqa: S607
+        cwd=project,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert compiled.returncode == 0, compiled.stdout + compiled.stderr
+    assert "tests/test_compiled.py ." in compiled.stdout
+    extensions = list((project / ".venv-compiled").glob("lib/*/site-packages/example_project/foo.*.so"))
+    assert extensions, "foo was not compiled"
+
+
+def test_not_compiled(bake):
+    """Test that compiled=n keeps the pure-Python build only."""
+    result = bake(compiled="n")
+    assert result.exit_code == 0
+    assert not os.path.exists(f"{result.project_path}/setup.py")
+    assert not os.path.exists(f"{result.project_path}/tests/test_compiled.py")
+    assert not file_contains_text(f"{result.project_path}/Makefile", "compiled")
+    assert not file_contains_text(f"{result.project_path}/pyproject.toml", "mypyc")
 
-def test_license_mit(cookies, tmp_path):
+
+def test_license_mit(bake):
     """Test project generation with MIT license option."""
-    with run_within_dir(tmp_path):
-        result = cookies.bake(extra_context={"open_source_license": "MIT license"})
-        assert result.exit_code == 0
-        assert os.path.isfile(f"{result.project_path}/LICENSE")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_BSD")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_ISC")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_APACHE")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_GPL")
-        with open(f"{result.project_path}/LICENSE", encoding="utf8") as licfile:
-            content = licfile.readlines()
-            assert len(content) == MIT_LICENSE_LINE_COUNT
-
-
-def test_license_bsd(cookies, tmp_path):
+    result = bake(open_source_license="MIT license")
+    assert result.exit_code == 0
+    assert os.path.isfile(f"{result.project_path}/LICENSE")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_BSD")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_ISC")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_APACHE")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_GPL")
+    with open(f"{result.project_path}/LICENSE", encoding="utf8") as licfile:
+        content = licfile.readlines()
+        assert len(content) == MIT_LICENSE_LINE_COUNT
+
+
+def test_license_bsd(bake):
     """Test project generation with BSD license option."""
-    with run_within_dir(tmp_path):
-        result = cookies.bake(extra_context={"open_source_license": "BSD license"})
-        assert result.exit_code == 0
-        assert os.path.isfile(f"{result.project_path}/LICENSE")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_MIT")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_ISC")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_APACHE")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_GPL")
-        with open(f"{result.project_path}/LICENSE", encoding="utf8") as licfile:
-            content = licfile.readlines()
-            assert len(content) == BSD_LICENSE_LINE_COUNT
-
-
-def test_license_isc(cookies, tmp_path):
+    result = bake(open_source_license="BSD license")
+    assert result.exit_code == 0
+    assert os.path.isfile(f"{result.project_path}/LICENSE")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_MIT")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_ISC")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_APACHE")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_GPL")
+    with open(f"{result.project_path}/LICENSE", encoding="utf8") as licfile:
+        content = licfile.readlines()
+        assert len(content) == BSD_LICENSE_LINE_COUNT
+
+
+def test_license_isc(bake):
     """Test project generation with ISC license option."""
-    with run_within_dir(tmp_path):
-        result = cookies.bake(extra_context={"open_source_license": "ISC license"})
-        assert result.exit_code == 0
-        assert os.path.isfile(f"{result.project_path}/LICENSE")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_MIT")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_BSD")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_APACHE")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_GPL")
-        with open(f"{result.project_path}/LICENSE", encoding="utf8") as licfile:
-            content = licfile.readlines()
-            assert len(content) == ISC_LICENSE_LINE_COUNT
-
-
-def test_license_apache(cookies, tmp_path):
+    result = bake(open_source_license="ISC license")
+    assert result.exit_code == 0
+    assert os.path.isfile(f"{result.project_path}/LICENSE")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_MIT")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_BSD")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_APACHE")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_GPL")
+    with open(f"{result.project_path}/LICENSE", encoding="utf8") as licfile:
+        content = licfile.readlines()
+        assert len(content) == ISC_LICENSE_LINE_COUNT
+
+
+def test_license_apache(bake):
     """Test project generation with Apache 2.0 license option."""
-    with run_within_dir(tmp_path):
-        result = cookies.bake(extra_context={"open_source_license": "Apache Software License 2.0"})
-        assert result.exit_code == 0
-        assert os.path.isfile(f"{result.project_path}/LICENSE")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_MIT")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_BSD")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_ISC")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_GPL")
-        with open(f"{result.project_path}/LICENSE", encoding="utf8") as licfile:
-            content = licfile.readlines()
-            assert len(content) == APACHE_LICENSE_LINE_COUNT
-
-
-def test_license_gplv3(cookies, tmp_path):
+    result = bake(open_source_license="Apache Software License 2.0")
+    assert result.exit_code == 0
+    assert os.path.isfile(f"{result.project_path}/LICENSE")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_MIT")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_BSD")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_ISC")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_GPL")
+    with open(f"{result.project_path}/LICENSE", encoding="utf8") as licfile:
+        content = licfile.readlines()
+        assert len(content) == APACHE_LICENSE_LINE_COUNT
+
+
+def test_license_gplv3(bake):
     """Test project generation with GNU GPL v3 license option."""
-    with run_within_dir(tmp_path):
-        result = cookies.bake(extra_context={"open_source_license": "GNU General Public License v3"})
-        assert result.exit_code == 0
-        assert os.path.isfile(f"{result.project_path}/LICENSE")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_MIT")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_BSD")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_ISC")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_APACHE")
-        with open(f"{result.project_path}/LICENSE", encoding="utf8") as licfile:
-            content = licfile.readlines()
-            assert len(content) == GPL_LICENSE_LINE_COUNT
-
-
-def test_license_no_license(cookies, tmp_path):
+    result = bake(open_source_license="GNU General Public License v3")
+    assert result.exit_code == 0
+    assert os.path.isfile(f"{result.project_path}/LICENSE")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_MIT")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_BSD")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_ISC")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_APACHE")
+    with open(f"{result.project_path}/LICENSE", encoding="utf8") as licfile:
+        content = licfile.readlines()
+        assert len(content) == GPL_LICENSE_LINE_COUNT
+
+
+def test_license_no_license(bake):
     """Test project generation with no license option."""
-    with run_within_dir(tmp_path):
-        result = cookies.bake(extra_context={"open_source_license": "Not open source"})
-        assert result.exit_code == 0
-        assert not os.path.isfile(f"{result.project_path}/LICENSE")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_MIT")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_BSD")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_ISC")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_APACHE")
-        assert not os.path.isfile(f"{result.project_path}/LICENSE_GPL")
+    result = bake(open_source_license="Not open source")
+    assert result.exit_code == 0
+    assert not os.path.isfile(f"{result.project_path}/LICENSE")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_MIT")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_BSD")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_ISC")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_APACHE")
+    assert not os.path.isfile(f"{result.project_path}/LICENSE_GPL")
+
+
+def test_bake_is_shared_per_context(bake):
+    """Test that answers resolving to the same context reuse one read-only bake."""
+    result = bake()
+    assert bake(codecov="y", open_source_license="MIT license") is result
+    assert bake(codecov="n") is not result
+    assert not os.stat(result.project_path / "pyproject.toml").st_mode & stat.S_IWUSR
@@ -0,0 +1,295 @@
+"""Test suite for native author identity resolution.
+
+Tests git config parsing (including includes and conditional includes),
+GitHub CLI hosts.yml parsing, and the subprocess-free resolution path.
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from uvi import cache, cli, identity
+
+
+@pytest.fixture
+def isolated_home(tmp_path, monkeypatch):
+    """Point every git and gh config lookup at an empty temporary home."""
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("USERPROFILE", str(home))
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    for name in (
+        "GIT_CONFIG_GLOBAL",
+        "GIT_CONFIG_SYSTEM",
+        "GIT_DIR",
+        "XDG_CONFIG_HOME",
+        "XDG_CACHE_HOME",
+        "UVI_CACHE_DIR",
+        "GH_CONFIG_DIR",
+        "GH_HOST",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    return home
+
+
+def test_parse_values_quotes_escapes_and_comments():
+    """Test that values are unquoted, unescaped and stripped like git does."""
+    text = (
+        "[user]\n"
+        '\tname = "Ada  Lovelace" ; trailing comment\n'
+        "\temail = ada@example.com # another\n"
+        '[section "Sub.Section"]\n'
+        '\tkey = a\\tb \\\n  continued "x;y"\n'
+        "\tflag\n"
+    )
+    entries = identity.parse_git_config_text(text, Path("config"))
+    assert entries == [
+        ("user", None, "name", "Ada  Lovelace"),
+        ("user", None, "email", "ada@example.com"),
+        ("section", "Sub.Section", "key", "a\tb   continued x;y"),
+        ("section", "Sub.Section", "flag", "true"),
+    ]
+
+
+def test_parse_rejects_invalid_config():
+    """Test that malformed files raise GitConfigError."""
+    with pytest.raises(identity.GitConfigError):
+        identity.parse_git_config_text('[user]\n\tname = "unterminated\n', Path("config"))
+    with pytest.raises(identity.GitConfigError):
+        identity.parse_git_config_text("name = orphan\n", Path("config"))
+
+
+def test_includes_and_conditional_includes(isolated_home, tmp_path, monkeypatch):
+    """Test that include and includeIf gitdir/onbranch are followed."""
+    work = isolated_home / "work" / "repo"
+    (work / ".git").mkdir(parents=True)
+    (work / ".git" / "HEAD").write_text("ref: refs/heads/feature/x\n")
+    (isolated_home / "base.inc").write_text("[user]\n\tname = Base Name\n")
+    (isolated_home / "work.inc").write_text("[user]\n\temail = work@example.com\n")
+    (isolated_home / "branch.inc").write_text("[user]\n\tname = Branch Name\n")
+    (isolated_home / "other.inc").write_text("[user]\n\temail = other@example.com\n")
+    (isolated_home / ".gitconfig").write_text(
+        "[include]\n\tpath = base.inc\n"
+        '[includeIf "gitdir:~/work/"]\n\tpath = ~/work.inc\n'
+        '[includeIf "gitdir:/nowhere/"]\n\tpath = other.inc\n'
+        '[includeIf "onbranch:feature/"]\n\tpath = branch.inc\n'
+    )
+    monkeypatch.chdir(work)
+
+    config = identity.load_git_config()
+    assert identity.git_config_value(config, "user.name") == ("global", "Branch Name")
+    assert identity.git_config_value(config, "user.email") == ("global", "work@example.com")
+
+
+def test_local_overrides_global_and_matches_git(isolated_home, tmp_path, monkeypatch):
+    """Test scope precedence and agreement with git's own answer."""
+    (isolated_home / ".gitconfig").write_text("[user]\n\tname = Global Name\n\temail = global@example.com\n")
+    repo = tmp_path / "repo"
+    subprocess.run(["git", "init", "-q", str(repo)], check=True)  # noqa: S607
+    with (repo / ".git" / "config").open("a") as config_file:
+        config_file.write('[user]\n\tname = "Local Name"\n')
+    monkeypatch.chdir(repo)
+
+    config = identity.load_git_config()
+    assert identity.git_config_value(config, "user.name") == ("local", "Local Name")
+    assert identity.git_config_value(config, "user.email") == ("global", "global@example.com")
+    assert identity.load_git_config_via_subprocess()["local"]["user.name"] == "Local Name"
+
+
+def test_parse_gh_hosts():
+    """Test extracting the active login per host from hosts.yml."""
+    text = (
+        "github.com:\n"
+        "    users:\n"
+        "        octocat:\n"
+        "            oauth_token: secret\n"
+        "    git_protocol: https\n"
+        "    user: octocat\n"
+        "ghe.example.com:\n"
+        '    user: "enterprise-user"\n'
+    )
+    assert identity.parse_gh_hosts(text) == {"github.com": "octocat", "ghe.example.com": "enterprise-user"}
+    with pytest.raises(ValueError):
+        identity.parse_gh_hosts("{github.com: {user: octocat}}\n")
+
+
+def test_github_handle_from_email():
+    """Test the noreply email heuristic, including id-prefixed addresses."""
+    assert identity.github_handle_from_email("12345+octocat@users.noreply.github.com") == "octocat"
+    assert identity.github_handle_from_email("octocat@github.com") == "octocat"
+    assert identity.github_handle_from_email("octocat@example.com") is None
+
+
+def test_get_user_info_spawns_no_processes(isolated_home, tmp_path, monkeypatch):
+    """Test that the common path without a GitHub CLI login resolves identity without any subprocess."""
+    (isolated_home / ".gitconfig").write_text("[user]\n\tname = Ada\n\temail = ada@users.noreply.github.com\n")
+    monkeypatch.chdir(tmp_path)
+
+    def fail(*args, **kwargs):
+        pytest.fail(f"unexpected subprocess call: {args}")
+
+    monkeypatch.setattr(subprocess, "run", fail)
+    monkeypatch.setattr(subprocess, "check_output", fail)
+
+    assert cli.get_user_info() == {
+        "author": "Ada",
+        "email": "ada@users.noreply.github.com",
+        "author_github_handle": "ada",
+    }
+
+
+def test_github_profile_wins_over_git_config(isolated_home, tmp_path, monkeypatch):
+    """Test that a logged-in user's GitHub profile is preferred, with git config filling the gaps."""
+    (isolated_home / ".gitconfig").write_text("[user]\n\tname = Ada\n\temail = ada@example.com\n")
+    gh_dir = isolated_home / ".config" / "gh"
+    gh_dir.mkdir(parents=True)
+    (gh_dir / "hosts.yml").write_text("github.com:\n    user: ada-gh\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(identity, "fetch_github_user", lambda timeout: {"author": "Ada Lovelace"})
+
+    assert cli.get_user_info() == {
+        "author": "Ada Lovelace",
+        "email": "ada@example.com",
+        "author_github_handle": "ada-gh",
+    }
+
+
+def test_unparseable_config_falls_back_to_single_git_call(isolated_home, tmp_path, monkeypatch):
+    """Test that a parse failure triggers exactly one git subprocess."""
+    (isolated_home / ".gitconfig").write_text('[includeIf "hasconfig:remote.*.url:*"]\n\tpath = x\n')
+    monkeypatch.chdir(tmp_path)
+    calls = []
+
+    def fake_check_output(cmd, **kwargs):
+        calls.append(cmd)
+        return "global\0user.name\nFallback Name\0global\0user.email\nfb@example.com\0"
+
+    monkeypatch.setattr(subprocess, "check_output", fake_check_output)
+
+    context = identity.git_global_identity(time.monotonic() + 1)
+    assert context == {"author": "Fallback Name", "email": "fb@example.com"}
+    assert len(calls) == 1
+
+
+def test_discover_identity_honours_deadline():
+    """Test that a hung source is reported as timed out and does not block."""
+    hang = threading.Event()
+
+    def slow(deadline):
+        hang.wait(5)
+        return {"author_github_handle": "too-late"}
+
+    sources = {
+        "git-local": lambda deadline: {"author": "Local"},
+        "git-global": lambda deadline: {"author": "Global", "email": "g@example.com"},
+        "gh": slow,
+    }
+    start = time.monotonic()
+    result = identity.discover_identity(0.2, sources=sources)
+    hang.set()
+
+    assert time.monotonic() - start < 1
+    assert result.values == {"author": ("git-local", "Local"), "email": ("git-global", "g@example.com")}
+    assert result.timed_out == ["gh"]
+
+
+def test_discover_identity_falls_back_in_priority_order():
+    """Test that a field comes from the best source that has it, without waiting for worse ones."""
+    hang = threading.Event()
+
+    def slow(deadline):
+        hang.wait(5)
+        return {"author": "Global"}
+
+    sources = {
+        "gh-api": lambda deadline: {"author": "Profile"},
+        "git-local": lambda deadline: {"email": "local@example.com"},
+        "git-global": slow,
+        "gh": lambda deadline: {"author_github_handle": "gh-login"},
+    }
+    start = time.monotonic()
+    result = identity.discover_identity(5, sources=sources)
+    hang.set()
+
+    assert time.monotonic() - start < 1
+    assert result.values == {
+        "author": ("gh-api", "Profile"),
+        "email": ("git-local", "local@example.com"),
+        "author_github_handle": ("gh", "gh-login"),
+    }
+    assert result.timed_out == []
+
+
+def test_parse_duration():
+    """Test parsing of --identity-timeout values."""
+    assert cli.parse_duration("300ms") == pytest.approx(0.3)
+    assert cli.parse_duration("2s") == pytest.approx(2.0)
+    assert cli.parse_duration("1.5") == pytest.approx(1.5)
+    with pytest.raises(argparse.ArgumentTypeError):
+        cli.parse_duration("soon")
+
+
+def test_identity_cache_hit_and_invalidation(isolated_home, tmp_path, monkeypatch):
+    """Test that cached identity is reused until a config file changes."""
+    gitconfig = isolated_home / ".gitconfig"
+    gitconfig.write_text("[user]\n\tname = Ada\n\temail = ada@example.com\n")
+    monkeypatch.chdir(tmp_path)
+
+    assert cli.get_user_info()["author"] == "Ada"
+    assert cache.load_cached_identity() == {
+        "author": "Ada",
+        "email": "ada@example.com",
+        "author_github_handle": "your-github-handle",
+    }
+
+    calls = []
+    monkeypatch.setattr(cli, "discover_identity", lambda *args, **kwargs: calls.append(args))
+    assert cli.get_user_info()["author"] == "Ada"
+    assert calls == []
+
+    gitconfig.write_text("[user]\n\tname = Grace\n\temail = grace@example.com\n")
+    assert cache.load_cached_identity() is None
+
+
+def test_identity_cache_ttl(isolated_home, tmp_path, monkeypatch):
+    """Test that expired entries are ignored."""
+    (isolated_home / ".gitconfig").write_text("[user]\n\tname = Ada\n")
+    monkeypatch.chdir(tmp_path)
+    cli.get_user_info()
+
+    assert cache.load_cached_identity(ttl=3600) is not None
+    assert cache.load_cached_identity(ttl=0) is None
+    later = time.time() + 7200
+    monkeypatch.setattr(cache.time, "time", lambda: later)
+    assert cache.load_cached_identity(ttl=3600) is None
+
+
+def test_partial_identity_cached_briefly(isolated_home, tmp_path, monkeypatch):
+    """Test that an identity resolved with timed-out sources is reused for a few minutes only."""
+    monkeypatch.chdir(tmp_path)
+    partial = identity.IdentityResult({"author": ("git-global", "Ada")}, timed_out=["gh-api"], failed=[])
+    monkeypatch.setattr(cli, "discover_identity", lambda *args, **kwargs: partial)
+    cli.get_user_info()
+
+    assert cache.load_cached_identity()["author"] == "Ada"
+    later = time.time() + cache.PARTIAL_IDENTITY_CACHE_TTL + 1
+    monkeypatch.setattr(cache.time, "time", lambda: later)
+    assert cache.load_cached_identity() is None
+
+
+def test_refresh_identity_skips_cache(isolated_home, tmp_path, monkeypatch):
+    """Test that refresh=True resolves again even with a valid entry."""
+    (isolated_home / ".gitconfig").write_text("[user]\n\tname = Ada\n")
+    monkeypatch.chdir(tmp_path)
+    cli.get_user_info()
+    cache.store_cached_identity({"author": "Stale"}, cache.identity_fingerprint())
+
+    assert cli.get_user_info()["author"] == "Stale"
+    assert cli.get_user_info(refresh=True)["author"] == "Ada"
@@ -0,0 +1,47 @@
+"""Test suite for the template's pre-resolved lock files.
+
+Tests that every dependency set has a lock resolved from the current
+``pyproject.toml``, and that generation emits the matching lock under the
+project's own name.
+"""
+
+from __future__ import annotations
+
+from uvi import locks, render
+from uvi.batch import load_template_context, resolve_spec
+from uvi.template import find_template
+
+
+def rendered_lock(repo_dir, **answers):
+    """Render a project and return its ``uv.lock``."""
+    context = resolve_spec(load_template_context(repo_dir), {"project_name": "Locked-Project", **answers})
+    files = {rendered.path: rendered.content for rendered in render.render_files(repo_dir, context)}
+    return files[render.LOCK_FILE].decode()
+
+
+def test_locks_are_current():
+    """Test that no lock is missing or was resolved from an older ``pyproject.toml``.
+
+    If this fails after changing the template's dependencies, run ``make locks``.
+    """
+    assert locks.stale_locks(find_template()) == []
+
+
+def test_generated_project_gets_matching_lock():
+    """Test that the lock follows the answers and carries the project's normalized name."""
+    repo_dir = find_template()
+    with_docs = rendered_lock(repo_dir)
+    without_docs = rendered_lock(repo_dir, mkdocs="n", codecov="n")
+
+    for lock in (with_docs, without_docs):
+        assert 'name = "locked-project"\n' in lock
+        assert locks.LOCK_PLACEHOLDER not in lock
+    assert 'name = "mkdocs-material"' in with_docs
+    assert 'name = "pytest-cov"' in with_docs
+    assert 'name = "mkdocs-material"' not in without_docs
+    assert 'name = "pytest-cov"' not in without_docs
+
+
+def test_lock_index_names():
+    """Test that lock file names list the answers in a stable order."""
+    assert locks.lock_file_name({"mkdocs": "y", "codecov": "n"}) == "codecov-n_mkdocs-y.lock"
@@ -0,0 +1,94 @@
+"""Test suite for option-matrix verification.
+
+Renders every combination of the template's options in memory and checks the
+results, and makes sure the checks catch broken projects.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from uvi import render
+from uvi.batch import load_template_context, resolve_spec
+from uvi.matrix import (
+    VARIANTS,
+    check_tree,
+    combination_context,
+    fixed_context,
+    option_matrix,
+    toml_parser,
+    verify_matrix,
+)
+from uvi.template import find_template
+
+# Every combination of the nine y/n options, the three Dockerfile modes and the six licenses,
+# then the nine y/n options and the Dockerfile modes once more for each variant
+COMBINATIONS = 2**9 * 3 * 6 + len(VARIANTS) * 2**9 * 3
+
+
+@pytest.fixture(scope="module")
+def rendered():
+    """Render the default project in memory."""
+    repo_dir = find_template()
+    context = resolve_spec(load_template_context(repo_dir), {})
+    files = {file.path: file.content for file in render.render_files(repo_dir, context)}
+    return context["cookiecutter"], files
+
+
+def test_every_combination_is_sound():
+    """Test that all option combinations render to well-formed, consistent projects."""
+    checked, errors = verify_matrix()
+    assert checked == COMBINATIONS
+    assert errors == []
+
+
+def test_option_matrix():
+    """Test that only choice variables are varied."""
+    combinations = list(option_matrix(load_template_context(find_template())))
+    assert len(combinations) == COMBINATIONS
+    assert {"mkdocs": "n", "open_source_license": "Not open source"}.items() <= combinations[2**9 * 3 * 6 - 1].items()
+    assert {"mkdocs": "n", "_workspace": "member"}.items() <= combinations[-1].items()
+    assert "open_source_license" not in combinations[-1]
+    assert "project_name" not in combinations[0]
+
+
+def test_combination_context_matches_resolve_spec():
+    """Test that swapping choices into the resolved defaults equals resolving from scratch."""
+    context = load_template_context(find_template())
+    base = fixed_context(context)
+    assert base is not None
+    for spec in list(option_matrix(context))[::97]:
+        assert combination_context(base, spec) == resolve_spec(context, spec)
+
+    derived = {"cookiecutter": {"docs": ["y", "n"], "site": "{% if cookiecutter.docs == 'y' %}docs{% endif %}"}}
+    assert fixed_context(derived) is None
+
+
+def test_default_project_is_sound(rendered):
+    """Test that the checks accept the default project."""
+    assert check_tree(*rendered) == []
+
+
+def test_broken_project_is_reported(rendered):
+    """Test that each kind of problem is caught."""
+    answers, files = rendered
+    broken = dict(files)
+    broken["README.md"] += b"\nWelcome to {{ cookiecutter.project_name }}\n"
+    broken[".github/workflows/main.yml"] += b"\n  bad: [unclosed\n"
+    broken["pyproject.toml"] += b"\n[project\n"
+    broken["Makefile"] = broken["Makefile"].replace(b"docs-test:", b"docs-tests:")
+    broken["LICENSE_MIT"] = broken.pop("LICENSE")
+    del broken["Dockerfile"]
+
+    errors = "\n".join(check_tree(answers, broken))
+
+    assert "README.md:" in errors
+    assert "unrendered template markup" in errors
+    assert ".github/workflows/main.yml: invalid YAML" in errors
+    if toml_parser() is not None:  # TOML is only checked where tomllib or tomli exists
+        assert "pyproject.toml: invalid TOML" in errors
+    assert "Makefile: missing target 'docs-test'" in errors
+    assert ".PHONY target 'docs-test' is not defined" in errors
+    assert "LICENSE: missing" in errors
+    assert "LICENSE_MIT: unrenamed license file" in errors
+    assert "Dockerfile: missing" in errors
@@ -0,0 +1,95 @@
+"""Test suite for run profiling.
+
+Tests span recording, the JSON and Chrome trace-event outputs, and the
+--profile / UVI_PROFILE switches on a real batch run.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from uvi import cli, identity, profile
+
+RENDERED_FILES = ("README.md", "pyproject.toml")
+
+
+@pytest.fixture
+def profiler():
+    """Record spans for the duration of a test."""
+    active = profile.start()
+    yield active
+    profile.stop()
+
+
+def test_span_is_a_no_op_without_profile():
+    """Test that nothing is recorded unless a profile is active."""
+    assert profile.stop() is None
+    with profile.span("idle"):
+        pass
+    assert profile.span("idle") is profile.span("other", "render")
+
+
+def test_spans_and_summary(profiler):
+    """Test nested spans, per-file categories and the totals."""
+    with profile.span("generate"):
+        for path in RENDERED_FILES:
+            with profile.span(path, "render"):
+                pass
+    summary = profiler.summary()
+
+    assert [event["name"] for event in summary["events"]] == ["generate", "README.md", "pyproject.toml"]
+    assert summary["categories"]["render"]["count"] == len(RENDERED_FILES)
+    assert summary["stages"] == {
+        "generate": {"count": 1, "total_ms": pytest.approx(summary["events"][0]["duration_ms"])}
+    }
+    assert summary["total_ms"] >= summary["events"][0]["duration_ms"]
+
+
+def test_chrome_trace(profiler):
+    """Test that the trace uses complete events in microseconds plus thread names."""
+    with profile.span("prompt", path="x"):
+        pass
+    trace = profiler.chrome_trace()["traceEvents"]
+
+    complete = [event for event in trace if event["ph"] == "X"]
+    assert complete[0]["name"] == "prompt"
+    assert complete[0]["args"] == {"path": "x"}
+    assert complete[0]["dur"] == pytest.approx(profiler.events[0]["duration_ms"] * 1000)
+    assert {"ph": "M", "name": "thread_name"}.items() <= trace[-1].items()
+
+
+def test_subprocess_probes_are_timed(profiler, monkeypatch):
+    """Test that git fallbacks show up as subprocess spans."""
+    monkeypatch.setattr(subprocess, "check_output", lambda *args, **kwargs: "")
+    identity.load_git_config_via_subprocess()
+    assert [(event["name"], event["category"]) for event in profiler.events] == [("git config --list", "subprocess")]
+
+
+@pytest.mark.parametrize("use_env", [False, True])
+def test_cli_writes_profile(tmp_path, monkeypatch, use_env):
+    """Test that a profiled batch run records its stages, hooks and files."""
+    specs = tmp_path / "specs.jsonl"
+    specs.write_text('{"project_name": "profiled"}\n', encoding="utf-8")
+    profile_path = tmp_path / "profile.json"
+    argv = ["uvi", "--identity-cache-ttl", "0", "batch", str(specs), "-j", "1", "-o", str(tmp_path / "out")]
+    if use_env:
+        monkeypatch.setenv("UVI_PROFILE", str(profile_path))
+        monkeypatch.setenv("UVI_PROFILE_FORMAT", "chrome")
+    else:
+        argv[1:1] = ["--profile", str(profile_path)]
+    monkeypatch.setattr(sys, "argv", argv)
+
+    cli.main()
+
+    data = json.loads(profile_path.read_text(encoding="utf-8"))
+    if use_env:
+        names = {event["name"] for event in data["traceEvents"]}
+        assert {"identity", "batch", "pre_gen_project", "README.md"} <= names
+        return
+    assert {"identity", "template", "batch", "resolve-specs", "generate", "pre_gen_project"} <= set(data["stages"])
+    assert {"stage", "identity", "hook", "render", "write"} <= set(data["categories"])
+    assert data["argv"] == argv[1:]
@@ -0,0 +1,249 @@
+"""Test suite for manifest-aware rendering.
+
+Tests that ``uvi.render`` produces the same project as plain cookiecutter plus
+the post-generation hook, without ever reading the files the answers exclude,
+that the template hooks run in-process, that --dry-run previews a project
+without writing anything, and that --archive streams it into an archive.
+"""
+
+from __future__ import annotations
+
+import builtins
+import hashlib
+import io
+import json
+import os
+import stat
+import sys
+import tarfile
+import zipfile
+
+import pytest
+from cookiecutter.exceptions import FailedHookException
+from cookiecutter.main import cookiecutter
+
+from uvi import cli, hooks, render
+from uvi.batch import load_template_context, resolve_spec
+from uvi.template import find_template
+
+OPTIONS = [
+    {},
+    {
+        "include_github_actions": "n",
+        "mkdocs": "n",
+        "codecov": "n",
+        "dockerfile": "n",
+        "devcontainer": "n",
+        "open_source_license": "Not open source",
+    },
+    {"publish_to_pypi": "n", "mkdocs": "n", "open_source_license": "GNU General Public License v3"},
+    {"codecov": "n", "devcontainer": "y", "open_source_license": "BSD license"},
+]
+
+
+def snapshot(project_dir):
+    """Map every file below ``project_dir`` to its content and permission bits."""
+    files = {}
+    for root, _, names in os.walk(project_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            with open(path, "rb") as f:
+                files[os.path.relpath(path, project_dir)] = (f.read(), os.stat(path).st_mode)
+    return files
+
+
+@pytest.mark.parametrize("options", OPTIONS)
+def test_render_matches_cookiecutter(tmp_path, options):
+    """Test that the renderer's output is identical to cookiecutter's."""
+    repo_dir = find_template()
+    extra_context = {"project_name": "same-project", **options}
+    expected = cookiecutter(repo_dir, no_input=True, extra_context=extra_context, output_dir=str(tmp_path / "cc"))
+
+    context = resolve_spec(load_template_context(repo_dir), extra_context)
+    context["cookiecutter"]["_repo_dir"] = repo_dir
+    actual = render.generate_project(repo_dir, context, str(tmp_path / "uvi"))
+
+    files = snapshot(actual)
+    assert json.loads(files.pop(render.ANSWERS_FILE)[0])["answers"]["project_name"] == "same-project"
+    assert files == snapshot(expected)
+
+
+def test_excluded_files_are_never_opened(monkeypatch):
+    """Test that excluded template files are not read and the license is renamed in memory."""
+    repo_dir = find_template()
+    context = resolve_spec(
+        load_template_context(repo_dir),
+        {"mkdocs": "n", "dockerfile": "n", "open_source_license": "ISC license"},
+    )
+    opened = []
+    real_open = builtins.open
+
+    def recording_open(file, *args, **kwargs):
+        opened.append(os.path.basename(str(file)))
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", recording_open)
+    paths = [rendered.path for rendered in render.render_files(repo_dir, context)]
+
+    assert "LICENSE" in paths
+    assert not any(path.startswith(("LICENSE_", "docs/")) or path in ("mkdocs.yml", "Dockerfile") for path in paths)
+    assert not {"LICENSE_MIT", "LICENSE_GPL", "LICENSE_BSD", "mkdocs.yml", "Dockerfile", "index.md"} & set(opened)
+
+
+def test_manifest_rules():
+    """Test when/unless evaluation and directory prefixes."""
+    manifest = {
+        "exclude": [
+            {"paths": ["docs"], "unless": {"mkdocs": "y"}},
+            {"paths": ["release.yml"], "when": {"pypi": "n"}, "unless": {"mkdocs": "y"}},
+        ]
+    }
+    assert render.excluded_paths(manifest, {"mkdocs": "y", "pypi": "n"}) == set()
+    assert render.excluded_paths(manifest, {"mkdocs": "n", "pypi": "y"}) == {"docs"}
+    excluded = render.excluded_paths(manifest, {"mkdocs": "n", "pypi": "n"})
+    assert excluded == {"docs", "release.yml"}
+    assert render.is_excluded("docs/index.md", excluded)
+    assert not render.is_excluded("docsite/index.md", excluded)
+
+
+def test_hooks_run_in_process(tmp_path, monkeypatch):
+    """Test that declared hooks are called directly instead of as scripts."""
+    repo_dir = find_template()
+    context = resolve_spec(load_template_context(repo_dir), {"project_name": "in-process"})
+    context["cookiecutter"]["_repo_dir"] = repo_dir
+
+    def no_scripts(*args, **kwargs):
+        pytest.fail("hook script was run")
+
+    monkeypatch.setattr("cookiecutter.hooks.run_hook_from_repo_dir", no_scripts)
+    assert os.path.isfile(os.path.join(render.generate_project(repo_dir, context, str(tmp_path)), "LICENSE"))
+
+
+def test_in_process_hook_failure_removes_project(tmp_path):
+    """Test that a failing in-process hook stops generation and cleans up."""
+    repo_dir = find_template()
+    context = resolve_spec(load_template_context(repo_dir), {"project_name": "rejected"})
+    context["cookiecutter"]["_repo_dir"] = repo_dir
+    context["cookiecutter"]["project_slug"] = "not-a-slug"
+
+    with pytest.raises(FailedHookException, match="project slug not-a-slug"):
+        render.generate_project(repo_dir, context, str(tmp_path))
+    assert os.listdir(tmp_path) == []
+
+
+def test_validate_project_names():
+    """Test the name rules shared with hooks/pre_gen_project.py."""
+    hooks.validate_project_names({"project_name": "my-project", "project_slug": "my_project"})
+    with pytest.raises(ValueError, match="project name my_project"):
+        hooks.validate_project_names({"project_name": "my_project", "project_slug": "my_project"})
+    with pytest.raises(ValueError, match="project slug my-project"):
+        hooks.validate_project_names({"project_name": "my-project", "project_slug": "my-project"})
+
+
+def test_preview_matches_generated_project(tmp_path, monkeypatch):
+    """Test that the dry-run manifest describes exactly the files generation writes."""
+    monkeypatch.chdir(tmp_path)
+    repo_dir = find_template()
+    options = {"project_name": "previewed", "mkdocs": "n", "open_source_license": "ISC license"}
+
+    manifest = render.preview_project(repo_dir, extra_context=options, no_input=True)
+    assert os.listdir(tmp_path) == []
+
+    project_dir = render.create_project(repo_dir, extra_context=options, no_input=True, output_dir="out")
+    files = snapshot(project_dir)
+    assert manifest["project"] == "previewed"
+    assert manifest["file_count"] == len(files)
+    assert {entry["path"]: entry["sha256"] for entry in manifest["files"]} == {
+        path.replace(os.sep, "/"): hashlib.sha256(content).hexdigest() for path, (content, _) in files.items()
+    }
+
+
+def test_cli_dry_run_prints_only_json(tmp_path, monkeypatch, capsys):
+    """Test that --dry-run --format json keeps stdout machine-readable and writes nothing."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "answers.json").write_text('{"project_name": "portal-preview", "dockerfile": "n"}')
+    argv = ["uvi", "--identity-cache-ttl", "0", "--no-input", "--answers", "answers.json", "--dry-run"]
+    monkeypatch.setattr(sys, "argv", [*argv, "--format", "json"])
+
+    cli.main()
+
+    manifest = json.loads(capsys.readouterr().out)
+    paths = [entry["path"] for entry in manifest["files"]]
+    assert manifest["project"] == "portal-preview"
+    assert "portal_preview/__init__.py" in paths
+    assert "Dockerfile" not in paths
+    assert os.listdir(tmp_path) == ["answers.json"]
+
+
+def read_archive(archive_format, data):
+    """Map every file in an archive to its content and permission bits."""
+    if archive_format == "zip":
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            return {info.filename: (archive.read(info), info.external_attr >> 16) for info in archive.infolist()}
+    with tarfile.open(fileobj=io.BytesIO(data)) as archive:
+        return {member.name: (archive.extractfile(member).read(), member.mode) for member in archive.getmembers()}
+
+
+@pytest.mark.parametrize("archive_format", ["tar.gz", "zip"])
+def test_archive_matches_generated_project(tmp_path, monkeypatch, archive_format):
+    """Test that an archive holds exactly the files generation writes, below the project directory."""
+    monkeypatch.chdir(tmp_path)
+    repo_dir = find_template()
+    options = {"project_name": "archived", "dockerfile": "optimized", "open_source_license": "MIT license"}
+
+    name = render.archive_project(repo_dir, archive_format, extra_context=options, no_input=True)
+    assert name == "archived"
+    assert os.listdir(tmp_path) == [f"archived.{archive_format}"]
+
+    project_dir = render.create_project(repo_dir, extra_context=options, no_input=True, output_dir="out")
+    expected = {
+        f"archived/{path.replace(os.sep, '/')}": (content, stat.S_IMODE(mode))
+        for path, (content, mode) in snapshot(project_dir).items()
+    }
+    archived = read_archive(archive_format, (tmp_path / f"archived.{archive_format}").read_bytes())
+    assert {path: (content, stat.S_IMODE(mode)) for path, (content, mode) in archived.items()} == expected
+
+
+def test_cli_archive_streams_to_stdout(tmp_path, monkeypatch, capsysbinary):
+    """Test that --archive -o - writes only the archive to stdout and nothing to disk."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "answers.json").write_text('{"project_name": "streamed", "mkdocs": "n"}')
+    argv = ["uvi", "--identity-cache-ttl", "0", "--no-input", "--answers", "answers.json"]
+    monkeypatch.setattr(sys, "argv", [*argv, "--archive", "tar.gz", "-o", "-"])
+
+    cli.main()
+
+    captured = capsysbinary.readouterr()
+    files = read_archive("tar.gz", captured.out)
+    assert "streamed/pyproject.toml" in files
+    assert "streamed/uv.lock" in files
+    assert not any(path.startswith("streamed/docs/") for path in files)
+    assert b"Archived streamed to standard output" in captured.err
+    assert os.listdir(tmp_path) == ["answers.json"]
+
+
+def test_cli_rejects_archive_with_dry_run(monkeypatch):
+    """Test that --archive only combines with options that make sense for it."""
+    monkeypatch.setattr(sys, "argv", ["uvi", "--archive", "zip", "--dry-run"])
+    with pytest.raises(SystemExit):
+        cli.main()
+    monkeypatch.setattr(sys, "argv", ["uvi", "-o", "project.zip"])
+    with pytest.raises(SystemExit):
+        cli.main()
+
+
+def test_template_hash_follows_checkout_edits(tmp_path, monkeypatch):
+    """Test that a source checkout is hashed afresh, while a cached snapshot is hashed once."""
+    monkeypatch.setenv("UVI_CACHE_DIR", str(tmp_path / "cache"))
+    checkout = tmp_path / "checkout"
+    snapshot = tmp_path / "cache" / "templates" / "0-abc"
+    for repo_dir in (checkout, snapshot):
+        repo_dir.mkdir(parents=True)
+        (repo_dir / "cookiecutter.json").write_text('{"a": "1"}', encoding="utf-8")
+    before = render._template_sha256(str(checkout))
+    assert render._template_sha256(str(snapshot)) == before
+
+    for repo_dir in (checkout, snapshot):
+        (repo_dir / "cookiecutter.json").write_text('{"a": "2"}', encoding="utf-8")
+    assert render._template_sha256(str(checkout)) != before
+    assert render._template_sha256(str(snapshot)) == before
@@ -0,0 +1,215 @@
+"""Test suite for the generation daemon.
+
+Starts ``uvi serve``'s HTTP server on a free localhost port (and on a Unix
+socket) in a background thread, with a single in-process worker, and
+generates projects through it as archives and into directories.
+"""
+
+from __future__ import annotations
+
+import http.client
+import io
+import json
+import socket
+import stat
+import tarfile
+import threading
+import zipfile
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+
+from uvi.serve import GenerationService, make_server, parse_request
+from uvi.template import find_template
+
+# Permission bits of a Unix socket the server listens on
+SOCKET_MODE = 0o600
+
+
+def start(server):
+    """Serve in a background thread until the test is done."""
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+@pytest.fixture(scope="module")
+def output_root(tmp_path_factory):
+    """The directory the shared service may write projects into."""
+    return tmp_path_factory.mktemp("served")
+
+
+@pytest.fixture(scope="module")
+def service(output_root):
+    """A started service with one in-process worker, shared by the tests."""
+    service = GenerationService(
+        find_template(), {"author": "Served Author"}, jobs=1, max_pending=2, output_root=str(output_root)
+    )
+    service.start()
+    yield service
+    service.close()
+
+
+@pytest.fixture(scope="module")
+def port(service):
+    """Serve the shared service on a free localhost port."""
+    server = make_server(service, port=0)
+    start(server)
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def request(port, method, path, payload=None):
+    """Send a request and return the status, headers and body."""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    body = None if payload is None else json.dumps(payload).encode()
+    connection.request(method, path, body=body)
+    response = connection.getresponse()
+    return response.status, dict(response.getheaders()), response.read()
+
+
+def test_generate_tar_archive(port):
+    """Test that a project comes back as a tar.gz below its project directory."""
+    status, headers, body = request(
+        port, "POST", "/generate", {"answers": {"project_name": "served-app", "mkdocs": "n"}}
+    )
+
+    assert status == HTTPStatus.OK
+    assert headers["Content-Type"] == "application/gzip"
+    assert headers["Content-Disposition"] == 'attachment; filename="served-app.tar.gz"'
+    with tarfile.open(fileobj=io.BytesIO(body)) as archive:
+        names = archive.getnames()
+        pyproject = archive.extractfile("served-app/pyproject.toml").read().decode()
+        makefile = archive.getmember("served-app/Makefile")
+    assert {"served-app/uv.lock", "served-app/.uvi-answers.json", "served-app/served_app/foo.py"} <= set(names)
+    assert not any(name.startswith("served-app/docs/") for name in names)
+    assert "Served Author" in pyproject
+    assert makefile.mode == stat.S_IMODE(
+        (Path(find_template()) / "{{cookiecutter.project_name}}" / "Makefile").stat().st_mode
+    )
+
+
+def test_generate_zip_archive(port):
+    """Test the zip variant."""
+    status, headers, body = request(
+        port, "POST", "/generate", {"answers": {"project_name": "zipped"}, "archive": "zip"}
+    )
+
+    assert status == HTTPStatus.OK
+    assert headers["Content-Type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(body)) as archive:
+        assert archive.testzip() is None
+        assert "zipped/docs/index.md" in archive.namelist()
+
+
+def test_generate_into_directory(port, output_root):
+    """Test that output_dir writes the project, hooks included, and refuses to overwrite it."""
+    payload = {"answers": {"project_name": "written"}, "output_dir": str(output_root)}
+
+    status, _, body = request(port, "POST", "/generate", payload)
+    assert status == HTTPStatus.OK
+    assert json.loads(body) == {"project": str(output_root / "written")}
+    assert (output_root / "written" / "uv.lock").is_file()
+
+    status, _, body = request(port, "POST", "/generate", payload)
+    assert status == HTTPStatus.CONFLICT
+    assert "already exists" in json.loads(body)["error"]
+
+
+@pytest.mark.parametrize(
+    ("payload", "error"),
+    [
+        ({"answers": {"project_name": "bad_name"}}, "not a valid Python module name"),
+        ({"answers": {"no_such_variable": "x"}}, "unknown template variable"),
+        ({"archive": "rar"}, "unknown archive format"),
+        ({"output_dir": "relative"}, "absolute path"),
+        ({"output_dir": "/"}, "must be inside"),
+        ({"answer": {}}, "unknown request key"),
+    ],
+)
+def test_bad_requests(port, payload, error):
+    """Test that invalid requests get a 400 saying why."""
+    status, _, body = request(port, "POST", "/generate", payload)
+    assert status == HTTPStatus.BAD_REQUEST
+    assert error in json.loads(body)["error"]
+
+
+@pytest.mark.parametrize("length", ["abc", "-1"])
+def test_bad_content_length(port, length):
+    """Test that a malformed or negative Content-Length gets a 400 before the body is read."""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    connection.putrequest("POST", "/generate")
+    connection.putheader("Content-Length", length)
+    connection.endheaders()
+    response = connection.getresponse()
+    assert response.status == HTTPStatus.BAD_REQUEST
+    assert "Content-Length" in json.loads(response.read())["error"]
+
+
+def test_output_dir_needs_root(tmp_path):
+    """Test that output_dir is refused without an output root, and may not escape it."""
+    with pytest.raises(ValueError, match="--output-root"):
+        parse_request(json.dumps({"output_dir": str(tmp_path)}).encode())
+    (tmp_path / "root").mkdir()
+    (tmp_path / "root" / "link").symlink_to(tmp_path)
+    root = str(tmp_path / "root")
+    assert parse_request(json.dumps({"output_dir": f"{root}/sub"}).encode(), root)["output_dir"] == f"{root}/sub"
+    for escape in (f"{root}/../elsewhere", f"{root}/link", f"{root}-sibling"):
+        with pytest.raises(ValueError, match="must be inside"):
+            parse_request(json.dumps({"output_dir": escape}).encode(), root)
+
+
+def test_stats(port):
+    """Test that /stats counts requests and reports latencies."""
+    _, _, before = request(port, "GET", "/stats")
+    request(port, "POST", "/generate", {"answers": {"project_name": "counted"}})
+    request(port, "POST", "/generate", {"answers": {"project_name": "bad_name"}})
+    status, _, after = request(port, "GET", "/stats")
+
+    before, after = json.loads(before), json.loads(after)
+    assert status == HTTPStatus.OK
+    assert after["succeeded"] == before["succeeded"] + 1
+    assert after["failed"] == before["failed"] + 1
+    assert after["requests"] == after["succeeded"] + after["failed"]
+    assert after["in_flight"] == 0
+    assert after["requests_per_second"] > 0
+    assert 0 < after["latency_ms"]["p50"] <= after["latency_ms"]["max"]
+    assert request(port, "GET", "/nothing-here")[0] == HTTPStatus.NOT_FOUND
+
+
+def test_busy_service_rejects(service):
+    """Test that requests beyond the workers and the queue are turned away."""
+    held = [service._slots.acquire(blocking=False) for _ in range(3)]
+    try:
+        assert held == [True, True, True]
+        assert service.generate(parse_request(b"{}")).status == HTTPStatus.SERVICE_UNAVAILABLE
+    finally:
+        for _ in held:
+            service._slots.release()
+    assert service.stats.snapshot()["rejected"] == 1
+
+
+def test_unix_socket(service, tmp_path):
+    """Test serving on a Unix socket readable only by its owner."""
+    path = tmp_path / "uvi.sock"
+    server = make_server(service, socket_path=str(path))
+    start(server)
+    try:
+        assert path.stat().st_mode & 0o777 == SOCKET_MODE
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(path))
+            client.sendall(b"GET /stats HTTP/1.0\r\n\r\n")
+            response = b"".join(iter(lambda: client.recv(65536), b""))
+    finally:
+        server.shutdown()
+        server.server_close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.0 200")
+    assert "uptime_seconds" in json.loads(body)
+
+    path.unlink()
+    path.write_text("not a socket")
+    with pytest.raises(ValueError, match="not a socket"):
+        make_server(service, socket_path=str(path))
@@ -0,0 +1,38 @@
+"""Test suite for uvi CLI startup cost.
+
+Runs the CLI under ``python -X importtime`` to make sure the fast paths
+(--version and --help) never import the template rendering stack.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+from tests.utils import parse_importtime
+
+# Modules that are only needed to render a template
+HEAVY_MODULES = ("cookiecutter", "jinja2", "requests", "rich", "binaryornot", "arrow", "yaml")
+
+# Budget for importing uvi.cli, in microseconds. Generous enough for slow CI
+# machines and uncached bytecode; importing cookiecutter alone blows through it.
+UVI_CLI_IMPORT_BUDGET_US = 150_000
+
+
+@pytest.mark.parametrize("flag", ["--version", "--help"])
+def test_fast_paths_do_not_import_cookiecutter(flag):
+    """Test that --version and --help stay within the startup budget."""
+    code = f"import sys; sys.argv = ['uvi', {flag!r}]; from uvi.cli import main; main()"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = parse_importtime(result.stderr)
+
+    heavy = sorted(name for name in timings if name.split(".")[0] in HEAVY_MODULES)
+    assert heavy == []
+    assert timings["uvi.cli"] < UVI_CLI_IMPORT_BUDGET_US
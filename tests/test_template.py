@@ -0,0 +1,93 @@
+"""Test suite for template location and the template snapshot cache.
+
+Tests building the bundled snapshot, unpacking it into the content-addressed
+cache, and routing --template overrides through the same cache.
+"""
+
+from __future__ import annotations
+
+import os
+import tarfile
+
+import pytest
+
+from uvi import template
+from uvi.batch import load_template_context, resolve_spec
+from uvi.render import generate_project
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the uvi cache at an empty temporary directory."""
+    path = tmp_path / "cache"
+    monkeypatch.setenv("UVI_CACHE_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def installed_package(tmp_path, cache_dir, monkeypatch):
+    """Make the uvi package look like a wheel install carrying only the snapshot."""
+    package_dir = tmp_path / "site-packages" / "uvi"
+    template.build_snapshot(template.find_template(), str(package_dir))
+    monkeypatch.setattr(template, "__file__", str(package_dir / "template.py"))
+    return package_dir
+
+
+def test_snapshot_is_reproducible(tmp_path):
+    """Test that building twice yields identical archives and the recorded hash."""
+    repo_dir = template.find_template()
+    digest = template.build_snapshot(repo_dir, str(tmp_path / "a"))
+    assert template.build_snapshot(repo_dir, str(tmp_path / "b")) == digest
+    archive = (tmp_path / "a" / template.SNAPSHOT_ARCHIVE).read_bytes()
+    assert archive == (tmp_path / "b" / template.SNAPSHOT_ARCHIVE).read_bytes()
+
+    with tarfile.open(tmp_path / "a" / template.SNAPSHOT_ARCHIVE) as tar:
+        names = tar.getnames()
+    assert "cookiecutter.json" in names
+    assert "template-manifest.json" in names
+    assert "hooks/pre_gen_project.py" in names
+    assert "{{cookiecutter.project_name}}/LICENSE_MIT" in names
+    assert not any(name.startswith(("uvi/", "tests/", "docs/")) for name in names)
+
+
+def test_installed_package_uses_cached_snapshot(installed_package, cache_dir, tmp_path, monkeypatch):
+    """Test that a wheel install unpacks the snapshot once and renders from the cache."""
+    repo_dir = template.find_template()
+    assert repo_dir.startswith(str(cache_dir / "templates"))
+    assert os.path.isfile(os.path.join(repo_dir, "cookiecutter.json"))
+
+    def fail(*args, **kwargs):
+        pytest.fail("snapshot was unpacked again")
+
+    monkeypatch.setattr(template, "_install", fail)
+    assert template.find_template() == repo_dir
+
+    context = resolve_spec(load_template_context(repo_dir), {"project_name": "from-snapshot"})
+    context["cookiecutter"]["_repo_dir"] = repo_dir
+    project_dir = generate_project(repo_dir, context, str(tmp_path / "out"))
+    assert os.path.isfile(os.path.join(project_dir, "LICENSE"))
+
+
+def test_corrupt_snapshot_is_rejected(installed_package, cache_dir):
+    """Test that an archive not matching its recorded hash is never used."""
+    (installed_package / template.SNAPSHOT_INFO).write_text('{"sha256": "' + "0" * 64 + '"}')
+    with pytest.raises(ValueError, match="corrupt"):
+        template.find_template()
+    assert os.listdir(cache_dir / "templates") == []
+
+
+def test_template_override_goes_through_cache(tmp_path, cache_dir):
+    """Test that --template directories are cached by content hash."""
+    source = tmp_path / "my-template"
+    (source / "{{cookiecutter.project_name}}").mkdir(parents=True)
+    (source / "cookiecutter.json").write_text('{"project_name": "demo"}')
+    (source / "{{cookiecutter.project_name}}" / "README.md").write_text("# {{cookiecutter.project_name}}\n")
+    (source / "notes.txt").write_text("not part of the template")
+
+    first = template.resolve_template(str(source))
+    assert template.resolve_template(str(source)) == first
+    assert sorted(os.listdir(first)) == ["cookiecutter.json", "{{cookiecutter.project_name}}"]
+
+    (source / "cookiecutter.json").write_text('{"project_name": "changed"}')
+    assert template.resolve_template(str(source)) != first
+    assert template.resolve_template("gh:someone/template") == "gh:someone/template"
@@ -0,0 +1,152 @@
+"""Test suite for incremental project updates.
+
+Tests the three-way merge, and ``uvi update`` bringing a generated project
+up to date with a changed template while keeping the user's edits.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+from uvi import cli, template, update
+from uvi.batch import generate_project, load_template_context, resolve_spec
+from uvi.render import ANSWERS_FILE
+
+PROJECT_TEMPLATE = "{{cookiecutter.project_name}}"
+
+
+@pytest.fixture
+def templates(tmp_path, monkeypatch):
+    """Return a cached copy of the template and a changed version of it."""
+    monkeypatch.setenv("UVI_CACHE_DIR", str(tmp_path / "cache"))
+    old = template.cached_template(template.find_template())
+    new = tmp_path / "new-template"
+    shutil.copytree(old, new)
+    project = new / PROJECT_TEMPLATE
+
+    readme = (project / "README.md").read_text(encoding="utf-8")
+    (project / "README.md").write_text(readme + "\nA line added by the template.\n", encoding="utf-8")
+    tox = (project / "tox.ini").read_text(encoding="utf-8")
+    (project / "tox.ini").write_text(tox.replace("[tox]", "[tox]\n# template change"), encoding="utf-8")
+    makefile = (project / "Makefile").read_text(encoding="utf-8")
+    (project / "Makefile").write_text(makefile.replace("Creating virtual environment", "Syncing"), encoding="utf-8")
+    (project / "NOTICE").write_text("Generated by uvi\n", encoding="utf-8")
+    return old, str(new)
+
+
+def generate(repo_dir, output_dir, **answers):
+    """Generate a project with the given answers."""
+    context = resolve_spec(load_template_context(repo_dir), {"project_name": "updated-project", **answers})
+    return generate_project(repo_dir, context, str(output_dir))
+
+
+def read(path):
+    """Return a file's text."""
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_merge_combines_separate_edits():
+    """Test that non-overlapping edits merge and overlapping ones conflict."""
+    base = ["a\n", "b\n", "c\n", "d\n"]
+    merged = update.merge3(base, ["A\n", "b\n", "c\n", "d\n"], ["a\n", "b\n", "c\n", "D\n"])
+    assert [line for lines, _ in merged for line in lines] == ["A\n", "b\n", "c\n", "D\n"]
+    assert all(conflict is None for _, conflict in merged)
+
+    content, conflicted = update.merge_text(b"a\nb\n", b"a\nmine\n", b"a\ntheirs")
+    assert conflicted
+    assert content == b"a\n<<<<<<< current\nmine\n=======\ntheirs\n>>>>>>> template\n"
+
+
+def test_generation_records_answers(tmp_path):
+    """Test that generated projects carry their answers, template hash and file hashes."""
+    repo_dir = template.find_template()
+    project_dir = generate(repo_dir, tmp_path, mkdocs="n")
+
+    record = json.loads(read(os.path.join(project_dir, ANSWERS_FILE)))
+    assert record["answers"]["mkdocs"] == "n"
+    assert record["template_sha256"] == template.directory_digest(repo_dir)
+    assert "README.md" in record["files"]
+    assert "mkdocs.yml" not in record["files"]
+
+
+def test_update_writes_only_changes(tmp_path, templates):
+    """Test updating: untouched files are replaced, edited ones merged, the rest left alone."""
+    old, new = templates
+    project_dir = generate(old, tmp_path / "out")
+    readme = os.path.join(project_dir, "README.md")
+    makefile = os.path.join(project_dir, "Makefile")
+    with open(readme, "r+", encoding="utf-8") as f:
+        content = f.read()
+        f.seek(0)
+        f.write("My own introduction.\n" + content)
+    edited = read(makefile).replace("Creating virtual environment", "Making the venv")
+    with open(makefile, "w", encoding="utf-8") as f:
+        f.write(edited)
+    pyproject_mtime = os.stat(os.path.join(project_dir, "pyproject.toml")).st_mtime_ns
+
+    changes, _ = update.plan_update(project_dir, new)
+    assert {change.path: change.action for change in changes} == {
+        "Makefile": "conflict",
+        "NOTICE": "create",
+        "README.md": "merge",
+        "tox.ini": "update",
+    }
+
+    assert update.run_update(project_dir, new) == 1
+    assert read(readme).startswith("My own introduction.\n")
+    assert read(readme).endswith("A line added by the template.\n")
+    assert '<<<<<<< current\n\t@echo "🚀 Making the venv' in read(makefile)
+    assert "# template change" in read(os.path.join(project_dir, "tox.ini"))
+    assert os.path.isfile(os.path.join(project_dir, "NOTICE"))
+    assert os.stat(os.path.join(project_dir, "pyproject.toml")).st_mtime_ns == pyproject_mtime
+
+    record = json.loads(read(os.path.join(project_dir, ANSWERS_FILE)))
+    assert record["template_sha256"] == template.directory_digest(new)
+    assert update.plan_update(project_dir, new)[0] == []
+
+
+def test_update_with_changed_answers(tmp_path):
+    """Test that switching an option off removes its files unless they were edited."""
+    repo_dir = template.find_template()
+    project_dir = generate(repo_dir, tmp_path)
+    with open(os.path.join(project_dir, "mkdocs.yml"), "a", encoding="utf-8") as f:
+        f.write("# customised\n")
+
+    update.run_update(project_dir, repo_dir, answers={"mkdocs": "n"})
+
+    assert not os.path.exists(os.path.join(project_dir, "docs"))
+    assert os.path.isfile(os.path.join(project_dir, "mkdocs.yml"))
+    assert json.loads(read(os.path.join(project_dir, ANSWERS_FILE)))["answers"]["mkdocs"] == "n"
+
+
+def test_cli_update_dry_run(tmp_path, templates, monkeypatch, capsys):
+    """Test the documented ``uvi update PROJECT --dry-run``: options after the subcommand are honoured."""
+    old, new = templates
+    project_dir = generate(old, tmp_path / "out")
+    readme = read(os.path.join(project_dir, "README.md"))
+    (tmp_path / "answers.json").write_text('{"mkdocs": "n"}', encoding="utf-8")
+    argv = ["uvi", "--identity-cache-ttl", "0", "--template", new]
+    monkeypatch.setattr(
+        sys, "argv", [*argv, "update", project_dir, "--dry-run", "--answers", str(tmp_path / "answers.json")]
+    )
+
+    cli.main()
+
+    out = capsys.readouterr().out
+    assert "  update  tox.ini" in out
+    assert "  remove  mkdocs.yml" in out
+    assert "file(s) would change; nothing was written" in out
+    assert read(os.path.join(project_dir, "README.md")) == readme
+    assert os.path.isfile(os.path.join(project_dir, "mkdocs.yml"))
+
+
+def test_update_needs_answers_file(tmp_path):
+    """Test that projects not generated by uvi are refused."""
+    with pytest.raises(ValueError, match="only projects generated by uvi"):
+        update.plan_update(str(tmp_path))
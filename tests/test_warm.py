@@ -0,0 +1,95 @@
+"""Test suite for dependency cache seeding.
+
+Tests which dependency sets ``uvi cache warm`` derives from the template, and
+that each is synced once, with a stand-in for ``uv sync`` so no packages are
+downloaded.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+from uvi import cli, warm
+from uvi.batch import generate_project, load_template_context, resolve_spec
+from uvi.template import find_template
+
+# deptry, codecov, mkdocs and benchmarks each add dependencies
+DEPENDENCY_SETS = 2**4
+
+
+@pytest.fixture
+def fake_uv(tmp_path, monkeypatch):
+    """Record ``uv sync`` calls instead of running them, and isolate the uvi cache."""
+    monkeypatch.setenv("UVI_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("UV_CACHE_DIR", raising=False)
+    monkeypatch.setattr(warm.shutil, "which", lambda command: f"/usr/bin/{command}")
+    synced = []
+
+    def run(command, cwd, **kwargs):
+        with open(f"{cwd}/pyproject.toml", encoding="utf-8") as pyproject:
+            synced.append((command, pyproject.read(), kwargs["env"].get("UV_CACHE_DIR")))
+        return subprocess.CompletedProcess(command, 0, "", "")
+
+    monkeypatch.setattr(warm.subprocess, "run", run)
+    return synced
+
+
+def test_dependency_sets():
+    """Test that the switches come from pyproject.toml and are combined."""
+    repo_dir = find_template()
+    context = load_template_context(repo_dir)
+    assert warm.dependency_switches(repo_dir, context) == ["benchmarks", "codecov", "deptry", "mkdocs"]
+    assert len(warm.dependency_sets(repo_dir, context)) == DEPENDENCY_SETS
+    assert list(warm.dependency_sets(repo_dir, context, {"mkdocs": "n"})) == [
+        "benchmarks=n,codecov=y,deptry=y,mkdocs=n"
+    ]
+
+
+def test_warm_syncs_each_set_once(fake_uv, tmp_path):
+    """Test that every set is synced with its own dependencies, and only once."""
+    results = warm.warm_cache(uv_cache_dir=str(tmp_path / "uv"))
+
+    assert [result.status for result in results] == ["ok"] * DEPENDENCY_SETS
+    assert len(fake_uv) == DEPENDENCY_SETS
+    assert all(command == ["uv", "sync", "--all-groups"] for command, _, _ in fake_uv)
+    assert {cache for _, _, cache in fake_uv} == {str(tmp_path / "uv")}
+    assert sum('"deptry' in pyproject for _, pyproject, _ in fake_uv) == DEPENDENCY_SETS // 2
+    assert sum('"mkdocs-material' in pyproject for _, pyproject, _ in fake_uv) == DEPENDENCY_SETS // 2
+
+    again = warm.warm_cache(uv_cache_dir=str(tmp_path / "uv"))
+    assert [result.status for result in again] == ["cached"] * DEPENDENCY_SETS
+    assert len(fake_uv) == DEPENDENCY_SETS
+    warm.warm_cache(uv_cache_dir=str(tmp_path / "other-uv"), answers={})
+    assert len(fake_uv) == DEPENDENCY_SETS + 1
+
+
+def test_generated_project_knows_it_is_warm(fake_uv, tmp_path):
+    """Test that a project is recognised as cached only for the set that was warmed."""
+    repo_dir = find_template()
+    context = load_template_context(repo_dir)
+    with_docs = generate_project(repo_dir, resolve_spec(context, {"project_name": "docs"}), str(tmp_path))
+    without_docs = generate_project(
+        repo_dir, resolve_spec(context, {"project_name": "no-docs", "mkdocs": "n"}), str(tmp_path)
+    )
+
+    warm.warm_cache(answers={"mkdocs": "n"})
+
+    assert warm.is_warm(without_docs, repo_dir)
+    assert not warm.is_warm(with_docs, repo_dir)
+    assert not warm.is_warm(without_docs, repo_dir, uv_cache_dir=str(tmp_path / "elsewhere"))
+
+
+def test_cli_cache_warm_with_answers(fake_uv, tmp_path, monkeypatch, capsys):
+    """Test that ``uvi cache warm --answers FILE`` syncs only the set the answers select."""
+    (tmp_path / "answers.json").write_text('{"mkdocs": "n"}', encoding="utf-8")
+    argv = ["uvi", "--identity-cache-ttl", "0", "cache", "warm", "--answers", str(tmp_path / "answers.json")]
+    monkeypatch.setattr(sys, "argv", argv)
+    monkeypatch.setattr(cli, "get_user_info", lambda **kwargs: pytest.fail("identity is unused by cache warm"))
+
+    cli.main()
+
+    assert len(fake_uv) == 1
+    assert '"mkdocs-material' not in fake_uv[0][1]
@@ -0,0 +1,110 @@
+"""Test suite for uv workspace generation.
+
+Generates a workspace root with two member packages and checks that the
+shared tooling sits in the root only, that the derived ``uv.lock`` is the one
+``uv lock`` would write, and that the members' tests run from one environment.
+"""
+
+from __future__ import annotations
+
+import os
+import shlex
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from uvi import cli
+from uvi.workspace import generate_workspace
+
+MEMBERS = ["acme-core", "acme-api"]
+
+
+@pytest.fixture(scope="module")
+def workspace(tmp_path_factory):
+    """Generate a workspace once; tests that run tools in it share its environment."""
+    path = generate_workspace(
+        "acme",
+        MEMBERS,
+        output_dir=str(tmp_path_factory.mktemp("workspace")),
+        answers={"ci_test_shards": "2", "benchmarks": "y", "importtime": "y"},
+    )
+    return Path(path)
+
+
+def test_workspace_layout(workspace):
+    """Test that the tooling lives in the root and each member keeps only its package."""
+    pyproject = (workspace / "pyproject.toml").read_text(encoding="utf-8")
+    assert 'dependencies = [\n  "acme-core",\n  "acme-api",\n]' in pyproject
+    assert 'acme-api = { workspace = true }\n\n[tool.uv.workspace]\nmembers = ["packages/*"]' in pyproject
+    assert 'files = ["packages/acme-core/acme_core", "packages/acme-api/acme_api"]' in pyproject
+    assert "[dependency-groups]" in pyproject
+    assert "[build-system]" not in pyproject
+    assert "[tool.importtime]" not in pyproject
+
+    assert not (workspace / "acme").exists()
+    assert not (workspace / "Dockerfile").exists()
+    assert os.listdir(workspace / "tests") == ["conftest.py"]
+    assert os.listdir(workspace / "benchmarks") == ["compare.py"]
+    for member in MEMBERS:
+        member_dir = workspace / "packages" / member
+        slug = member.replace("-", "_")
+        assert sorted(os.listdir(member_dir)) == sorted(
+            ["LICENSE", "README.md", "benchmarks", "pyproject.toml", slug, "tests"]
+        )
+        member_pyproject = (member_dir / "pyproject.toml").read_text(encoding="utf-8")
+        assert f'name = "{member}"' in member_pyproject
+        assert f'packages = ["{slug}"]' in member_pyproject
+        assert "[dependency-groups]" not in member_pyproject
+        assert "[tool.ruff]" not in member_pyproject
+
+
+def test_workspace_shares_one_lock_and_environment(workspace):
+    """Test that the derived lock is current and one sync runs every member's tests."""
+    assert subprocess.check_call(shlex.split("uv lock --locked --offline"), cwd=workspace) == 0
+    subprocess.check_call(shlex.split("uv sync"), cwd=workspace)
+    assert not list(workspace.glob("packages/*/uv.lock"))
+    assert not list(workspace.glob("packages/*/.venv"))
+
+    completed = subprocess.run(
+        shlex.split("uv run python -m pytest -q -p no:cacheprovider --shard-id=1 --num-shards=2"),
+        cwd=workspace,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert completed.returncode == 0, completed.stdout + completed.stderr
+    assert "3 deselected" in completed.stdout
+
+
+@pytest.mark.parametrize(
+    ("name", "members", "error"),
+    [
+        ("acme", [], "at least one member"),
+        ("acme", ["acme-core", "acme-core"], "used twice"),
+        ("acme", ["Acme"], "clashes with 'acme'"),
+        ("acme", ["pytest"], "clash with the workspace's dependencies: pytest"),
+        ("acme", ["bad_name"], "not a valid Python module name"),
+    ],
+)
+def test_invalid_workspaces(tmp_path, name, members, error):
+    """Test that bad names are refused and leave nothing behind."""
+    with pytest.raises(ValueError, match=error):
+        generate_workspace(name, members, output_dir=str(tmp_path))
+    assert os.listdir(tmp_path) == []
+
+
+def test_cli_workspace(tmp_path, monkeypatch, capsys):
+    """Test the documented ``uvi workspace NAME MEMBER --answers FILE``: --answers applies to every project."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "answers.json").write_text('{"mkdocs": "n", "open_source_license": "Not open source"}')
+    argv = ["uvi", "--identity-cache-ttl", "0", "workspace", "shop", "cart"]
+    monkeypatch.setattr(sys, "argv", [*argv, "--answers", "answers.json", "--no-input", "-o", "out"])
+
+    cli.main()
+
+    assert "Created workspace shop with 1 package(s)" in capsys.readouterr().out
+    assert not (tmp_path / "out" / "shop" / "docs").exists()
+    assert not (tmp_path / "out" / "shop" / "LICENSE").exists()
+    assert (tmp_path / "out" / "shop" / "packages" / "cart" / "cart" / "foo.py").is_file()
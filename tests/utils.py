@@ -68,3 +68,21 @@ def file_contains_text(file: str, text: str) -> bool:
     """
     with open(file, encoding="utf-8") as f:
         return f.read().find(text) != -1
+
+
+def parse_importtime(output: str) -> dict[str, int]:
+    """Parse the stderr of ``python -X importtime`` into cumulative timings.
+
+    Args:
+        output: The captured stderr
+
+    Returns:
+        dict: Mapping of module name to cumulative import time in microseconds
+    """
+    timings = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
@@ -0,0 +1,219 @@
+"""Post-generation bootstrap for UVI.
+
+``uvi --bootstrap`` takes a freshly generated project to "ready to commit":
+a git repository, a synced uv environment and installed pre-commit hooks.
+Instead of running the steps one after another, they form a small task
+graph and every task starts as soon as the tasks it needs have finished:
+
+- ``git init`` and ``uv sync`` start together
+- ``pre-commit install-hooks`` builds the hook environments as soon as the
+  repository exists, using ``uvx`` so it does not wait for ``uv sync``; the
+  tool is pinned to the version in the project's ``uv.lock``, so it comes
+  from the same cache as the project's dependencies
+- ``pre-commit install`` writes the git hook script once both are done
+
+Progress is printed as tasks start and finish, followed by a per-task timing
+summary. A failed task skips the tasks that need it; the others carry on.
+"""
+
+from __future__ import annotations
+
+import re
+import shutil
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import NamedTuple
+
+from .profile import span
+
+
+class Task(NamedTuple):
+    """A command to run in the project, and the tasks that must finish first."""
+
+    name: str
+    command: tuple[str, ...]
+    needs: tuple[str, ...] = ()
+
+
+class TaskResult(NamedTuple):
+    """Outcome of a task: ``ok``, ``failed`` or ``skipped``, with timing and output."""
+
+    name: str
+    status: str
+    seconds: float
+    output: str
+
+
+BOOTSTRAP_TASKS = (
+    Task("git init", ("git", "init", "-b", "main")),
+    Task("uv sync", ("uv", "sync")),
+    Task("pre-commit install-hooks", ("uvx", "pre-commit", "install-hooks"), needs=("git init",)),
+    Task("pre-commit install", ("uv", "run", "pre-commit", "install"), needs=("git init", "uv sync")),
+)
+
+
+def locked_version(project_dir: str, package: str) -> str | None:
+    """Return the version of a package pinned in a project's ``uv.lock``.
+
+    Args:
+        project_dir: The project
+        package: Normalised package name
+
+    Returns:
+        The locked version, or None without a lock file or an entry for the package
+    """
+    try:
+        lock = Path(project_dir, "uv.lock").read_text(encoding="utf-8")
+    except OSError:
+        return None
+    # uv writes every package table as [[package]], then its name, then its version
+    match = re.search(rf'^\[\[package\]\]\nname = "{re.escape(package)}"\nversion = "([^"]+)"$', lock, re.MULTILINE)
+    return match[1] if match else None
+
+
+def pin_tasks(tasks: Sequence[Task], project_dir: str, offline: bool = False) -> list[Task]:
+    """Adapt the uv commands of a task graph to a project.
+
+    Tools run with ``uvx`` are pinned to the version in the project's lock, so
+    they match the project's environment and resolve without the network once
+    the lock's packages are cached. With ``offline``, ``uv sync`` and ``uvx``
+    use uv's cache only.
+
+    Args:
+        tasks: The task graph
+        project_dir: The generated project
+        offline: Install dependencies and tools from uv's cache only
+
+    Returns:
+        The tasks with adapted commands
+    """
+    pinned = []
+    for task in tasks:
+        command = task.command
+        if command[:2] == ("uv", "sync") and offline:
+            command = (*command, "--offline")
+        elif command[0] == "uvx" and len(command) > 1:
+            options = ("--offline",) if offline else ()
+            version = locked_version(project_dir, command[1])
+            if version is not None:
+                options = (*options, "--from", f"{command[1]}=={version}")
+            command = ("uvx", *options, *command[1:])
+        pinned.append(task._replace(command=command))
+    return pinned
+
+
+def _run_task(task: Task, cwd: str) -> TaskResult:
+    """Run one task's command, capturing its output."""
+    if shutil.which(task.command[0]) is None:
+        return TaskResult(task.name, "skipped", 0.0, f"{task.command[0]} not found on PATH")
+    start = time.perf_counter()
+    with span(task.name, "subprocess", command=" ".join(task.command)):
+        completed = subprocess.run(  # noqa: S603 - fixed commands from BOOTSTRAP_TASKS
+            task.command,
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    status = "ok" if completed.returncode == 0 else "failed"
+    return TaskResult(task.name, status, time.perf_counter() - start, completed.stdout + completed.stderr)
+
+
+def run_tasks(
+    tasks: Sequence[Task],
+    cwd: str,
+    report: Callable[[str], None] = print,
+) -> list[TaskResult]:
+    """Run a task graph, starting each task once the tasks it needs have succeeded.
+
+    Args:
+        tasks: The tasks; ``needs`` must name tasks earlier in the sequence
+        cwd: Directory to run the commands in
+        report: Called with a progress line as tasks start and finish
+
+    Returns:
+        A result per task, in the order of ``tasks``
+
+    Raises:
+        ValueError: If a task needs a task that does not come before it
+    """
+    seen: set[str] = set()
+    for task in tasks:
+        unknown = [name for name in task.needs if name not in seen]
+        if unknown:
+            msg = f"task {task.name!r} needs unknown or later task(s): {', '.join(unknown)}"
+            raise ValueError(msg)
+        seen.add(task.name)
+
+    results: dict[str, TaskResult] = {}
+    pending = list(tasks)
+    running: dict[Future[TaskResult], Task] = {}
+    with ThreadPoolExecutor(max_workers=max(1, len(tasks))) as pool:
+        while pending or running:
+            for task in list(pending):
+                failed = [name for name in task.needs if name in results and results[name].status != "ok"]
+                if failed:
+                    pending.remove(task)
+                    results[task.name] = TaskResult(task.name, "skipped", 0.0, f"needs {', '.join(failed)}")
+                    report(f"  skipped  {task.name} (needs {', '.join(failed)})")
+                elif all(name in results for name in task.needs):
+                    pending.remove(task)
+                    report(f"  started  {task.name}")
+                    running[pool.submit(_run_task, task, cwd)] = task
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                running.pop(future)
+                result = future.result()
+                results[result.name] = result
+                detail = f"{result.seconds:.2f}s" if result.status != "skipped" else result.output
+                report(f"{result.status:>9}  {result.name} ({detail})")
+    return [results[task.name] for task in tasks]
+
+
+def format_summary(results: Sequence[TaskResult], elapsed: float) -> str:
+    """Render the per-task timing summary.
+
+    Args:
+        results: Results from ``run_tasks``
+        elapsed: Wall-clock time of the whole graph, in seconds
+
+    Returns:
+        The summary, including how long running the tasks in sequence would have taken
+    """
+    width = max(len(result.name) for result in results)
+    lines = [
+        f"Bootstrap finished in {elapsed:.2f}s "
+        f"({sum(result.seconds for result in results):.2f}s of work across {len(results)} tasks)"
+    ]
+    lines.extend(f"  {result.name:<{width}}  {result.seconds:6.2f}s  {result.status}" for result in results)
+    return "\n".join(lines)
+
+
+def bootstrap(project_dir: str, tasks: Sequence[Task] = BOOTSTRAP_TASKS, offline: bool = False) -> int:
+    """Bootstrap a generated project and print progress and a timing summary.
+
+    Args:
+        project_dir: The generated project
+        tasks: The task graph to run
+        offline: Install dependencies from uv's cache only (see ``uvi cache warm``)
+
+    Returns:
+        Number of tasks that failed or were skipped
+    """
+    print(f"Bootstrapping {project_dir}{' (dependencies from the local cache)' if offline else ''}")
+    tasks = pin_tasks(tasks, project_dir, offline)
+    start = time.perf_counter()
+    with span("bootstrap", project=project_dir):
+        results = run_tasks(tasks, project_dir)
+    print(format_summary(results, time.perf_counter() - start))
+    problems = [result for result in results if result.status != "ok"]
+    for result in problems:
+        if result.status == "failed":
+            print(f"\n{result.name} failed:\n{result.output.rstrip()}", file=sys.stderr)
+    return len(problems)
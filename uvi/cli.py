@@ -15,286 +15,645 @@ Features:
     - Implements UV package management
 
 Usage:
-    uvi [--version]
+    uvi [--version] [--identity-timeout DURATION] [--refresh-identity] [--template PATH]
+        [--profile PATH] [--profile-format {json,chrome}]
+        [--no-input] [--answers FILE] [--dry-run [--format {text,json}]] [--bootstrap]
+        [--archive {tar.gz,zip} [-o PATH]]
+    uvi batch SPECS [--jobs N] [--output-dir DIR]
+    uvi workspace NAME MEMBER [MEMBER ...] [--answers FILE] [--no-input] [--output-dir DIR]
+    uvi verify-matrix [--jobs N]
+    uvi update [PROJECT] [--answers FILE] [--dry-run]
+    uvi cache warm [--answers FILE] [--uv-cache-dir DIR] [--refresh] [--jobs N]
+    uvi serve [--host HOST] [--port PORT | --socket PATH] [--jobs N] [--max-pending N] [--output-root DIR]
 
 The CLI will interactively prompt for project configuration options unless
---no-input is specified. It uses either a local template (when installed as
-a package) or fetches from the GitHub repository.
+--no-input is specified. It uses the template snapshot bundled with the
+package (or the template in a source checkout) and never needs the network.
 
 Example:
     $ uvi  # Launches interactive project creation
     $ uvi --version  # Displays the current version
+    $ uvi --bootstrap  # Creates a project, then sets up git, uv and pre-commit in parallel
+    $ uvi --no-input --answers answers.json --dry-run --format json  # Previews the files without writing them
+    $ uvi --no-input --archive tar.gz -o - | curl --data-binary @- "$IMPORT_URL"  # Streams the project without writing it
+    $ uvi batch specs.jsonl --jobs 8 --output-dir services  # Generates one project per spec
+    $ uvi workspace acme acme-core acme-api  # Generates a uv workspace with two packages and one lock
+    $ uvi verify-matrix  # Renders and checks every option combination in memory
+    $ uvi update my-project  # Brings a generated project up to date with the template
+    $ uvi cache warm  # Caches every dependency set so new projects can 'uv sync --offline'
+    $ uvi serve --socket /run/uvi.sock  # Keeps the template loaded and generates projects on request
 """
 
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import os
-import shutil
 import subprocess
 import sys
-from typing import Any
+from typing import Any, TextIO
+
+from . import __version__, profile
+from .cache import (
+    DEFAULT_IDENTITY_CACHE_TTL,
+    PARTIAL_IDENTITY_CACHE_TTL,
+    identity_fingerprint,
+    load_cached_identity,
+    store_cached_identity,
+)
+from .identity import discover_identity, github_handle_from_email
+from .profile import PROFILE_FORMATS, span
+from .template import resolve_template
+
+# Generic defaults used when no identity source has a value
+DEFAULT_USER_INFO = {
+    "author": "Your Name",
+    "email": "your.email@example.com",
+    "author_github_handle": "your-github-handle",
+}
+
+# How each identity field is described in progress messages
+FIELD_LABELS = {"author": "name", "email": "email", "author_github_handle": "GitHub handle"}
+
+# Total time budget for identity discovery, in seconds
+DEFAULT_IDENTITY_TIMEOUT = 2.0
+
+# Output formats of --dry-run
+DRY_RUN_FORMATS = ("text", "json")
+
+# Formats of --archive; the same as uvi.archive.ARCHIVE_FORMATS, which is only imported to write one
+ARCHIVE_FORMATS = ("tar.gz", "zip")
+
+# Duration suffixes accepted on the command line, longest first so "ms" wins over "s"
+DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0, "d": 86400.0}
+
+
+def get_user_info(
+    timeout: float = DEFAULT_IDENTITY_TIMEOUT,
+    refresh: bool = False,
+    cache_ttl: float = DEFAULT_IDENTITY_CACHE_TTL,
+) -> dict[str, str]:
+    """Get user information from various sources.
+
+    A previously resolved identity is reused from the on-disk cache while the
+    git and GitHub CLI config files it was derived from are unchanged and it is
+    younger than ``cache_ttl``, or than a few minutes if some sources timed
+    out. Otherwise the GitHub API, the local git config, the user-wide git
+    config and the GitHub CLI login are queried concurrently,
+    and waiting stops once every field has its best available value or the time
+    budget runs out. Preference order is:
+    1. The GitHub API profile of the logged-in GitHub CLI user for name and email
+    2. Repository-local git config, then global git config, for what it leaves out
+    3. The GitHub CLI login for the handle
+    4. Generic defaults as a last resort
 
-from cookiecutter.main import cookiecutter
+    Args:
+        timeout: Total time budget for identity discovery, in seconds
+        refresh: Ignore any cached identity and resolve it again
+        cache_ttl: Maximum age of a cached identity in seconds (0 disables the cache)
+
+    Returns:
+        Dict containing user information from the best available source
+    """
+    if not refresh:
+        with span("identity-cache"):
+            cached = load_cached_identity(cache_ttl)
+        if cached is not None:
+            print("Using cached user information (run with --refresh-identity to update it).")
+            return {**DEFAULT_USER_INFO, **cached}
+
+    with span("identity-discovery"):
+        fingerprint = identity_fingerprint()
+        result = discover_identity(timeout)
+    context = dict(DEFAULT_USER_INFO)
+
+    for field, (source, value) in result.values.items():
+        context[field] = value
+        print(f"Using {source} {FIELD_LABELS[field]}: {value}")
+
+    if "author_github_handle" not in result.values:
+        # Try to extract GitHub handle from email (simple heuristic)
+        handle = github_handle_from_email(context["email"])
+        if handle:
+            context["author_github_handle"] = handle
+            print(f"Extracted GitHub handle from email: {handle}")
+
+    if result.timed_out:
+        print(f"Identity sources timed out after {timeout * 1000:.0f}ms: {', '.join(result.timed_out)}")
+    if not result.values:
+        print("No user information found. Using generic defaults.")
+
+    # A partial answer caused by a timeout is kept briefly, so the slow source is asked again soon
+    if cache_ttl > 0:
+        store_cached_identity(context, fingerprint, ttl=PARTIAL_IDENTITY_CACHE_TTL if result.timed_out else None)
 
-from . import __version__
+    return context
 
 
-def _try_command_run(command: str, arg: str) -> bool:
-    """Try to run a command with a given argument to check if it's available.
+def parse_duration(value: str) -> float:
+    """Parse a duration such as "300ms", "2s", "12h" or "1.5" into seconds.
 
     Args:
-        command: The command to check
-        arg: The argument to pass to the command (e.g., "--version")
+        value: The duration; bare numbers are seconds
 
     Returns:
-        True if the command is available, False if it raised an exception
+        The duration in seconds
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a non-negative duration
     """
-    # These subprocess calls are safe as they only use parameters
-    # controlled by our code, not user input
+    text = value.strip().lower()
+    scale = 1.0
+    for suffix, multiplier in DURATION_UNITS.items():
+        if text.endswith(suffix):
+            text, scale = text[: -len(suffix)], multiplier
+            break
     try:
-        subprocess.run(  # noqa: S603
-            [command, arg],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            check=False,
-        )
-    except (subprocess.SubprocessError, FileNotFoundError):
-        # Command not available or execution failed
-        return False
-    else:
-        # If we get here without exception, command is available
-        return True
+        seconds = float(text) * scale
+    except ValueError:
+        seconds = -1.0
+    if seconds < 0:
+        msg = f"invalid duration {value!r}; use e.g. 300ms or 2s"
+        raise argparse.ArgumentTypeError(msg)
+    return seconds
 
 
-def is_command_available(command: str) -> bool:
-    """Check if a command is available in the system.
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser.
 
-    Works cross-platform by first using shutil.which, then trying to run the command.
+    Returns:
+        The configured argument parser
+    """
+    parser = argparse.ArgumentParser(description="Create a new Python project using uvi template")
+    parser.add_argument("--version", action="version", version=f"uvi {__version__}")
+    parser.add_argument(
+        "--identity-timeout",
+        type=parse_duration,
+        default=DEFAULT_IDENTITY_TIMEOUT,
+        metavar="DURATION",
+        help="time budget for detecting author details, e.g. 300ms or 2s (default: %(default)ss)",
+    )
+    parser.add_argument(
+        "--refresh-identity",
+        action="store_true",
+        help="ignore cached author details and detect them again",
+    )
+    parser.add_argument(
+        "--identity-cache-ttl",
+        type=parse_duration,
+        default=DEFAULT_IDENTITY_CACHE_TTL,
+        metavar="DURATION",
+        help="how long detected author details are reused, e.g. 12h; 0 disables the cache (default: %(default)ss)",
+    )
+
+    parser.add_argument(
+        "--template",
+        default=None,
+        metavar="PATH",
+        help="template directory or snapshot archive to use instead of the bundled one",
+    )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        metavar="PATH",
+        help="write a timing profile of the run to PATH (also enabled by UVI_PROFILE=PATH)",
+    )
+    parser.add_argument(
+        "--profile-format",
+        choices=PROFILE_FORMATS,
+        default=None,
+        help="profile format: json summary or chrome trace events (default: json, or UVI_PROFILE_FORMAT)",
+    )
+
+    parser.add_argument(
+        "--no-input",
+        action="store_true",
+        help="do not prompt; use the template defaults, detected author details and --answers",
+    )
+    parser.add_argument(
+        "--answers",
+        default=None,
+        metavar="FILE",
+        help='JSON object of template variables to use instead of prompting for them, or "-" for stdin',
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="render the project in memory and list its files instead of writing them",
+    )
+    parser.add_argument(
+        "--bootstrap",
+        action="store_true",
+        help="after generating, run git init, uv sync and pre-commit install concurrently",
+    )
+    parser.add_argument(
+        "--format",
+        choices=DRY_RUN_FORMATS,
+        default="text",
+        help="--dry-run output: a file listing or a JSON manifest (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--archive",
+        choices=ARCHIVE_FORMATS,
+        default=None,
+        help="write the project into an archive instead of a directory, without touching the disk otherwise",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=None,
+        metavar="PATH",
+        help='--archive destination, or "-" for standard output (default: <project>.<format>)',
+    )
+
+    # The same options for the subcommands that use them, accepted after the subcommand's name too.
+    # They default to SUPPRESS so that a value given before the subcommand is not reset
+    answers_option = argparse.ArgumentParser(add_help=False)
+    answers_option.add_argument(
+        "--answers",
+        default=argparse.SUPPRESS,
+        metavar="FILE",
+        help='JSON object of template variables to use, or "-" for stdin',
+    )
+    no_input_option = argparse.ArgumentParser(add_help=False)
+    no_input_option.add_argument(
+        "--no-input",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="do not prompt; use the template defaults, detected author details and --answers",
+    )
+    dry_run_option = argparse.ArgumentParser(add_help=False)
+    dry_run_option.add_argument(
+        "--dry-run",
+        action="store_true",
+        default=argparse.SUPPRESS,
+        help="only list what would change, without writing anything",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    batch = subparsers.add_parser(
+        "batch",
+        help="generate many projects without prompting, one per line of a JSON Lines spec file",
+        description="Generate one project per line of SPECS, each an extra_context object.",
+    )
+    batch.add_argument("specs", help='JSON Lines file of extra_context objects, or "-" for stdin')
+    batch.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of worker processes (default: number of CPUs)",
+    )
+    batch.add_argument(
+        "-o",
+        "--output-dir",
+        default=".",
+        help="directory to create the projects in (default: current directory)",
+    )
+    workspace = subparsers.add_parser(
+        "workspace",
+        parents=[answers_option, no_input_option],
+        help="generate a uv workspace of several packages sharing one dev group, lock and environment",
+        description=(
+            "Generate the workspace root NAME with one member package per MEMBER below packages/. "
+            "--answers applies to the root and every member."
+        ),
+    )
+    workspace.add_argument("name", help="project name of the workspace root")
+    workspace.add_argument("members", nargs="+", metavar="MEMBER", help="project name of a member package")
+    workspace.add_argument(
+        "-o",
+        "--output-dir",
+        default=".",
+        help="directory to create the workspace in (default: current directory)",
+    )
+    verify = subparsers.add_parser(
+        "verify-matrix",
+        help="render every combination of the template's options in memory and check the results",
+        description="Render every option combination without writing files and check each rendered project.",
+    )
+    verify.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of worker processes (default: number of CPUs)",
+    )
+    update = subparsers.add_parser(
+        "update",
+        parents=[answers_option, dry_run_option],
+        help="re-render a generated project with the current template and write only what changed",
+        description=(
+            "Render PROJECT again from its recorded answers (changed by --answers) and the current template, "
+            "and merge the changes into files you have edited. Use --dry-run to only list the changes."
+        ),
+    )
+    update.add_argument("project", nargs="?", default=".", help="project to update (default: current directory)")
+
+    cache = subparsers.add_parser("cache", help="manage uvi's caches", description="Manage uvi's caches.")
+    cache_commands = cache.add_subparsers(dest="cache_command", metavar="COMMAND", required=True)
+    warm = cache_commands.add_parser(
+        "warm",
+        parents=[answers_option],
+        help="download the dependencies of every answer combination into uv's cache",
+        description=(
+            "Sync each dependency set the template can produce (only the one --answers selects, if given) "
+            "into uv's cache, so generated projects can run 'uv sync --offline'."
+        ),
+    )
+    warm.add_argument("--uv-cache-dir", default=None, metavar="DIR", help="uv cache to seed (default: uv's own)")
+    warm.add_argument("--refresh", action="store_true", help="sync dependency sets that were warmed before, too")
+    warm.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of dependency sets synced at once (default: all)",
+    )
+    serve = subparsers.add_parser(
+        "serve",
+        help="keep the template loaded and generate projects on request over HTTP",
+        description=(
+            "Serve POST /generate (a JSON object with answers, and an archive format or an output_dir) "
+            "and GET /stats on a localhost port or a Unix socket."
+        ),
+    )
+    serve.add_argument("--host", default="127.0.0.1", help="interface to listen on (default: %(default)s)")
+    serve.add_argument("--port", type=int, default=8787, help="port to listen on (default: %(default)s)")
+    serve.add_argument("--socket", default=None, metavar="PATH", help="listen on a Unix socket instead of a port")
+    serve.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of worker processes (default: number of CPUs)",
+    )
+    serve.add_argument(
+        "--max-pending",
+        type=int,
+        default=None,
+        metavar="N",
+        help="requests allowed to wait for a worker before new ones get 503 (default: 4 per worker)",
+    )
+    serve.add_argument(
+        "--output-root",
+        default=None,
+        metavar="DIR",
+        help="allow requests to write projects with output_dir, inside DIR only (default: archives only)",
+    )
+    return parser
+
+
+def load_answers(path: str) -> dict[str, str]:
+    """Read template variables from a JSON file.
 
     Args:
-        command: The command to check (e.g., "git", "gh")
+        path: Path to a file holding one JSON object, or "-" for standard input
 
     Returns:
-        True if the command is available, False otherwise
-    """
-    # Try using shutil.which first (most reliable cross-platform approach)
-    if shutil.which(command):
-        return True
-
-    # Try with --version flag (most commands support this)
-    if _try_command_run(command, "--version"):
-        return True
+        The template variables
 
-    # Final attempt with --help flag
-    return _try_command_run(command, "--help")
+    Raises:
+        ValueError: If the file does not hold a JSON object
+    """
+    if path == "-":
+        text = sys.stdin.read()
+    else:
+        with open(path, encoding="utf-8") as answers_file:
+            text = answers_file.read()
+    try:
+        answers = json.loads(text)
+    except json.JSONDecodeError as e:
+        msg = f"{path}: invalid JSON ({e.msg})"
+        raise ValueError(msg) from e
+    if not isinstance(answers, dict):
+        msg = f"{path}: expected a JSON object, got {type(answers).__name__}"
+        raise ValueError(msg)  # noqa: TRY004 - malformed input, not a programming error
+    return answers
 
 
-def get_github_user_info() -> dict[str, str] | None:
-    """Get user information from GitHub CLI.
+def format_manifest(manifest: dict[str, Any], output_format: str) -> str:
+    """Render a ``--dry-run`` project manifest for printing.
 
-    Attempts to retrieve user information from GitHub API using the GitHub CLI.
+    Args:
+        manifest: Manifest from ``uvi.render.preview_project``
+        output_format: ``text`` for a file listing, ``json`` for the manifest itself
 
     Returns:
-        Dict containing user information from GitHub, or None if unavailable
+        The text to print
     """
-    if not is_command_available("gh"):
-        print("GitHub CLI not found. Consider installing it for better integration.")
-        return None
+    if output_format == "json":
+        return json.dumps(manifest, indent=2)
+    lines = [f"{manifest['project']}/ ({manifest['file_count']} files, {manifest['total_size']} bytes)"]
+    lines.extend(
+        f"  {entry['size']:>8}  {entry['mode']}  {entry['sha256'][:12]}  {entry['path']}" for entry in manifest["files"]
+    )
+    return "\n".join(lines)
 
-    # Check if user is authenticated with GitHub
-    try:
-        # The gh command is a fixed string, not user input
-        result = subprocess.run(  # noqa: S603
-            ["gh", "auth", "status"],  # noqa: S607
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            check=False,
-        )
-        if result.returncode != 0:
-            print("GitHub CLI found but not authenticated. Run 'gh auth login' to set up.")
-            return None
-
-        # Get user information from GitHub API
-        try:
-            # The gh command is a fixed string, not user input
-            user_json = subprocess.check_output(  # noqa: S603
-                ["gh", "api", "user"],  # noqa: S607
-                stderr=subprocess.DEVNULL,
-                text=True,
-            )
-            user_data: dict[str, Any] = json.loads(user_json)
-
-            # Extract relevant information
-            context = {}
-            if user_data.get("name"):
-                context["author"] = user_data["name"]
-            if user_data.get("email"):
-                context["email"] = user_data["email"]
-            if user_data.get("login"):
-                context["author_github_handle"] = user_data["login"]
-
-            if context:
-                print(f"Using information from GitHub account: {user_data.get('login', 'unknown')}")
-                return context
-        except (subprocess.SubprocessError, json.JSONDecodeError) as e:
-            print(f"Error getting GitHub user data: {e}")
-            return None
-    except subprocess.SubprocessError:
-        return None
-
-    return None
-
-
-def _try_git_config(key: str, scope: str) -> str | None:
-    """Try to get a git config value from specified scope.
 
-    Args:
-        key: The git config key (e.g., "user.name")
-        scope: The scope to use ("--local" or "--global")
+def create_or_preview(args: argparse.Namespace, template: str, defaults: dict[str, str], stdout: TextIO) -> None:
+    """Create one project, or with --dry-run print what it would contain.
 
-    Returns:
-        The config value if found, None otherwise
+    Args:
+        args: Parsed command-line arguments
+        template: Template to render
+        defaults: Detected author details, used to prefill the prompts
+        stdout: Where the --dry-run listing and an --archive for "-o -" go
     """
-    # Attempt to get git config value
-    try:
-        cmd = ["git", "config", scope, "--get", key]
-        value = subprocess.check_output(  # noqa: S603
-            cmd,
-            stderr=subprocess.DEVNULL,
-            text=True,
-        ).strip()
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        # Return None if command fails or git isn't available
-        return None
-    else:
-        # Return the value if it's not empty, None otherwise
-        return value if value else None
+    # The renderer pulls in cookiecutter, Jinja2, requests and friends, so it is
+    # imported only once we know a project is actually going to be rendered;
+    # this keeps --version and --help fast
+    from .hooks import validate_answers  # noqa: PLC0415
+    from .render import archive_project, create_project, preview_project  # noqa: PLC0415
+
+    answers = load_answers(args.answers) if args.answers else {}
+    extra_context = {**defaults, **answers}
+    if args.archive:
+        # Stream straight into the archive; nothing else is written
+        output = stdout.buffer if args.output == "-" else args.output
+        name = archive_project(
+            template,
+            args.archive,
+            output,
+            extra_context=extra_context,
+            no_input=args.no_input,
+            validate=validate_answers,
+        )
+        destination = "standard output" if args.output == "-" else args.output or f"{name}.{args.archive}"
+        print(f"Archived {name} to {destination}")
+        return
+    if args.dry_run:
+        manifest = preview_project(
+            template, extra_context=extra_context, no_input=args.no_input, validate=validate_answers
+        )
+        print(format_manifest(manifest, args.format), file=stdout)
+        return
+
+    # Prompt for the answers and render only the files they select
+    project_dir = create_project(
+        template,
+        no_input=args.no_input,  # Prompt unless --no-input
+        extra_context=extra_context,  # Prefill with user info and --answers
+        validate=validate_answers,  # Reject bad answers before anything is written
+    )
+    if args.bootstrap:
+        from .bootstrap import bootstrap  # noqa: PLC0415
+        from .warm import is_warm  # noqa: PLC0415
+
+        if bootstrap(project_dir, offline=is_warm(project_dir, template, os.environ.get("UV_CACHE_DIR"))):
+            sys.exit(1)
 
 
-def get_git_config_value(key: str, local: bool = True) -> str | None:
-    """Get a value from git config.
+def run_batch_command(args: argparse.Namespace, template: str, defaults: dict[str, str]) -> None:
+    """Generate one project per spec (``uvi batch``).
 
     Args:
-        key: The git config key to get (e.g., "user.name")
-        local: Whether to get the local repository config (True) or
-               global config (False)
+        args: Parsed command-line arguments
+        template: Template to render
+        defaults: Detected author details, applied before each spec
+    """
+    from .batch import run_batch  # noqa: PLC0415
 
-    Returns:
-        The git config value if found, None otherwise
+    with span("batch"):
+        failures = run_batch(
+            args.specs, output_dir=args.output_dir, jobs=args.jobs, defaults=defaults, template=template
+        )
+    if failures:
+        print(f"{failures} project(s) failed to generate", file=sys.stderr)
+        sys.exit(1)
+
+
+def run_workspace_command(args: argparse.Namespace, template: str, defaults: dict[str, str]) -> None:
+    """Generate a uv workspace and its member packages (``uvi workspace``).
+
+    Args:
+        args: Parsed command-line arguments
+        template: Template to render
+        defaults: Detected author details, applied before the answers
     """
-    # Check if git is available
-    if not is_command_available("git"):
-        return None
+    from .workspace import generate_workspace  # noqa: PLC0415
+
+    answers = load_answers(args.answers) if args.answers else None
+    with span("workspace"):
+        workspace_dir = generate_workspace(
+            args.name, args.members, output_dir=args.output_dir, answers=answers, defaults=defaults, template=template
+        )
+    print(f"Created workspace {args.name} with {len(args.members)} package(s) at {workspace_dir}")
+
 
-    # Try with the primary scope first
-    primary_scope = "--local" if local else "--global"
-    value = _try_git_config(key, primary_scope)
-    if value:
-        return value
+def run_verify_matrix_command(args: argparse.Namespace, template: str, defaults: dict[str, str]) -> None:
+    """Render and check every option combination (``uvi verify-matrix``).
 
-    # If primary scope fails, try the alternate scope
-    alternate_scope = "--global" if local else "--local"
-    return _try_git_config(key, alternate_scope)
+    Args:
+        args: Parsed command-line arguments
+        template: Template to render
+        defaults: Generic author details; not detected, as the matrix uses the template defaults
+    """
+    from .matrix import run_verify_matrix  # noqa: PLC0415
 
+    with span("verify-matrix"):
+        problems = run_verify_matrix(template, jobs=args.jobs)
+    if problems:
+        sys.exit(1)
 
-def get_git_user_info() -> dict[str, str]:
-    """Get user information from git config.
 
-    Attempts to retrieve user name and email from git configuration.
-    Falls back to generic defaults if values cannot be retrieved.
+def run_update_command(args: argparse.Namespace, template: str, defaults: dict[str, str]) -> None:
+    """Bring a generated project up to date (``uvi update``).
 
-    Returns:
-        Dict containing user info with git values prioritized over generic defaults
+    Args:
+        args: Parsed command-line arguments
+        template: Template to update to
+        defaults: Generic author details; not detected, as the project's recorded answers are used
     """
-    # Generic defaults that will be used if git config is not available
-    context = {"author": "Your Name", "email": "your.email@example.com", "author_github_handle": "your-github-handle"}
+    from .update import run_update  # noqa: PLC0415
 
-    if not is_command_available("git"):
-        print("Git not found. Using generic defaults.")
-        return context
+    answers = load_answers(args.answers) if args.answers else None
+    with span("update"):
+        conflicts = run_update(args.project, template=template, answers=answers, dry_run=args.dry_run)
+    if conflicts:
+        sys.exit(1)
 
-    # First try local config, then fall back to global
-    print("Using git configuration for user details.")
 
-    # Get user name from git config (try local first, then global)
-    name_local = get_git_config_value("user.name", local=True)
-    if name_local:
-        context["author"] = name_local
-        print(f"Using local git name: {name_local}")
-    else:
-        # Try global config
-        name_global = get_git_config_value("user.name", local=False)
-        if name_global:
-            context["author"] = name_global
-            print(f"Using global git name: {name_global}")
-
-    # Get user email from git config (try local first, then global)
-    email_local = get_git_config_value("user.email", local=True)
-    if email_local:
-        context["email"] = email_local
-        print(f"Using local git email: {email_local}")
-    else:
-        # Try global config
-        email_global = get_git_config_value("user.email", local=False)
-        if email_global:
-            context["email"] = email_global
-            print(f"Using global git email: {email_global}")
-
-    # Try to extract GitHub handle from email (simple heuristic)
-    email = context["email"]
-    if email and (email.endswith("@github.com") or email.endswith("@users.noreply.github.com")):
-        handle = email.split("@", maxsplit=1)[0]
-        context["author_github_handle"] = handle
-        print(f"Extracted GitHub handle from email: {handle}")
+def run_cache_command(args: argparse.Namespace, template: str, defaults: dict[str, str]) -> None:
+    """Manage uvi's caches (``uvi cache warm``).
 
-    return context
+    Args:
+        args: Parsed command-line arguments
+        template: Template whose dependencies are cached
+        defaults: Generic author details; not detected, as no project is generated
+    """
+    from .warm import run_warm_cache  # noqa: PLC0415
 
+    answers = load_answers(args.answers) if args.answers else None
+    with span("cache-warm"):
+        failures = run_warm_cache(
+            template, answers=answers, uv_cache_dir=args.uv_cache_dir, refresh=args.refresh, jobs=args.jobs
+        )
+    if failures:
+        sys.exit(1)
 
-def get_user_info() -> dict[str, str]:
-    """Get user information from various sources.
 
-    Uses a tiered approach:
-    1. Try GitHub CLI first for best results
-    2. Fall back to git config if GitHub isn't available
-    3. Use generic defaults as a last resort
+def run_serve_command(args: argparse.Namespace, template: str, defaults: dict[str, str]) -> None:
+    """Generate projects on request until interrupted (``uvi serve``).
 
-    Returns:
-        Dict containing user information from the best available source
+    Args:
+        args: Parsed command-line arguments
+        template: Template to render
+        defaults: Detected author details, applied before each request's answers
     """
-    # Try GitHub CLI first
-    github_info = get_github_user_info()
-    if github_info:
-        return github_info
+    from .serve import open_service, serve  # noqa: PLC0415
 
-    # Fall back to git config
-    return get_git_user_info()
+    service = open_service(
+        template, defaults, jobs=args.jobs, max_pending=args.max_pending, output_root=args.output_root
+    )
+    serve(service, host=args.host, port=args.port, socket_path=args.socket)
 
 
-def main() -> None:
-    """Create a new Python project using the uvi template."""
-    parser = argparse.ArgumentParser(description="Create a new Python project using uvi template")
-    parser.add_argument("--version", action="version", version=f"uvi {__version__}")
-    parser.parse_args()
+# Handlers for the subcommands, called with the arguments, template and author details
+COMMANDS = {
+    "batch": run_batch_command,
+    "workspace": run_workspace_command,
+    "verify-matrix": run_verify_matrix_command,
+    "update": run_update_command,
+    "cache": run_cache_command,
+    "serve": run_serve_command,
+}
+
+# Subcommands that use the detected author details; the others skip detecting them
+IDENTITY_COMMANDS = (None, "batch", "workspace", "serve")
+
+
+def run(args: argparse.Namespace) -> None:
+    """Create the project(s) requested on the command line.
+
+    Args:
+        args: Parsed command-line arguments
+    """
+    stdout = sys.stdout
+    # With --dry-run or -o -, stdout carries only the listing or the archive; progress messages go to stderr
+    previewing = (args.dry_run or args.output == "-") and args.command is None
+    quiet = contextlib.redirect_stdout(sys.stderr) if previewing else contextlib.nullcontext()
     try:
-        # When installed as a package, use the local template
-        if os.path.exists(os.path.join(os.path.dirname(__file__), "..", "cookiecutter.json")):
-            template = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-        # When used directly via cookiecutter, use the GitHub repo
-        else:
-            template = "https://github.com/shaneholloman/uvi.git"
-
-        # Get user information from the best available source
-        context = get_user_info()
-
-        # Run cookiecutter with the template and prefilled values
-        cookiecutter(
-            template,
-            no_input=False,  # Enable interactive prompts
-            overwrite_if_exists=False,  # Don't overwrite existing projects
-            extra_context=context,  # Prefill with user info
-        )
+        with quiet:
+            # Get user information from the best available source
+            context = dict(DEFAULT_USER_INFO)
+            if args.command in IDENTITY_COMMANDS:
+                with span("identity"):
+                    context = get_user_info(
+                        timeout=args.identity_timeout,
+                        refresh=args.refresh_identity,
+                        cache_ttl=args.identity_cache_ttl,
+                    )
+
+            with span("template"):
+                template = resolve_template(args.template)
+
+            if args.command in COMMANDS:
+                COMMANDS[args.command](args, template, context)
+                return
+
+            create_or_preview(args, template, context, stdout)
     except OSError as e:
         print(f"File system error: {e}", file=sys.stderr)
         sys.exit(1)
@@ -316,5 +675,30 @@ def main() -> None:
         sys.exit(1)
 
 
+def main() -> None:
+    """Create a new Python project using the uvi template."""
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.archive and (args.dry_run or args.bootstrap):
+        parser.error("--archive cannot be combined with --dry-run or --bootstrap")
+    if args.output and not args.archive:
+        parser.error("-o/--output is only used with --archive")
+    profile_path = args.profile or os.environ.get("UVI_PROFILE")
+    if not profile_path:
+        run(args)
+        return
+
+    profile_format = args.profile_format or os.environ.get("UVI_PROFILE_FORMAT") or "json"
+    if profile_format not in PROFILE_FORMATS:
+        parser.error(f"unknown profile format {profile_format!r} (choose from {', '.join(PROFILE_FORMATS)})")
+    profiler = profile.start()
+    try:
+        run(args)
+    finally:
+        profile.stop()
+        profiler.write(profile_path, profile_format)
+        print(f"Profile written to {profile_path}", file=sys.stderr)
+
+
 if __name__ == "__main__":
     main()
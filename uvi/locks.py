@@ -0,0 +1,201 @@
+"""Pre-resolved lock files for the UVI template.
+
+Resolving a new project's dependencies is the slowest part of its first
+``uv sync``, and every project generated with the same answers resolves to
+the same thing. The template therefore ships one ``uv.lock`` per dependency
+set (every combination of the choice variables ``pyproject.toml`` refers to,
+see ``uvi.warm``) in ``locks/``, and generation emits the matching one as the
+project's ``uv.lock`` (see ``uvi.render.project_lock``) instead of running a
+resolver.
+
+Lock files are resolved for a project named ``uvi-lock-placeholder``; the
+project's own entry is the only place its name appears, and generation
+replaces it. ``locks/index.json`` records, per lock file, the answers it
+belongs to and the SHA-256 of the dependency tables of the ``pyproject.toml``
+it was resolved from, so a template change that makes the locks stale is
+caught by ``--check`` (and by the test suite) rather than by users, while
+changes to ``[tool.*]`` settings leave the locks alone. Rebuild them with::
+
+    python -m uvi.locks            # or: make locks
+    python -m uvi.locks --check    # exit 1 if any lock is missing or stale
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from . import render
+from .batch import load_template_context, resolve_spec
+from .template import find_template
+from .warm import dependency_sets, dependency_tables
+
+# Name of the project the lock files are resolved for, replaced at generation
+LOCK_PLACEHOLDER = "uvi-lock-placeholder"
+
+
+def lock_file_name(answers: dict[str, str]) -> str:
+    """Name the lock file of a dependency set, e.g. ``codecov-y_deptry-n_mkdocs-y.lock``."""
+    return "_".join(f"{name}-{value}" for name, value in sorted(answers.items())) + ".lock"
+
+
+def locked_project(repo_dir: str, template_context: dict[str, Any], answers: dict[str, str]) -> dict[str, bytes]:
+    """Render the files a dependency set's lock is resolved from.
+
+    Args:
+        repo_dir: Local template directory
+        template_context: Parsed template context from ``load_template_context``
+        answers: Values of the dependency switches
+
+    Returns:
+        Rendered content by path, for the placeholder project, without a ``uv.lock``
+    """
+    context = resolve_spec(template_context, {"project_name": LOCK_PLACEHOLDER, **answers})
+    context["cookiecutter"]["_repo_dir"] = repo_dir
+    return {
+        rendered.path: rendered.content
+        for rendered in render.render_files(repo_dir, context)
+        if rendered.path != render.LOCK_FILE
+    }
+
+
+def _dependencies_sha256(files: dict[str, bytes]) -> str:
+    """Hash the dependency tables of the ``pyproject.toml`` a lock is resolved from."""
+    return hashlib.sha256(dependency_tables(files["pyproject.toml"].decode("utf-8")).encode()).hexdigest()
+
+
+def locks_dir(repo_dir: str) -> str:
+    """Return the template's lock directory, from the manifest's ``locks`` key.
+
+    Raises:
+        ValueError: If the template's manifest declares no lock directory
+    """
+    manifest = render.load_manifest(repo_dir)
+    if "locks" not in manifest:
+        msg = f"{render.MANIFEST_FILE} in {repo_dir} has no 'locks' directory"
+        raise ValueError(msg)
+    return os.path.join(repo_dir, manifest["locks"])
+
+
+def stale_locks(repo_dir: str | None = None) -> list[str]:
+    """List the dependency sets whose lock is missing or out of date.
+
+    Args:
+        repo_dir: Local template directory (defaults to the bundled template)
+
+    Returns:
+        ``uvi.warm.dependency_key`` of each set that needs resolving again
+    """
+    repo_dir = repo_dir or find_template()
+    directory = locks_dir(repo_dir)
+    try:
+        with open(os.path.join(directory, render.LOCK_INDEX), encoding="utf-8") as index_file:
+            index = json.load(index_file)
+    except FileNotFoundError:
+        index = {"locks": []}
+    recorded = {lock_file_name(entry["answers"]): entry for entry in index["locks"]}
+    template_context = load_template_context(repo_dir, user_config=False)
+    stale = []
+    for key, answers in dependency_sets(repo_dir, template_context).items():
+        entry = recorded.get(lock_file_name(answers))
+        if (
+            entry is None
+            or not os.path.isfile(os.path.join(directory, entry["file"]))
+            or entry["dependencies_sha256"] != _dependencies_sha256(locked_project(repo_dir, template_context, answers))
+        ):
+            stale.append(key)
+    return stale
+
+
+def _resolve(files: dict[str, bytes], offline: bool) -> bytes:
+    """Write a rendered project to a temporary directory and lock it with uv.
+
+    Raises:
+        RuntimeError: If uv fails to resolve the project
+    """
+    with tempfile.TemporaryDirectory(prefix="uvi-lock-") as project_dir:
+        render.write_files((render.RenderedFile(path, content, 0o644) for path, content in files.items()), project_dir)
+        command = ["uv", "lock", *(["--offline"] if offline else [])]
+        completed = subprocess.run(command, cwd=project_dir, capture_output=True, text=True, check=False)  # noqa: S603
+        if completed.returncode != 0:
+            raise RuntimeError(completed.stderr.strip())
+        with open(os.path.join(project_dir, render.LOCK_FILE), "rb") as lock_file:
+            return lock_file.read()
+
+
+def build_locks(repo_dir: str | None = None, offline: bool = False, jobs: int | None = None) -> dict[str, Any]:
+    """Resolve every dependency set and write the lock files and their index.
+
+    Args:
+        repo_dir: Template checkout to write ``locks/`` into (defaults to the bundled template)
+        offline: Resolve from uv's cache only (see ``uvi cache warm``)
+        jobs: Number of sets resolved at once (defaults to all of them)
+
+    Returns:
+        The written index
+
+    Raises:
+        FileNotFoundError: If uv is not installed
+    """
+    if shutil.which("uv") is None:
+        msg = "uv is not installed; see https://docs.astral.sh/uv/"
+        raise FileNotFoundError(msg)
+    repo_dir = repo_dir or find_template()
+    directory = locks_dir(repo_dir)
+    template_context = load_template_context(repo_dir, user_config=False)
+    sets = list(dependency_sets(repo_dir, template_context).values())
+    projects = [locked_project(repo_dir, template_context, answers) for answers in sets]
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs or len(sets), len(sets)))) as pool:
+        locks = list(pool.map(lambda files: _resolve(files, offline), projects))
+
+    uv_version = subprocess.run(["uv", "--version"], capture_output=True, text=True, check=True)  # noqa: S607
+    index: dict[str, Any] = {"placeholder": LOCK_PLACEHOLDER, "uv": uv_version.stdout.strip(), "locks": []}
+    if os.path.isdir(directory):
+        shutil.rmtree(directory)
+    os.makedirs(directory)
+    for answers, files, lock in zip(sets, projects, locks, strict=True):
+        name = lock_file_name(answers)
+        with open(os.path.join(directory, name), "wb") as lock_file:
+            lock_file.write(lock)
+        index["locks"].append({"answers": answers, "file": name, "dependencies_sha256": _dependencies_sha256(files)})
+    with open(os.path.join(directory, render.LOCK_INDEX), "w", encoding="utf-8") as index_file:
+        json.dump(index, index_file, indent=2, sort_keys=True)
+        index_file.write("\n")
+    return index
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Rebuild or check the template's lock files (``python -m uvi.locks``).
+
+    Returns:
+        Exit status: 1 if ``--check`` found stale locks
+    """
+    parser = argparse.ArgumentParser(prog="python -m uvi.locks", description=__doc__.splitlines()[0])
+    parser.add_argument("--check", action="store_true", help="only report missing or stale lock files")
+    parser.add_argument("--offline", action="store_true", help="resolve from uv's cache only")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of sets resolved at once")
+    parser.add_argument("--template", default=None, metavar="PATH", help="template checkout (default: this one)")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        stale = stale_locks(args.template)
+        for key in stale:
+            print(f"stale  {key}")
+        if stale:
+            print("Run 'make locks' to resolve them again", file=sys.stderr)
+        return 1 if stale else 0
+    index = build_locks(args.template, offline=args.offline, jobs=args.jobs)
+    print(f"Resolved {len(index['locks'])} lock files with {index['uv']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,381 @@
+"""Option-matrix verification for UVI.
+
+Renders the template once for every combination of its choice variables
+(9216 for the bundled template), plus every combination but the license for
+each of the ``VARIANTS`` (several test shards, a workspace root and a
+workspace member; 4608 more), entirely in memory and checks each rendered
+tree without writing anything to disk:
+
+- workflow and action files under ``.github`` are valid YAML
+- ``pyproject.toml`` is valid TOML (with ``tomli`` on Python 3.10; without it
+  the check is skipped, and the run says so)
+- no Jinja markup is left unrendered (GitHub's ``${{ }}`` expressions are fine)
+- files and directories are present exactly when their options select them
+- the Makefile's targets (and the check script ``make check`` runs) match
+  the options, every ``.PHONY`` target is defined and every ``make`` call in
+  the workflows names a real target
+
+Combinations are spread over a process pool whose workers parse the template
+once and keep its Jinja environment, so the whole matrix takes seconds. When
+no other variable is derived from a choice variable, the template's answers
+are resolved once and each combination only swaps its choice values in,
+instead of going through cookiecutter's prompting for every combination.
+"""
+
+from __future__ import annotations
+
+import functools
+import itertools
+import json
+import os
+import re
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from . import render
+from .batch import _init_worker, load_template_context, resolve_spec, template_on_path
+from .template import find_template
+
+# Jinja markup that survived rendering; GitHub expressions are written as ${{ ... }}
+UNRENDERED_MARKUP = re.compile(r"(?<!\$)\{\{|\{%|\{#")
+MAKE_TARGET = re.compile(r"^([A-Za-z0-9_.-]+):(?!=)", re.MULTILINE)
+MAKE_PHONY = re.compile(r"^\.PHONY:(.*)$", re.MULTILINE)
+MAKE_CALL = re.compile(r"\bmake ([A-Za-z0-9_-]+)")
+
+# Makefile targets every generated project has
+ALWAYS_TARGETS = ("install", "check", "check-changed", "test", "build", "clean-build", "help")
+
+# Combinations handed to a worker at a time
+CHUNK_SIZE = 16
+
+# Parsed template context of a worker process
+_worker_context: dict[str, Any] | None = None
+_worker_base: dict[str, Any] | None = None
+
+CONTEXT_VARIABLE = re.compile(r"cookiecutter\.(\w+)")
+
+# Values of variables that are not choices but still select parts of the
+# template: more than one test shard, and the root and members of a workspace
+VARIANTS: tuple[dict[str, Any], ...] = (
+    {"ci_test_shards": "3"},
+    {"_workspace": "root", "_workspace_members": {"example-core": "example_core", "example-api": "example_api"}},
+    {"_workspace": "member"},
+)
+
+# Choice variables the variants are not combined with, as they only pick one file
+VARIANT_FIXED_CHOICES = ("open_source_license",)
+
+
+def option_matrix(template_context: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """Yield every combination of the template's choice variables, then the variants.
+
+    Each of the ``VARIANTS`` the template has variables for is combined with
+    every choice except those in ``VARIANT_FIXED_CHOICES``, which keep their defaults.
+
+    Args:
+        template_context: Parsed template context from ``load_template_context``
+
+    Yields:
+        ``extra_context`` dicts setting each choice variable
+    """
+    variables = template_context["cookiecutter"]
+    choices = {name: value for name, value in variables.items() if isinstance(value, list) and not name.startswith("_")}
+    for values in itertools.product(*choices.values()):
+        yield dict(zip(choices, values, strict=True))
+
+    varied = {name: value for name, value in choices.items() if name not in VARIANT_FIXED_CHOICES}
+    for variant in VARIANTS:
+        if variant.keys() <= variables.keys():
+            for values in itertools.product(*varied.values()):
+                yield {**dict(zip(varied, values, strict=True)), **variant}
+
+
+def _makefile_errors(makefile: str, answers: dict[str, Any], workflows: dict[str, str], check_script: str) -> list[str]:
+    """Check the Makefile's targets, and the check script its 'check' target runs, against the answers and the workflows."""
+    errors = []
+    targets = set(MAKE_TARGET.findall(makefile))
+    expected = {
+        **dict.fromkeys(ALWAYS_TARGETS, True),
+        "publish": answers.get("publish_to_pypi") == "y",
+        "build-and-publish": answers.get("publish_to_pypi") == "y",
+        "docs": answers.get("mkdocs") == "y",
+        "docs-test": answers.get("mkdocs") == "y",
+        "test-compiled": answers.get("compiled") == "y",
+        "build-compiled": answers.get("compiled") == "y",
+        "bench-compiled": answers.get("compiled") == "y" and answers.get("benchmarks") == "y",
+    }
+    for target, wanted in expected.items():
+        if wanted and target not in targets:
+            errors.append(f"Makefile: missing target {target!r}")
+        elif not wanted and target in targets:
+            errors.append(f"Makefile: unexpected target {target!r}")
+    for phony in MAKE_PHONY.findall(makefile):
+        errors.extend(
+            f"Makefile: .PHONY target {name!r} is not defined" for name in phony.split() if name not in targets
+        )
+
+    recipes = dict(re.findall(r"^([A-Za-z0-9_-]+):.*\n((?:\t.*\n?)*)", makefile, re.MULTILINE))
+    if ("scripts/check.py" in recipes.get("check", "") and '"deptry"' in check_script) != (
+        answers.get("deptry") == "y"
+    ):
+        errors.append("Makefile: 'check' runs deptry iff deptry is enabled")
+    if ("--cov" in recipes.get("test", "")) != (answers.get("codecov") == "y"):
+        errors.append("Makefile: 'test' collects coverage iff codecov is enabled")
+
+    for path, text in workflows.items():
+        errors.extend(
+            f"{path}: calls 'make {target}', which the Makefile does not define"
+            for target in MAKE_CALL.findall(text)
+            if target not in targets
+        )
+    return errors
+
+
+def _presence_errors(files: dict[str, bytes], answers: dict[str, Any]) -> list[str]:
+    """Check that each optional file is present exactly when its option selects it."""
+    paths = set(files)
+
+    def exists(path: str) -> bool:
+        return path in paths or any(name.startswith(path + "/") for name in paths)
+
+    # A workspace root keeps the shared tooling and no package; a member keeps only its package
+    root = answers.get("_workspace") == "root"
+    member = answers.get("_workspace") == "member"
+    github = answers.get("include_github_actions") == "y" and not member
+    expected = {
+        "LICENSE": answers.get("open_source_license") != "Not open source",
+        "docs": answers.get("mkdocs") == "y" and not member,
+        "mkdocs.yml": answers.get("mkdocs") == "y" and not member,
+        "Dockerfile": answers.get("dockerfile") != "n" and not (root or member),
+        ".dockerignore": answers.get("dockerfile") == "optimized" and not (root or member),
+        "codecov.yaml": answers.get("codecov") == "y" and not member,
+        "tests/conftest.py": answers.get("ci_test_shards", "1") != "1" and not member,
+        "benchmarks": answers.get("benchmarks") == "y",
+        "tests/test_importtime.py": answers.get("importtime") == "y" and not root,
+        "setup.py": answers.get("compiled") == "y" and not root,
+        "tests/test_compiled.py": answers.get("compiled") == "y" and not root,
+        ".devcontainer": answers.get("devcontainer") == "y" and not member,
+        ".github": github,
+        ".github/workflows/on-release-main.yml": github
+        and (answers.get("publish_to_pypi") == "y" or answers.get("mkdocs") == "y"),
+        ".github/workflows/validate-codecov-config.yml": github and answers.get("codecov") == "y",
+        "pyproject.toml": True,
+        "Makefile": not member,
+        "scripts/check.py": not member,
+        f"{answers.get('project_slug')}/__init__.py": not root,
+    }
+    errors = [
+        f"{path}: {'missing' if wanted else 'should not be generated'}"
+        for path, wanted in expected.items()
+        if exists(path) != wanted
+    ]
+    errors.extend(f"{path}: unrenamed license file" for path in sorted(paths) if path.startswith("LICENSE_"))
+    return errors
+
+
+@functools.cache
+def toml_parser() -> Any:
+    """Return the TOML parser: ``tomllib``, or ``tomli`` on Python 3.10, or None without either."""
+    try:
+        import tomllib  # noqa: PLC0415
+    except ImportError:
+        pass
+    else:
+        return tomllib
+    try:
+        import tomli  # noqa: PLC0415
+    except ImportError:
+        return None
+    return tomli
+
+
+@functools.lru_cache(maxsize=1024)
+def _syntax_error(kind: str, text: str) -> str | None:
+    """Parse a YAML or TOML document and return the error, if any.
+
+    Most combinations render identical workflow and pyproject files, so each
+    distinct text is parsed only once per process.
+    """
+    if kind == "yaml":
+        import yaml  # noqa: PLC0415 - installed with cookiecutter
+
+        try:
+            yaml.load(text, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))  # noqa: S506 - a safe loader
+        except yaml.YAMLError as e:
+            return f"invalid YAML ({e})"
+        return None
+    toml = toml_parser()
+    if toml is None:
+        return None
+    try:
+        toml.loads(text)
+    except toml.TOMLDecodeError as e:
+        return f"invalid TOML ({e})"
+    return None
+
+
+def check_tree(answers: dict[str, Any], files: dict[str, bytes]) -> list[str]:
+    """Check one rendered project.
+
+    Args:
+        answers: The resolved template variables
+        files: Rendered file contents by path relative to the project
+
+    Returns:
+        A description of every problem found; empty if the tree is sound
+    """
+    errors = _presence_errors(files, answers)
+    texts: dict[str, str] = {}
+    for path, content in sorted(files.items()):
+        try:
+            text = content.decode("utf-8")
+        except UnicodeDecodeError:
+            continue
+        texts[path] = text
+        # Substring tests are much faster than the regex on large files such as uv.lock
+        match = UNRENDERED_MARKUP.search(text) if "{{" in text or "{%" in text or "{#" in text else None
+        if match:
+            line = text.count("\n", 0, match.start()) + 1
+            errors.append(f"{path}:{line}: unrendered template markup {match.group()!r}")
+        if path.startswith(".github/") and path.endswith((".yml", ".yaml")):
+            kind: str | None = "yaml"
+        elif path.endswith(".toml"):
+            kind = "toml"
+        else:
+            kind = None
+        syntax_error = _syntax_error(kind, text) if kind else None
+        if syntax_error:
+            errors.append(f"{path}: {syntax_error}")
+
+    if "Makefile" in texts:
+        workflows = {path: text for path, text in texts.items() if path.startswith(".github/")}
+        errors.extend(_makefile_errors(texts["Makefile"], answers, workflows, texts.get("scripts/check.py", "")))
+    return errors
+
+
+def fixed_context(template_context: dict[str, Any]) -> dict[str, Any] | None:
+    """Resolve the template's default answers once, if choices never feed other variables.
+
+    Args:
+        template_context: Parsed template context from ``load_template_context``
+
+    Returns:
+        The resolved default context, or None if a variable is rendered from a
+        choice variable (or a choice from any variable) and every combination
+        has to be resolved on its own
+    """
+    variables = template_context["cookiecutter"]
+    choices = {name for name, value in variables.items() if isinstance(value, list)}
+    for name, value in variables.items():
+        referenced = set(CONTEXT_VARIABLE.findall(json.dumps(value)))
+        if (name in choices and referenced) or referenced & choices:
+            return None
+    return resolve_spec(template_context, {})
+
+
+def _with_default(value: Any, chosen: Any) -> Any:
+    """Return a template variable overwritten with ``chosen``; choices keep the others as alternatives."""
+    if isinstance(value, list):
+        return [chosen, *(choice for choice in value if choice != chosen)]
+    return chosen
+
+
+def combination_context(base: dict[str, Any], spec: dict[str, Any]) -> dict[str, Any]:
+    """Swap a combination's values into the context from ``fixed_context``.
+
+    Returns:
+        The context ``resolve_spec`` would return for ``spec``
+    """
+    template = {
+        name: _with_default(value, spec[name]) if name in spec else value
+        for name, value in base["_cookiecutter"].items()
+    }
+    return {**base, "cookiecutter": {**base["cookiecutter"], **spec}, "_cookiecutter": template}
+
+
+def verify_combination(
+    repo_dir: str, template_context: dict[str, Any], spec: dict[str, Any], base: dict[str, Any] | None = None
+) -> list[str]:
+    """Render one combination in memory and check it.
+
+    Args:
+        repo_dir: Local template directory
+        template_context: Parsed template context from ``load_template_context``
+        spec: The choice values to render with
+        base: Result of ``fixed_context``; None resolves the combination from scratch
+
+    Returns:
+        Problems found, each prefixed with the combination
+    """
+    label = ",".join(f"{name}={value}" for name, value in spec.items())
+    try:
+        context = resolve_spec(template_context, spec) if base is None else combination_context(base, spec)
+        context["cookiecutter"]["_repo_dir"] = repo_dir
+        files = {rendered.path: rendered.content for rendered in render.render_files(repo_dir, context)}
+    except Exception as e:  # Reported per combination, like batch failures
+        return [f"[{label}] render failed: {type(e).__name__}: {e}"]
+    return [f"[{label}] {error}" for error in check_tree(context["cookiecutter"], files)]
+
+
+def _init_matrix_worker(repo_dir: str) -> None:
+    """Prepare a worker: import cookiecutter and parse the template once."""
+    global _worker_context, _worker_base  # noqa: PLW0603 - per-process state set by the pool initializer
+    _init_worker(repo_dir)
+    _worker_context = load_template_context(repo_dir, user_config=False)
+    _worker_base = fixed_context(_worker_context)
+
+
+def _verify_in_worker(repo_dir: str, spec: dict[str, Any]) -> list[str]:
+    """Verify one combination with the worker's parsed template."""
+    if _worker_context is None:
+        _init_matrix_worker(repo_dir)
+    assert _worker_context is not None  # noqa: S101 - set by _init_matrix_worker
+    return verify_combination(repo_dir, _worker_context, spec, _worker_base)
+
+
+def verify_matrix(repo_dir: str | None = None, jobs: int | None = None) -> tuple[int, list[str]]:
+    """Render and check every option combination.
+
+    Args:
+        repo_dir: Local template directory (defaults to the bundled template)
+        jobs: Number of worker processes (defaults to the CPU count); 1 checks in-process
+
+    Returns:
+        Tuple of the number of combinations checked and every problem found
+    """
+    repo_dir = repo_dir or find_template()
+    template_context = load_template_context(repo_dir, user_config=False)
+    specs = list(option_matrix(template_context))
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(specs) or 1))
+
+    if jobs == 1:
+        base = fixed_context(template_context)
+        with template_on_path(repo_dir):
+            results: Iterator[list[str]] = (
+                verify_combination(repo_dir, template_context, spec, base) for spec in specs
+            )
+            return len(specs), [error for errors in results for error in errors]
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_matrix_worker, initargs=(repo_dir,)) as pool:
+        results = pool.map(_verify_in_worker, itertools.repeat(repo_dir), specs, chunksize=CHUNK_SIZE)
+        return len(specs), [error for errors in results for error in errors]
+
+
+def run_verify_matrix(repo_dir: str | None = None, jobs: int | None = None) -> int:
+    """Verify the option matrix and print the outcome.
+
+    Returns:
+        Number of problems found
+    """
+    checked, errors = verify_matrix(repo_dir, jobs)
+    if toml_parser() is None:
+        print("TOML files were not checked: Python 3.10 needs tomli installed to parse them", file=sys.stderr)
+    for error in errors:
+        print(error, file=sys.stderr)
+    if errors:
+        print(f"{len(errors)} problem(s) in {checked} option combination(s)", file=sys.stderr)
+    else:
+        print(f"All {checked} option combinations rendered and checked cleanly")
+    return len(errors)
@@ -0,0 +1,691 @@
+"""Manifest-aware project rendering for UVI.
+
+Cookiecutter renders and writes every file in the template and leaves it to
+``hooks/post_gen_project.py`` to delete what the answers did not ask for. UVI
+instead evaluates ``template-manifest.json`` (next to ``cookiecutter.json``)
+against the context first, so excluded paths are never read, rendered or
+written, and renamed files such as ``LICENSE_MIT`` are written straight to
+their final name.
+
+The manifest has these keys (``hooks`` is described in ``uvi.hooks``)::
+
+    {
+      "exclude": [{"paths": ["docs", "mkdocs.yml"], "when": {...}, "unless": {"mkdocs": "y"}}],
+      "rename": {"LICENSE_MIT": "LICENSE"},
+      "locks": "locks"
+    }
+
+Paths are relative to the project template directory, unrendered, and use
+forward slashes; excluding a directory excludes everything below it. A rule
+applies when every ``when`` variable has the given value (an empty ``when``
+always holds) and ``unless`` does not hold. ``rename`` targets may contain
+Jinja and are rendered like any other file name. ``locks`` names a directory
+next to ``cookiecutter.json`` holding pre-resolved ``uv.lock`` files (see
+``uvi.locks``); the one matching the answers is emitted as the project's
+``uv.lock`` with the project's name filled in, so no resolver runs at
+generation time.
+
+Rendering itself mirrors ``cookiecutter.generate.generate_files``: names and
+contents go through the same Jinja environment, ``_copy_without_render`` and
+binary files are copied verbatim, and newlines and permissions follow the
+template file. Files are produced in memory so callers can write them to disk
+or elsewhere.
+
+Every generated project also gets ``.uvi-answers.json``, recording the
+answers, the template's content hash and the hash of each rendered file, from
+which ``uvi update`` (see ``uvi.update``) renders the project again.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+import stat
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from typing import IO, Any, NamedTuple
+
+from . import __version__
+from .cache import user_cache_dir
+from .profile import span
+from .template import directory_digest
+
+# Written into every generated project, so ``uvi update`` can render it again
+ANSWERS_FILE = ".uvi-answers.json"
+
+MANIFEST_FILE = "template-manifest.json"
+
+LOCK_FILE = "uv.lock"
+# Index of the pre-resolved lock files in the manifest's ``locks`` directory
+LOCK_INDEX = "index.json"
+
+
+class RenderedFile(NamedTuple):
+    """A rendered project file.
+
+    Attributes:
+        path: Path relative to the project directory, with forward slashes
+        content: File content as written to disk
+        mode: Permission bits copied from the template file
+    """
+
+    path: str
+    content: bytes
+    mode: int
+
+
+def load_manifest(repo_dir: str) -> dict[str, Any]:
+    """Read a template's inclusion manifest.
+
+    Args:
+        repo_dir: Local template directory
+
+    Returns:
+        The manifest, or an empty one if the template has none
+    """
+    try:
+        with open(os.path.join(repo_dir, MANIFEST_FILE), encoding="utf-8") as manifest_file:
+            manifest: dict[str, Any] = json.load(manifest_file)
+    except FileNotFoundError:
+        return {"exclude": [], "rename": {}}
+    return manifest
+
+
+def _conditions_hold(conditions: dict[str, str], variables: dict[str, Any]) -> bool:
+    """Return True if every variable in ``conditions`` has the given value."""
+    return all(variables.get(name) == value for name, value in conditions.items())
+
+
+def excluded_paths(manifest: dict[str, Any], variables: dict[str, Any]) -> set[str]:
+    """Evaluate the manifest's exclusion rules against the answers.
+
+    Args:
+        manifest: Manifest from ``load_manifest``
+        variables: The ``cookiecutter`` part of the context
+
+    Returns:
+        Unrendered template-relative paths that must not be generated
+    """
+    excluded: set[str] = set()
+    for rule in manifest.get("exclude", []):
+        if _conditions_hold(rule.get("when", {}), variables) and not (
+            "unless" in rule and _conditions_hold(rule["unless"], variables)
+        ):
+            excluded.update(rule["paths"])
+    return excluded
+
+
+def is_excluded(path: str, excluded: set[str]) -> bool:
+    """Return True if ``path`` or one of its parent directories is excluded.
+
+    Args:
+        path: Unrendered template-relative path with forward slashes
+        excluded: Result of ``excluded_paths``
+    """
+    parts = path.split("/")
+    return any("/".join(parts[:depth]) in excluded for depth in range(1, len(parts) + 1))
+
+
+# Jinja environments by template directory and the context keys that configure them
+_environments: dict[tuple[str, str], tuple[Any, str]] = {}
+
+
+def _template_environment(repo_dir: str, context: dict[str, Any]) -> tuple[Any, str]:
+    """Return the Jinja environment and project template directory for a template.
+
+    The environment only depends on the template's ``_extensions`` and
+    ``_jinja2_env_vars``, so it is created once and reused by every render,
+    which lets Jinja keep its compiled templates between projects.
+
+    Returns:
+        Tuple of the environment and the project template directory
+    """
+    variables = context.get("cookiecutter", {})
+    settings = json.dumps(
+        [variables.get("_extensions"), variables.get("_jinja2_env_vars")], sort_keys=True, default=str
+    )
+    key = (os.path.abspath(repo_dir), settings)
+    if key not in _environments:
+        from cookiecutter.find import find_template as find_project_template  # noqa: PLC0415
+        from cookiecutter.utils import create_env_with_context  # noqa: PLC0415
+        from jinja2 import FileSystemLoader  # noqa: PLC0415
+
+        env = create_env_with_context(context)
+        template_dir = str(find_project_template(repo_dir, env))
+        env.loader = FileSystemLoader([template_dir, os.path.join(template_dir, "..", "templates")])
+        _environments[key] = (env, template_dir)
+    return _environments[key]
+
+
+@functools.lru_cache(maxsize=4096)
+def _compile_name(env: Any, name: str) -> Any:
+    """Compile a file or directory name template once per environment."""
+    return env.from_string(name)
+
+
+def _render_name(name: str, context: dict[str, Any], env: Any) -> str:
+    """Render a file or directory name, reporting undefined variables like cookiecutter."""
+    if "{" not in name:
+        return name
+
+    from cookiecutter.exceptions import UndefinedVariableInTemplate  # noqa: PLC0415
+    from jinja2.exceptions import UndefinedError  # noqa: PLC0415
+
+    try:
+        rendered: str = _compile_name(env, name).render(**context)
+    except UndefinedError as err:
+        msg = f"Unable to render name '{name}'"
+        raise UndefinedVariableInTemplate(msg, err, context) from err
+    return rendered
+
+
+def project_template_dir(repo_dir: str, context: dict[str, Any]) -> str:
+    """Return the project template directory of a template, e.g. ``{{cookiecutter.project_name}}``.
+
+    Args:
+        repo_dir: Local template directory
+        context: Context to pick the Jinja environment with
+
+    Returns:
+        Path of the directory
+    """
+    return _template_environment(repo_dir, context)[1]
+
+
+def project_dir_name(repo_dir: str, context: dict[str, Any]) -> str:
+    """Render the name of the project directory.
+
+    Args:
+        repo_dir: Local template directory
+        context: Fully resolved context
+
+    Returns:
+        The project directory name, e.g. ``example-project``
+    """
+    env, template_dir = _template_environment(repo_dir, context)
+    return _render_name(os.path.basename(template_dir), context, env)
+
+
+@functools.lru_cache(maxsize=4096)
+def _file_traits(path: str, mtime_ns: int, size: int) -> tuple[bool, str]:
+    """Return whether a template file is binary and which newline it uses.
+
+    Cached per file version (``mtime_ns`` and ``size`` are part of the key),
+    so repeated renders of an unchanged template do not re-read its files.
+    """
+    from binaryornot.check import is_binary  # noqa: PLC0415
+
+    if is_binary(path):
+        return True, ""
+    # Detect the newline the way cookiecutter's generate_file does
+    with open(path, encoding="utf-8") as template_file:
+        template_file.readline()
+    newlines = template_file.newlines
+    newline = newlines[0] if isinstance(newlines, tuple) else newlines
+    return False, newline or os.linesep
+
+
+def _read_verbatim(path: str) -> tuple[bytes, int]:
+    """Return the content and permission bits of a file that is copied as is."""
+    with open(path, "rb") as template_file:
+        return template_file.read(), stat.S_IMODE(os.stat(path).st_mode)
+
+
+def _copy_dir(path: str, out_dir: str) -> Iterator[RenderedFile]:
+    """Yield every file below a copy-only directory verbatim."""
+    for root, _, files in sorted(os.walk(path)):
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            rel_path = os.path.relpath(file_path, path).replace(os.sep, "/")
+            yield RenderedFile(f"{out_dir}/{rel_path}", *_read_verbatim(file_path))
+
+
+def _render_content(rel_path: str, newline: str, context: dict[str, Any], env: Any) -> bytes:
+    """Render a template file's content with the newline style of the template file."""
+    from cookiecutter.exceptions import UndefinedVariableInTemplate  # noqa: PLC0415
+    from jinja2.exceptions import TemplateSyntaxError, UndefinedError  # noqa: PLC0415
+
+    try:
+        template = env.get_template(rel_path)
+    except TemplateSyntaxError as exception:
+        # Report the template's own location rather than Jinja's translated one
+        exception.translated = False
+        raise
+    try:
+        rendered: str = template.render(**context)
+    except UndefinedError as err:
+        msg = f"Unable to create file '{rel_path}'"
+        raise UndefinedVariableInTemplate(msg, err, context) from err
+
+    newline = context["cookiecutter"].get("_new_lines") or newline
+    if newline != "\n":
+        rendered = rendered.replace("\n", newline)
+    return rendered.encode("utf-8")
+
+
+def project_lock(repo_dir: str, manifest: dict[str, Any], variables: dict[str, Any]) -> bytes | None:
+    """Return the template's pre-resolved ``uv.lock`` for a set of answers.
+
+    Args:
+        repo_dir: Local template directory
+        manifest: The template's manifest
+        variables: Resolved template variables
+
+    Returns:
+        The lock file with the placeholder project name replaced, or None if
+        the template ships no lock for these answers
+    """
+    if "locks" not in manifest:
+        return None
+    locks_dir = os.path.join(repo_dir, manifest["locks"])
+    try:
+        with open(os.path.join(locks_dir, LOCK_INDEX), encoding="utf-8") as index_file:
+            index = json.load(index_file)
+    except FileNotFoundError:
+        return None
+    for entry in index["locks"]:
+        if _conditions_hold(entry["answers"], variables):
+            with open(os.path.join(locks_dir, entry["file"]), "rb") as lock_file:
+                content = lock_file.read()
+            # uv records the project under its normalized name (PEP 503)
+            name = re.sub(r"[-_.]+", "-", str(variables["project_name"])).lower()
+            placeholder = f'name = "{index["placeholder"]}"\n'.encode()
+            return content.replace(placeholder, f'name = "{name}"\n'.encode(), 1)
+    return None
+
+
+def render_files(repo_dir: str, context: dict[str, Any]) -> Iterator[RenderedFile]:
+    """Render the project files selected by the template's manifest.
+
+    Files are produced lazily, in a stable order, without touching the output
+    location. Excluded files are never opened.
+
+    Args:
+        repo_dir: Local template directory
+        context: Fully resolved context
+
+    Yields:
+        One ``RenderedFile`` per generated file, paths relative to the project directory
+
+    Raises:
+        UndefinedVariableInTemplate: If a name or file uses an undefined variable
+    """
+    from cookiecutter.generate import is_copy_only_path  # noqa: PLC0415
+
+    manifest = load_manifest(repo_dir)
+    excluded = excluded_paths(manifest, context["cookiecutter"])
+    renames: dict[str, str] = manifest.get("rename", {})
+    env, template_dir = _template_environment(repo_dir, context)
+
+    for root, dirs, files in os.walk(template_dir):
+        rel_root = os.path.relpath(root, template_dir).replace(os.sep, "/")
+        rel_root = "" if rel_root == "." else rel_root + "/"
+
+        render_dirs = []
+        for name in sorted(dirs):
+            rel_dir = rel_root + name
+            if is_excluded(rel_dir, excluded):
+                continue
+            if is_copy_only_path(os.path.normpath(rel_dir), context):
+                # Copy-only directories are copied whole; only their own name is rendered
+                yield from _copy_dir(os.path.join(root, name), _render_name(rel_dir, context, env))
+            else:
+                render_dirs.append(name)
+        # Only walk into directories that are rendered and not excluded
+        dirs[:] = render_dirs
+
+        for name in sorted(files):
+            rel_path = rel_root + name
+            if is_excluded(rel_path, excluded):
+                continue
+            path = os.path.join(root, name)
+            out_path = _render_name(renames.get(rel_path, rel_path), context, env)
+            if not os.path.basename(out_path):
+                # The name rendered to nothing: cookiecutter skips such files
+                continue
+            file_stat = os.stat(path)
+            binary, newline = _file_traits(path, file_stat.st_mtime_ns, file_stat.st_size)
+            if binary or is_copy_only_path(os.path.normpath(rel_path), context):
+                yield RenderedFile(out_path, *_read_verbatim(path))
+            else:
+                with span(out_path, "render"):
+                    content = _render_content(rel_path, newline, context, env)
+                yield RenderedFile(out_path, content, stat.S_IMODE(file_stat.st_mode))
+
+    lock = project_lock(repo_dir, manifest, context["cookiecutter"])
+    if lock is not None:
+        yield RenderedFile(LOCK_FILE, lock, 0o644)
+
+
+@functools.lru_cache(maxsize=64)
+def _snapshot_sha256(repo_dir: str) -> str:
+    """Hash a cached template once per process; its directory is named after its content, which never changes."""
+    return directory_digest(repo_dir)
+
+
+def _template_sha256(repo_dir: str) -> str:
+    """Hash a template, from memory for cached snapshots and afresh for checkouts, which may be edited."""
+    if os.path.dirname(repo_dir) == str(user_cache_dir() / "templates"):
+        return _snapshot_sha256(repo_dir)
+    return directory_digest(repo_dir)
+
+
+def answers_file(repo_dir: str, context: dict[str, Any], files: Iterable[RenderedFile]) -> RenderedFile:
+    """Record how a project was generated.
+
+    Args:
+        repo_dir: Local template directory
+        context: Fully resolved context
+        files: The rendered files of the project
+
+    Returns:
+        ``.uvi-answers.json``, holding the answers, the template's content
+        hash and the SHA-256 of every rendered file
+    """
+    variables = context["cookiecutter"]
+    record = {
+        "uvi_version": __version__,
+        "template": variables.get("_template", repo_dir),
+        "template_sha256": _template_sha256(os.path.abspath(repo_dir)),
+        "answers": {key: value for key, value in variables.items() if not key.startswith("_")},
+        "files": {rendered.path: hashlib.sha256(rendered.content).hexdigest() for rendered in files},
+    }
+    return RenderedFile(ANSWERS_FILE, (json.dumps(record, indent=2, sort_keys=True) + "\n").encode(), 0o644)
+
+
+def write_files(files: Iterable[RenderedFile], project_dir: str) -> None:
+    """Write rendered files below ``project_dir``, creating directories as needed.
+
+    Args:
+        files: Files from ``render_files``
+        project_dir: Project directory the paths are relative to
+    """
+    for rendered in files:
+        path = os.path.join(project_dir, *rendered.path.split("/"))
+        with span(rendered.path, "write", size=len(rendered.content)):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as out_file:
+                out_file.write(rendered.content)
+            os.chmod(path, rendered.mode)
+
+
+def generate_project(
+    repo_dir: str,
+    context: dict[str, Any],
+    output_dir: str = ".",
+    overwrite_if_exists: bool = False,
+    accept_hooks: bool = True,
+) -> str:
+    """Render a resolved context into a new project directory.
+
+    The manifest-aware counterpart of ``cookiecutter.generate.generate_files``,
+    including its pre/post hooks and its cleanup of a half-written project.
+    Hooks run through ``uvi.hooks.run_hook``, in-process where the template
+    allows it.
+
+    Args:
+        repo_dir: Local template directory
+        context: Fully resolved context
+        output_dir: Directory the project directory is created in
+        overwrite_if_exists: Write into an existing project directory
+        accept_hooks: Run the template's pre/post generation hooks
+
+    Returns:
+        Path of the generated project
+
+    Raises:
+        OutputDirExistsException: If the project directory exists and overwriting is off
+    """
+    from cookiecutter.exceptions import OutputDirExistsException  # noqa: PLC0415
+
+    # uvi.hooks builds on the manifest helpers above
+    from .hooks import run_hook  # noqa: PLC0415
+
+    project_dir = os.path.abspath(os.path.join(output_dir, project_dir_name(repo_dir, context)))
+    created = not os.path.exists(project_dir)
+    if not created and not overwrite_if_exists:
+        msg = f'Error: "{project_dir}" directory already exists'
+        raise OutputDirExistsException(msg)
+    os.makedirs(project_dir, exist_ok=True)
+
+    if accept_hooks:
+        run_hook(repo_dir, "pre_gen_project", project_dir, context, created)
+    try:
+        with span("generate", project=project_dir):
+            files = list(render_files(repo_dir, context))
+            write_files([*files, answers_file(repo_dir, context, files)], project_dir)
+    except Exception:
+        if created:
+            shutil.rmtree(project_dir, ignore_errors=True)
+        raise
+    if accept_hooks:
+        run_hook(repo_dir, "post_gen_project", project_dir, context, created)
+    return project_dir
+
+
+def project_manifest(project_name: str, files: Iterable[RenderedFile]) -> dict[str, Any]:
+    """Describe a rendered project without writing it.
+
+    Args:
+        project_name: Name of the project directory
+        files: Files from ``render_files``
+
+    Returns:
+        JSON-serialisable dict with the project directory, file count, total
+        size and, per file in path order, its size, permission bits and SHA-256
+    """
+    entries = [
+        {
+            "path": rendered.path,
+            "size": len(rendered.content),
+            "mode": f"{rendered.mode:04o}",
+            "sha256": hashlib.sha256(rendered.content).hexdigest(),
+        }
+        for rendered in sorted(files)
+    ]
+    return {
+        "project": project_name,
+        "file_count": len(entries),
+        "total_size": sum(entry["size"] for entry in entries),
+        "files": entries,
+    }
+
+
+@contextlib.contextmanager
+def prepared_context(
+    template: str,
+    extra_context: dict[str, Any] | None = None,
+    no_input: bool = False,
+    output_dir: str = ".",
+    validate: Callable[[dict[str, Any]], None] | None = None,
+) -> Iterator[tuple[str, dict[str, Any], dict[str, Any]]]:
+    """Locate the template and collect the answers, like ``cookiecutter()`` does.
+
+    Honours the user's cookiecutter config (default context, abbreviations)
+    and clones remote templates the same way; a cloned template is removed
+    again when the block ends.
+
+    Args:
+        template: Local template directory or repository URL
+        extra_context: Values that take precedence over the template defaults
+        no_input: Accept the defaults instead of prompting
+        output_dir: Directory the project directory is to be created in
+        validate: Called with the answers (the ``cookiecutter`` part of the
+            context) before anything is written; raise to stop
+
+    Yields:
+        Tuple of the local template directory, the resolved context and the
+        user's cookiecutter config
+    """
+    from cookiecutter.config import get_user_config  # noqa: PLC0415
+    from cookiecutter.generate import generate_context  # noqa: PLC0415
+    from cookiecutter.prompt import prompt_for_config  # noqa: PLC0415
+    from cookiecutter.repository import determine_repo_dir  # noqa: PLC0415
+
+    with span("cookiecutter-config"):
+        config_dict = get_user_config()
+        repo_dir, cleanup = determine_repo_dir(
+            template=template,
+            abbreviations=config_dict["abbreviations"],
+            clone_to_dir=config_dict["cookiecutters_dir"],
+            checkout=None,
+            no_input=no_input,
+        )
+    try:
+        with span("context"):
+            context = generate_context(
+                context_file=os.path.join(repo_dir, "cookiecutter.json"),
+                default_context=config_dict["default_context"],
+                extra_context=extra_context,
+            )
+        variables = context["cookiecutter"]
+        context["_cookiecutter"] = {key: value for key, value in variables.items() if not key.startswith("_")}
+        # Same as cookiecutter's own import patch, for templates with local extensions
+        sys.path.append(repo_dir)
+        try:
+            with span("prompt"):
+                variables.update(prompt_for_config(context, no_input))
+            if validate is not None:
+                with span("validate"):
+                    validate(variables)
+            variables["_template"] = template
+            variables["_output_dir"] = os.path.abspath(output_dir)
+            variables["_repo_dir"] = repo_dir
+            variables["_checkout"] = None
+            yield repo_dir, context, config_dict
+        finally:
+            sys.path.remove(repo_dir)
+    finally:
+        if cleanup:
+            shutil.rmtree(repo_dir, ignore_errors=True)
+
+
+def preview_project(
+    template: str,
+    extra_context: dict[str, Any] | None = None,
+    no_input: bool = False,
+    validate: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """Collect the answers and render the project in memory only (``uvi --dry-run``).
+
+    Runs the same pipeline as ``create_project`` (context, prompts,
+    validation, rendering and manifest pruning) but writes nothing: neither
+    the project nor cookiecutter's replay file. Generation hooks are not run,
+    as they act on the written project; ``validate`` covers what the bundled
+    template's pre-generation hook checks.
+
+    Args:
+        template: Local template directory or repository URL
+        extra_context: Values that take precedence over the template defaults
+        no_input: Accept the defaults instead of prompting
+        validate: Called with the answers before rendering; raise to stop
+
+    Returns:
+        The ``project_manifest`` of the project that would be generated
+    """
+    with (
+        prepared_context(template, extra_context, no_input, validate=validate) as (repo_dir, context, _),
+        span("render"),
+    ):
+        files = list(render_files(repo_dir, context))
+        return project_manifest(project_dir_name(repo_dir, context), [*files, answers_file(repo_dir, context, files)])
+
+
+def archive_project(  # noqa: PLR0913 - create_project's options plus the archive's
+    template: str,
+    archive_format: str,
+    output: str | IO[bytes] | None = None,
+    *,
+    extra_context: dict[str, Any] | None = None,
+    no_input: bool = False,
+    validate: Callable[[dict[str, Any]], None] | None = None,
+) -> str:
+    """Collect the answers and stream the project into an archive (``uvi --archive``).
+
+    Each file goes into the archive as soon as it is rendered; no project
+    directory is written. As with ``preview_project``, the answers are
+    validated up front and the hooks do not run: the manifest already applies
+    the post-generation pruning and renames, and adds the ``uv.lock``.
+
+    Args:
+        template: Local template directory or repository URL
+        archive_format: One of ``uvi.archive.ARCHIVE_FORMATS``
+        output: Archive path, a binary stream such as ``sys.stdout.buffer``
+            (left open), or None for ``<project>.<format>`` in the current directory
+        extra_context: Values that take precedence over the template defaults
+        no_input: Accept the defaults instead of prompting
+        validate: Called with the answers before rendering; raise to stop
+
+    Returns:
+        Name of the project directory the archive holds
+
+    Raises:
+        ValueError: If the archive format is unknown
+    """
+    # uvi.archive builds on RenderedFile above
+    from .archive import ARCHIVE_FORMATS, write_archive  # noqa: PLC0415
+
+    if archive_format not in ARCHIVE_FORMATS:
+        msg = f"unknown archive format {archive_format!r} (choose from {', '.join(ARCHIVE_FORMATS)})"
+        raise ValueError(msg)
+    with prepared_context(template, extra_context, no_input, validate=validate) as (repo_dir, context, _):
+        name = project_dir_name(repo_dir, context)
+        rendered: list[RenderedFile] = []
+
+        def files() -> Iterator[RenderedFile]:
+            for file in render_files(repo_dir, context):
+                rendered.append(file)
+                yield file
+            yield answers_file(repo_dir, context, rendered)
+
+        if output is not None and not isinstance(output, str):
+            with span("archive", format=archive_format):
+                write_archive(files(), output, archive_format, name)
+            output.flush()
+            return name
+        path = output or f"{name}.{archive_format}"
+        try:
+            with open(path, "wb") as archive_file, span("archive", format=archive_format):
+                write_archive(files(), archive_file, archive_format, name)
+        except BaseException:
+            # Do not leave a truncated archive behind
+            with contextlib.suppress(OSError):
+                os.remove(path)
+            raise
+        return name
+
+
+def create_project(
+    template: str,
+    extra_context: dict[str, Any] | None = None,
+    no_input: bool = False,
+    output_dir: str = ".",
+    validate: Callable[[dict[str, Any]], None] | None = None,
+) -> str:
+    """Prompt for the answers and generate a project, like ``cookiecutter()``.
+
+    Honours the user's cookiecutter config (default context, abbreviations,
+    replay directory) and clones remote templates the same way.
+
+    Args:
+        template: Local template directory or repository URL
+        extra_context: Values that take precedence over the template defaults
+        no_input: Accept the defaults instead of prompting
+        output_dir: Directory the project directory is created in
+        validate: Called with the answers (the ``cookiecutter`` part of the
+            context) before anything is written; raise to stop
+
+    Returns:
+        Path of the generated project
+    """
+    from cookiecutter.replay import dump  # noqa: PLC0415
+
+    with prepared_context(template, extra_context, no_input, output_dir, validate) as (repo_dir, context, config):
+        with span("replay"):
+            dump(config["replay_dir"], os.path.basename(os.path.abspath(repo_dir)), context)
+        return generate_project(repo_dir, context, output_dir)
@@ -0,0 +1,270 @@
+"""Dependency cache seeding for UVI.
+
+A new project's first ``uv sync`` resolves and downloads its whole dev
+dependency group (pytest, pre-commit, tox-uv, mypy, ruff and, depending on
+the answers, deptry, pytest-cov, pytest-benchmark and the MkDocs stack). ``uvi cache warm`` does
+that work ahead of time, once per dependency set the template can produce,
+so generated projects sync from uv's cache without a network connection
+(``uv sync --offline``).
+
+Which answers matter is read from the template: every choice variable that
+the dependency tables of ``pyproject.toml`` refer to (``deptry``, ``codecov``,
+``mkdocs`` and ``benchmarks`` for the bundled template) gives one dependency
+set per combination; answers that only change ``[tool.*]`` settings do not. Each set is
+rendered into a throwaway project and synced there, which fills uv's cache
+with the wheels, the build backend and the package metadata an offline
+resolve needs. Pass ``--uv-cache-dir`` to seed a shared cache, for example
+one that offline build agents point ``UV_CACHE_DIR`` at.
+
+Warmed sets are recorded in ``<uvi cache>/warm.json`` by template hash, so
+warming again only syncs what is new, and ``uvi --bootstrap`` can tell when a
+project's dependencies are already cached and sync it offline.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple
+
+from . import render
+from .batch import load_template_context, resolve_spec
+from .cache import user_cache_dir, write_json_atomic
+from .profile import span
+from .template import directory_digest, find_template
+
+# Template file whose content decides the dependency set
+DEPENDENCY_TEMPLATE = "pyproject.toml"
+
+# Name of the throwaway projects synced to warm the cache
+WARM_PROJECT_NAME = "uvi-cache-warm"
+
+WARM_RECORD = "warm.json"
+
+CONTEXT_VARIABLE = re.compile(r"cookiecutter\.(\w+)")
+
+# Tables of pyproject.toml that uv resolves into uv.lock
+DEPENDENCY_TABLES = ("project", "project.optional-dependencies", "dependency-groups")
+TABLE_HEADER = re.compile(r"^\[([\w.-]+)\][ \t]*$", re.MULTILINE)
+
+
+class WarmResult(NamedTuple):
+    """Outcome of warming one dependency set: ``ok``, ``cached`` or ``failed``."""
+
+    key: str
+    status: str
+    seconds: float
+    output: str
+
+
+def dependency_tables(pyproject: str) -> str:
+    """Return the tables of a ``pyproject.toml`` that uv resolves, concatenated.
+
+    Args:
+        pyproject: The file's text, rendered or not
+
+    Returns:
+        The header and body of each table in ``DEPENDENCY_TABLES``, in file order
+    """
+    parts = TABLE_HEADER.split(pyproject)
+    return "".join(
+        f"[{name}]{body}" for name, body in zip(parts[1::2], parts[2::2], strict=True) if name in DEPENDENCY_TABLES
+    )
+
+
+def dependency_switches(repo_dir: str, template_context: dict[str, Any]) -> list[str]:
+    """Return the choice variables the dependencies in the template's ``pyproject.toml`` depend on.
+
+    Args:
+        repo_dir: Local template directory
+        template_context: Parsed template context from ``load_template_context``
+
+    Returns:
+        Variable names, sorted
+    """
+    template_dir = render.project_template_dir(repo_dir, template_context)
+    with open(os.path.join(template_dir, DEPENDENCY_TEMPLATE), encoding="utf-8") as template_file:
+        names = set(CONTEXT_VARIABLE.findall(dependency_tables(template_file.read())))
+    variables = template_context["cookiecutter"]
+    return sorted(name for name in names if isinstance(variables.get(name), list))
+
+
+def dependency_key(answers: dict[str, Any], switches: list[str]) -> str:
+    """Name a dependency set, e.g. ``codecov=y,deptry=n,mkdocs=y``."""
+    return ",".join(f"{name}={answers[name]}" for name in switches)
+
+
+def dependency_sets(
+    repo_dir: str, template_context: dict[str, Any], answers: dict[str, Any] | None = None
+) -> dict[str, dict[str, str]]:
+    """List the dependency sets to warm.
+
+    Args:
+        repo_dir: Local template directory
+        template_context: Parsed template context from ``load_template_context``
+        answers: Only warm the set these answers select (defaults filled in);
+            by default every combination is warmed
+
+    Returns:
+        The switch values of each set, by ``dependency_key``
+    """
+    switches = dependency_switches(repo_dir, template_context)
+    variables = template_context["cookiecutter"]
+    if answers is not None:
+        chosen = {name: answers.get(name, variables[name][0]) for name in switches}
+        return {dependency_key(chosen, switches): chosen}
+    combinations = (
+        dict(zip(switches, values, strict=True))
+        for values in itertools.product(*(variables[name] for name in switches))
+    )
+    return {dependency_key(combination, switches): combination for combination in combinations}
+
+
+def _load_record() -> dict[str, Any]:
+    """Read the warmed dependency sets, or an empty record."""
+    try:
+        with open(user_cache_dir() / WARM_RECORD, encoding="utf-8") as record_file:
+            record = json.load(record_file)
+    except (OSError, ValueError):
+        return {}
+    return record if isinstance(record, dict) else {}
+
+
+def _record_key(template_sha256: str, key: str, uv_cache_dir: str | None) -> str:
+    """Identify a warmed set by template, dependency set and uv cache."""
+    return f"{uv_cache_dir or 'default'}|{template_sha256}|{key}"
+
+
+def is_warm(project_dir: str, repo_dir: str, uv_cache_dir: str | None = None) -> bool:
+    """Check whether a generated project's dependencies have been cached.
+
+    Args:
+        project_dir: Project with a ``.uvi-answers.json``
+        repo_dir: Local template directory the project was generated from
+        uv_cache_dir: uv cache to check (defaults to ``UV_CACHE_DIR`` or uv's own default)
+
+    Returns:
+        True if ``uvi cache warm`` synced the project's dependency set
+    """
+    try:
+        with open(os.path.join(project_dir, render.ANSWERS_FILE), encoding="utf-8") as answers_file:
+            generated = json.load(answers_file)
+    except (OSError, ValueError):
+        return False
+    uv_cache_dir = uv_cache_dir or os.environ.get("UV_CACHE_DIR")
+    if not os.path.isdir(repo_dir) or generated.get("template_sha256") != directory_digest(repo_dir):
+        return False
+    template_context = load_template_context(repo_dir)
+    switches = dependency_switches(repo_dir, template_context)
+    if any(name not in generated.get("answers", {}) for name in switches):
+        return False
+    key = dependency_key(generated["answers"], switches)
+    return _record_key(generated["template_sha256"], key, uv_cache_dir) in _load_record()
+
+
+def _warm_set(
+    repo_dir: str, template_context: dict[str, Any], key: str, switches: dict[str, str], uv_cache_dir: str | None
+) -> WarmResult:
+    """Render one dependency set into a throwaway project and sync it."""
+    start = time.perf_counter()
+    context = resolve_spec(template_context, {"project_name": WARM_PROJECT_NAME, **switches})
+    env = dict(os.environ)
+    if uv_cache_dir:
+        env["UV_CACHE_DIR"] = uv_cache_dir
+    with tempfile.TemporaryDirectory(prefix="uvi-warm-") as project_dir, span(key, "subprocess", command="uv sync"):
+        render.write_files(render.render_files(repo_dir, context), project_dir)
+        completed = subprocess.run(
+            ["uv", "sync", "--all-groups"],  # noqa: S607
+            cwd=project_dir,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    status = "ok" if completed.returncode == 0 else "failed"
+    return WarmResult(key, status, time.perf_counter() - start, completed.stdout + completed.stderr)
+
+
+def warm_cache(
+    repo_dir: str | None = None,
+    answers: dict[str, Any] | None = None,
+    uv_cache_dir: str | None = None,
+    refresh: bool = False,
+    jobs: int | None = None,
+) -> list[WarmResult]:
+    """Sync every dependency set the template can produce into uv's cache.
+
+    Args:
+        repo_dir: Local template directory (defaults to the bundled template)
+        answers: Only warm the set these answers select
+        uv_cache_dir: uv cache to seed (defaults to ``UV_CACHE_DIR`` or uv's own default)
+        refresh: Sync sets that were warmed before, too
+        jobs: Number of sets synced at once (defaults to all of them)
+
+    Returns:
+        A result per dependency set, in key order
+
+    Raises:
+        FileNotFoundError: If uv is not installed
+    """
+    if shutil.which("uv") is None:
+        msg = "uv is not installed; see https://docs.astral.sh/uv/"
+        raise FileNotFoundError(msg)
+    repo_dir = repo_dir or find_template()
+    uv_cache_dir = uv_cache_dir or os.environ.get("UV_CACHE_DIR")
+    template_context = load_template_context(repo_dir)
+    template_sha256 = directory_digest(repo_dir)
+    sets = dependency_sets(repo_dir, template_context, answers)
+    record = _load_record()
+
+    results: dict[str, WarmResult] = {}
+    todo = {}
+    for key, switches in sets.items():
+        if not refresh and _record_key(template_sha256, key, uv_cache_dir) in record:
+            results[key] = WarmResult(key, "cached", 0.0, "")
+        else:
+            todo[key] = switches
+    if todo:
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs or len(todo), len(todo)))) as pool:
+            futures = [
+                pool.submit(_warm_set, repo_dir, template_context, key, switches, uv_cache_dir)
+                for key, switches in todo.items()
+            ]
+            for future in futures:
+                result = future.result()
+                results[result.key] = result
+                if result.status == "ok":
+                    record[_record_key(template_sha256, result.key, uv_cache_dir)] = time.time()
+        write_json_atomic(user_cache_dir() / WARM_RECORD, record)
+    return [results[key] for key in sorted(results)]
+
+
+def run_warm_cache(
+    repo_dir: str | None = None,
+    answers: dict[str, Any] | None = None,
+    uv_cache_dir: str | None = None,
+    refresh: bool = False,
+    jobs: int | None = None,
+) -> int:
+    """Warm the dependency cache and print the outcome per dependency set.
+
+    Returns:
+        Number of dependency sets that failed to sync
+    """
+    results = warm_cache(repo_dir, answers, uv_cache_dir, refresh, jobs)
+    for result in results:
+        detail = "already cached" if result.status == "cached" else f"{result.seconds:.1f}s"
+        print(f"{result.status:>7}  {result.key} ({detail})")
+    failed = [result for result in results if result.status == "failed"]
+    for result in failed:
+        print(f"\n{result.key} failed:\n{result.output.rstrip()}")
+    if not failed:
+        print("Generated projects with these answers can now run 'uv sync --offline'")
+    return len(failed)
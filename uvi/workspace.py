@@ -0,0 +1,242 @@
+"""uv workspace generation for UVI.
+
+``uvi workspace NAME MEMBER...`` renders a root project plus one member
+package per MEMBER from the same template, in one pass. The root keeps the
+shared tooling (the dev dependency group, pre-commit, mypy, ruff, pytest, CI,
+docs) and lists the members under ``[tool.uv.workspace]``; each member under
+``packages/`` keeps only its package, tests, benchmarks and its own
+``[project]`` table. The whole workspace has one ``uv.lock`` and one
+environment, so resolving and installing is paid once instead of once per
+package.
+
+The template decides the split through two private variables: ``_workspace``
+is ``"root"`` or ``"member"`` (empty for a standalone project), and the root
+gets ``_workspace_members``, mapping each member's name to its package.
+
+The lock is derived from the template's pre-resolved lock for the answers
+(see ``uvi.render.project_lock``): members add no dependencies of their own,
+so the root's resolution only needs the members recorded as editable
+workspace packages.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import shutil
+from collections.abc import Iterator
+from typing import Any
+
+from . import render
+from .batch import load_template_context, resolve_spec
+from .profile import span
+from .template import find_template
+
+# Directory of the root project the members are generated in
+MEMBERS_DIR = "packages"
+
+PACKAGE_HEADER = "\n[[package]]\n"
+PACKAGE_NAME = re.compile(r'^name = "([^"]+)"$', re.MULTILINE)
+PROJECT_VERSION = re.compile(r'^version = "([^"]+)"$', re.MULTILINE)
+
+
+def normalize_name(name: str) -> str:
+    """Return a project name the way uv records it (PEP 503)."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def resolve_workspace(
+    template_context: dict[str, Any],
+    name: str,
+    members: list[str],
+    answers: dict[str, Any] | None = None,
+    defaults: dict[str, str] | None = None,
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Resolve the contexts of a workspace root and its members.
+
+    Every project gets the same answers; only the project names differ.
+
+    Args:
+        template_context: Parsed template context from ``load_template_context``
+        name: Project name of the workspace root
+        members: Project names of the member packages
+        answers: Answers shared by the root and every member
+        defaults: Overrides applied before the answers, such as detected author details
+
+    Returns:
+        The root's context and the members' contexts, in member order
+
+    Raises:
+        ValueError: If there are no members, a name is invalid or two names
+            are the same once normalized
+    """
+    if not members:
+        msg = "a workspace needs at least one member package"
+        raise ValueError(msg)
+    seen: dict[str, str] = {}
+    for project_name in [name, *members]:
+        normalized = normalize_name(project_name)
+        if normalized in seen:
+            other = seen[normalized]
+            msg = (
+                f"project name {project_name!r} is used twice"
+                if other == project_name
+                else f"project name {project_name!r} clashes with {other!r}"
+            )
+            raise ValueError(msg)
+        seen[normalized] = project_name
+
+    shared = dict(answers or {})
+    member_contexts = [
+        resolve_spec(template_context, {**shared, "project_name": member, "_workspace": "member"}, defaults)
+        for member in members
+    ]
+    slugs = {
+        context["cookiecutter"]["project_name"]: context["cookiecutter"]["project_slug"] for context in member_contexts
+    }
+    root_context = resolve_spec(
+        template_context,
+        {**shared, "project_name": name, "_workspace": "root", "_workspace_members": slugs},
+        defaults,
+    )
+    return root_context, member_contexts
+
+
+def _package_name(block: str) -> str:
+    """Return the name of a ``[[package]]`` entry of a ``uv.lock``."""
+    match = PACKAGE_NAME.search(block)
+    return match.group(1) if match else ""
+
+
+def workspace_lock(lock: str, root: str, members: dict[str, str]) -> str:
+    """Turn a project's pre-resolved ``uv.lock`` into the lock of a workspace.
+
+    The project becomes the virtual workspace root depending on every
+    member, and each member is recorded as an editable package.
+
+    Args:
+        lock: The root project's lock, from ``uvi.render.project_lock``
+        root: Project name of the workspace root
+        members: Version of each member, by project name
+
+    Returns:
+        The workspace's lock, as ``uv lock`` would write it
+
+    Raises:
+        ValueError: If a member has the name of one of the locked dependencies
+    """
+    header, *packages = lock.split(PACKAGE_HEADER)
+    root_name = normalize_name(root)
+    names = {normalize_name(member): member for member in members}
+    clashes = sorted(names.keys() & ({_package_name(package) for package in packages} - {root_name}))
+    if clashes:
+        msg = f"member name(s) clash with the workspace's dependencies: {', '.join(clashes)}"
+        raise ValueError(msg)
+
+    dependencies = "".join(f'    {{ name = "{name}" }},\n' for name in sorted(names))
+    requires = "".join(
+        f'    {{ name = "{name}", editable = "{MEMBERS_DIR}/{names[name]}" }},\n' for name in sorted(names)
+    )
+    blocks = [
+        package.replace(
+            'source = { editable = "." }\n', f'source = {{ virtual = "." }}\ndependencies = [\n{dependencies}]\n', 1
+        ).replace("[package.metadata]\n", f"[package.metadata]\nrequires-dist = [\n{requires}]\n", 1)
+        if _package_name(package) == root_name
+        else package
+        for package in packages
+    ]
+    blocks.extend(
+        f'name = "{name}"\nversion = "{members[names[name]]}"\nsource = {{ editable = "{MEMBERS_DIR}/{names[name]}" }}\n'
+        for name in names
+    )
+    # uv orders packages by name; sorting is stable, so versions of one name keep their order
+    blocks.sort(key=_package_name)
+
+    manifest = "".join(f'    "{name}",\n' for name in sorted([*names, root_name]))
+    return PACKAGE_HEADER.join([f"{header}\n[manifest]\nmembers = [\n{manifest}]\n", *blocks])
+
+
+def render_workspace(
+    repo_dir: str, root_context: dict[str, Any], member_contexts: list[dict[str, Any]]
+) -> Iterator[render.RenderedFile]:
+    """Render a workspace's files, paths relative to the root project directory.
+
+    Args:
+        repo_dir: Local template directory
+        root_context: Resolved context of the root, from ``resolve_workspace``
+        member_contexts: Resolved contexts of the members
+
+    Yields:
+        The root's files, then each member's below ``packages/<member>/``,
+        then the workspace's ``uv.lock`` if the template ships a lock for the answers
+
+    Raises:
+        ValueError: If a member has the name of one of the locked dependencies
+    """
+    lock = None
+    for rendered in render.render_files(repo_dir, root_context):
+        if rendered.path == render.LOCK_FILE:
+            lock = rendered.content.decode("utf-8")
+        else:
+            yield rendered
+
+    versions = {}
+    for context in member_contexts:
+        member = context["cookiecutter"]["project_name"]
+        for rendered in render.render_files(repo_dir, context):
+            if rendered.path == render.LOCK_FILE:
+                continue
+            if rendered.path == "pyproject.toml" and (
+                match := PROJECT_VERSION.search(rendered.content.decode("utf-8"))
+            ):
+                versions[member] = match.group(1)
+            yield rendered._replace(path=f"{MEMBERS_DIR}/{member}/{rendered.path}")
+
+    if lock is not None:
+        content = workspace_lock(lock, root_context["cookiecutter"]["project_name"], versions)
+        yield render.RenderedFile(render.LOCK_FILE, content.encode("utf-8"), 0o644)
+
+
+def generate_workspace(  # noqa: PLR0913 - the workspace's names plus a single project's options
+    name: str,
+    members: list[str],
+    output_dir: str = ".",
+    *,
+    answers: dict[str, Any] | None = None,
+    defaults: dict[str, str] | None = None,
+    template: str | None = None,
+) -> str:
+    """Generate a uv workspace with its member packages.
+
+    Args:
+        name: Project name of the workspace root
+        members: Project names of the member packages
+        output_dir: Directory the workspace directory is created in
+        answers: Answers shared by the root and every member
+        defaults: Overrides applied before the answers, such as detected author details
+        template: Local template directory (defaults to the bundled template)
+
+    Returns:
+        Path of the generated workspace
+
+    Raises:
+        OutputDirExistsException: If the workspace directory exists
+        ValueError: If the answers or the names are invalid
+    """
+    from cookiecutter.exceptions import OutputDirExistsException  # noqa: PLC0415
+
+    repo_dir = template or find_template()
+    root_context, member_contexts = resolve_workspace(load_template_context(repo_dir), name, members, answers, defaults)
+    workspace_dir = os.path.abspath(os.path.join(output_dir, render.project_dir_name(repo_dir, root_context)))
+    if os.path.exists(workspace_dir):
+        msg = f'Error: "{workspace_dir}" directory already exists'
+        raise OutputDirExistsException(msg)
+
+    os.makedirs(workspace_dir)
+    try:
+        with span("workspace", project=workspace_dir, members=len(members)):
+            render.write_files(render_workspace(repo_dir, root_context, member_contexts), workspace_dir)
+    except Exception:
+        shutil.rmtree(workspace_dir, ignore_errors=True)
+        raise
+    return workspace_dir
@@ -0,0 +1,62 @@
+"""Compare benchmark results with a baseline and fail on regressions.
+
+Both files are ``pytest --benchmark-json`` reports. A benchmark regresses when
+its median time grows by more than the threshold; benchmarks missing from
+either file are listed but never fail the comparison. Without a baseline
+there is nothing to compare against, and the script succeeds.
+
+Usage:
+    python benchmarks/compare.py BASELINE CURRENT [--threshold PERCENT]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def load_medians(path: Path) -> dict[str, float]:
+    """Read the median time of each benchmark in a report, in seconds."""
+    with path.open(encoding="utf-8") as report:
+        return {benchmark["fullname"]: benchmark["stats"]["median"] for benchmark in json.load(report)["benchmarks"]}
+
+
+def compare(baseline: dict[str, float], current: dict[str, float], threshold: float) -> list[str]:
+    """Print a comparison table and return the benchmarks slower than ``threshold`` percent."""
+    regressions = []
+    width = max((len(name) for name in {*baseline, *current}), default=0)
+    for name in sorted({*baseline, *current}):
+        if name not in current or name not in baseline:
+            print(f"{name:<{width}}  {'removed' if name not in current else 'new'}")
+            continue
+        change = (current[name] - baseline[name]) / baseline[name] * 100
+        verdict = "REGRESSION" if change > threshold else "ok"
+        print(
+            f"{name:<{width}}  {baseline[name] * 1e6:10.3f}us -> {current[name] * 1e6:10.3f}us  {change:+7.1f}%  {verdict}"
+        )
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Fail when benchmarks got slower than a baseline.")
+    parser.add_argument("baseline", type=Path, help="baseline report")
+    parser.add_argument("current", type=Path, help="report to check")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed slowdown in percent (default: 10)")
+    args = parser.parse_args()
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run 'make bench-baseline' to save one")
+        return 0
+    regressions = compare(load_medians(args.baseline), load_medians(args.current), args.threshold)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:g}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
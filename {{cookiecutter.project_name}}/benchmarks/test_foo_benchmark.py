@@ -0,0 +1,5 @@
+from {{cookiecutter.project_slug}}.foo import foo
+
+
+def test_foo(benchmark):
+    assert benchmark(foo, "foo") == "foo"
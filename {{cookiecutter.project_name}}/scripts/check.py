@@ -0,0 +1,156 @@
+"""Run the code quality tools side by side and time each one.
+
+``make check`` runs this script. It first confirms that ``uv.lock`` matches
+``pyproject.toml``, then runs pre-commit (ruff, formatting and the file
+checks), which may fix files, and once it is done {% if cookiecutter.deptry == 'y' %}mypy and deptry concurrently{% else %}mypy{% endif %}.
+It prints each tool's output as it finishes and a timing summary at the end.
+
+Usage:
+    python scripts/check.py [--changed [BASE]] [--no-daemon]
+
+``--changed`` lints only the files that differ from where the current branch
+left BASE (``origin/main`` by default), including uncommitted and untracked
+files. Type checking always covers the whole project, since a change can
+break code that did not change. mypy runs through its daemon, which keeps
+the analysed project in memory between runs; ``--no-daemon`` runs plain mypy,
+which still reuses ``.mypy_cache``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import NamedTuple
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+class Check(NamedTuple):
+    """A tool to run: a name for the report, its command and its directory."""
+
+    name: str
+    command: list[str]
+    cwd: Path = PROJECT_DIR
+
+
+class Result(NamedTuple):
+    """The outcome of one check."""
+
+    check: Check
+    returncode: int
+    seconds: float
+    output: str
+
+
+def run_check(check: Check) -> Result:
+    """Run a check, capturing its output so concurrent checks do not interleave."""
+    start = time.perf_counter()
+    completed = subprocess.run(  # noqa: S603 - fixed tool commands
+        check.command, cwd=check.cwd, capture_output=True, text=True, check=False
+    )
+    return Result(check, completed.returncode, time.perf_counter() - start, completed.stdout + completed.stderr)
+
+
+def git_lines(*args: str) -> list[str]:
+    """Run a git command in the project and return its output lines."""
+    completed = subprocess.run(  # noqa: S603 - fixed git commands
+        ["git", *args],  # noqa: S607 - git is found on PATH
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return completed.stdout.splitlines()
+
+
+def changed_files(base: str) -> list[str]:
+    """Return the files added or modified since the current branch left ``base``, committed or not."""
+    merge_base = git_lines("merge-base", base, "HEAD")[0]
+    changed = git_lines("diff", "--name-only", "--relative", "--diff-filter=d", merge_base)
+    untracked = git_lines("ls-files", "--others", "--exclude-standard")
+    return sorted(set(changed + untracked))
+
+
+def lint_check(changed: list[str] | None) -> Check | None:
+    """Return the pre-commit check, on every file or only on ``changed``; None if nothing changed."""
+    if changed is None:
+        return Check("pre-commit", ["uv", "run", "pre-commit", "run", "--all-files"])
+    if changed:
+        return Check("pre-commit", ["uv", "run", "pre-commit", "run", "--files", *changed])
+    return None
+
+
+def analysis_checks(daemon: bool) -> list[Check]:
+    """List the checks that only read the code, and so can run concurrently."""
+    checks = [Check("mypy", ["uv", "run", "dmypy", "run"] if daemon else ["uv", "run", "mypy"])]
+{%- if cookiecutter.deptry == 'y' %}
+{%- if cookiecutter._workspace == "root" %}
+    checks.extend(
+        Check(f"deptry ({package.name})", ["uv", "run", "deptry", "."], package)
+        for package in sorted((PROJECT_DIR / "packages").iterdir())
+        if (package / "pyproject.toml").is_file()
+    )
+{%- else %}
+    checks.append(Check("deptry", ["uv", "run", "deptry", "."]))
+{%- endif %}
+{%- endif %}
+    return checks
+
+
+def report(result: Result) -> None:
+    """Print a finished check's output under a header with its outcome."""
+    outcome = "passed" if result.returncode == 0 else "failed"
+    print(f"🚀 {result.check.name} {outcome} in {result.seconds:.2f}s", flush=True)
+    if result.output.strip():
+        print(result.output.rstrip(), flush=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the code quality tools side by side.")
+    parser.add_argument(
+        "--changed",
+        nargs="?",
+        const="origin/main",
+        default=None,
+        metavar="BASE",
+        help="lint only the files changed since the branch left BASE (default: origin/main)",
+    )
+    parser.add_argument("--no-daemon", action="store_true", help="run plain mypy instead of the mypy daemon")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    # uv run would update an outdated lock file, so it is checked before any tool starts
+    results = [run_check(Check("uv lock", ["uv", "lock", "--locked"]))]
+    report(results[0])
+    if results[0].returncode != 0:
+        return 1
+
+    # pre-commit's ruff hook fixes files in place, so it finishes before anything reads them
+    lint = lint_check(changed_files(args.changed) if args.changed else None)
+    if lint is None:
+        print(f"🚀 pre-commit skipped: no files changed since {args.changed}")
+    else:
+        results.append(run_check(lint))
+        report(results[-1])
+
+    checks = analysis_checks(daemon=not args.no_daemon)
+    with ThreadPoolExecutor(max_workers=len(checks)) as pool:
+        for future in as_completed([pool.submit(run_check, check) for check in checks]):
+            results.append(future.result())
+            report(results[-1])
+
+    print("\nTimings:")
+    width = max(len(result.check.name) for result in results)
+    for result in results:
+        outcome = "ok" if result.returncode == 0 else "FAILED"
+        print(f"  {result.check.name:<{width}}  {result.seconds:6.2f}s  {outcome}")
+    print(f"  {'total':<{width}}  {time.perf_counter() - start:6.2f}s")
+    return 1 if any(result.returncode != 0 for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
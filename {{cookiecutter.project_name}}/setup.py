@@ -0,0 +1,51 @@
+"""Build hook for the optional mypyc-compiled build.
+
+The package builds as pure Python by default. With ``MYPYC_COMPILE=1`` set,
+as ``make build-compiled`` does, mypyc compiles its modules to C extensions
+using the strict typing in ``[tool.mypy]``. Where no C compiler or Python
+headers are available, the build warns and falls back to the pure-Python
+package, which behaves the same, only slower.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import sysconfig
+import tempfile
+from pathlib import Path
+
+from setuptools import Extension, setup
+from setuptools.errors import CCompilerError, ExecError, PlatformError
+
+PACKAGE = "{{cookiecutter.project_slug}}"
+
+
+def can_compile() -> bool:
+    """Check that a C compiler can build against this Python's headers."""
+    from distutils.ccompiler import new_compiler  # noqa: PLC0415 - setuptools provides distutils
+    from distutils.sysconfig import customize_compiler  # noqa: PLC0415
+
+    compiler = new_compiler()
+    customize_compiler(compiler)
+    with tempfile.TemporaryDirectory() as build_dir:
+        source = Path(build_dir) / "check.c"
+        source.write_text("#include <Python.h>\nint main(void) { return 0; }\n", encoding="utf-8")
+        try:
+            compiler.compile([str(source)], output_dir=build_dir, include_dirs=[sysconfig.get_paths()["include"]])
+        except (CCompilerError, ExecError, PlatformError) as e:
+            print(f"warning: cannot compile with mypyc ({e}); building pure Python", file=sys.stderr)
+            return False
+    return True
+
+
+def ext_modules() -> list[Extension]:
+    """Return the mypyc extensions to build, or none for a pure-Python build."""
+    if os.environ.get("MYPYC_COMPILE") != "1" or not can_compile():
+        return []
+    from mypyc.build import mypycify  # noqa: PLC0415 - only installed in the build environment
+
+    return mypycify([path.as_posix() for path in sorted(Path(PACKAGE).rglob("*.py"))], opt_level="3")
+
+
+setup(ext_modules=ext_modules())
@@ -0,0 +1,29 @@
+"""Split the test suite into shards, so CI can run it across several runners.
+
+``pytest --shard-id=2 --num-shards=4`` runs every fourth test, starting with
+the second; the shards of one run together cover every test exactly once.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("sharding")
+    group.addoption("--shard-id", type=int, default=1, help="which shard to run, from 1 to --num-shards")
+    group.addoption("--num-shards", type=int, default=1, help="number of shards the suite is split into")
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    shard_id = config.getoption("shard_id")
+    num_shards = config.getoption("num_shards")
+    if not 1 <= shard_id <= num_shards:
+        msg = f"--shard-id must be between 1 and --num-shards ({num_shards})"
+        raise pytest.UsageError(msg)
+    if num_shards == 1:
+        return
+    selected = [item for index, item in enumerate(items) if index % num_shards == shard_id - 1]
+    deselected = [item for index, item in enumerate(items) if index % num_shards != shard_id - 1]
+    config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
@@ -0,0 +1,22 @@
+"""Check that the tests run against the build they are meant to.
+
+``make test`` runs the suite against the pure-Python sources and
+``make test-compiled`` (which sets ``MYPYC_COMPILE=1``) against a build of the
+package compiled with mypyc, so a difference between the two shows up as a
+failing test.
+"""
+
+from __future__ import annotations
+
+import importlib.machinery
+import os
+
+from {{cookiecutter.project_slug}} import foo
+
+
+def test_build_under_test() -> None:
+    compiled = foo.__file__ is not None and foo.__file__.endswith(tuple(importlib.machinery.EXTENSION_SUFFIXES))
+    expected = os.environ.get("MYPYC_COMPILE") == "1"
+    assert compiled == expected, (
+        f"expected the {'compiled' if expected else 'pure-Python'} build, imported {foo.__file__}"
+    )
@@ -0,0 +1,81 @@
+"""Import-time budget for {{cookiecutter.project_slug}}.
+
+Imports the package in a fresh interpreter under ``python -X importtime`` and
+fails when the import takes longer than the budget in the ``[tool.importtime]``
+table of ``pyproject.toml``, or when it eagerly imports a heavy module that the
+table does not allow. Run ``make importtime`` to see where the time goes.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:  # pragma: no cover
+    import tomli as tomllib  # installed with pytest on Python 3.10
+
+PACKAGE = "{{cookiecutter.project_slug}}"
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def load_budget() -> dict[str, Any]:
+    with (PROJECT_DIR / "pyproject.toml").open("rb") as pyproject:
+        return tomllib.load(pyproject)["tool"]["importtime"]
+
+
+def measure_import() -> list[tuple[str, int]]:
+    """Import the package and return each module it imported with its cumulative time in microseconds.
+
+    The package itself comes last. The import runs twice so the measured run
+    uses compiled bytecode.
+    """
+    for _ in range(2):
+        result = subprocess.run(  # noqa: S603 - the interpreter running the tests
+            [sys.executable, "-X", "importtime", "-c", f"import {PACKAGE}"],
+            cwd=PROJECT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or line.endswith("imported package"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        entries.append((len(name) - len(name.lstrip()), name.strip(), int(cumulative)))
+    # A module is reported after the modules it imports, one level deeper
+    end = max(index for index, (_, name, _) in enumerate(entries) if name == PACKAGE)
+    start = end
+    while start > 0 and entries[start - 1][0] > entries[end][0]:
+        start -= 1
+    return [(name, cumulative) for _, name, cumulative in entries[start : end + 1]]
+
+
+def test_import_time_within_budget():
+    budget = load_budget()
+    imported = measure_import()
+    total = imported[-1][1]
+    slowest = ", ".join(
+        f"{name} {cumulative}us" for name, cumulative in sorted(imported, key=lambda entry: -entry[1])[:5]
+    )
+    assert total <= budget["max-cumulative-us"], (
+        f"import {PACKAGE} took {total}us, over the {budget['max-cumulative-us']}us budget (slowest: {slowest})"
+    )
+
+
+def test_no_heavy_eager_imports():
+    budget = load_budget()
+    heavy = {
+        name.split(".")[0]
+        for name, cumulative in measure_import()
+        if cumulative >= budget["heavy-module-us"] and name.split(".")[0] != PACKAGE
+    }
+    unexpected = sorted(heavy - set(budget["allowed-heavy-modules"]))
+    assert not unexpected, (
+        f"import {PACKAGE} eagerly imports {', '.join(unexpected)}; import them where they are used, "
+        "or add them to allowed-heavy-modules in pyproject.toml"
+    )